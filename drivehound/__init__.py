@@ -2,14 +2,32 @@
 
 from .hound import Hound
 from .carver import Carver
-from .win_drive_tools import open_drive, list_partitions
+from .win_drive_tools import open_drive, list_partitions, read_partition_table, partition_layout
+from .segmented_image import SegmentedImage, find_segments
+from .compressed_image import CompressedImage
+from .vm_disks import Qcow2Image, VhdImage, VhdxImage, VmdkImage
+from .bad_sectors import BadSectorMap
+from .catalog import Catalog
+from .change_map import ChangeMap
+from .output_manager import OutputManager
+from .known_hashes import KnownHashes
+from .events import EventLog
+from .survey import SurveyReport
+from .scheduler import RegionScheduler
+from .governor import Governor, TokenBucket
+from .analyzers import (Analyzer, AnalyzerHit, RegexAnalyzer, KeywordAnalyzer, EmailAnalyzer,
+                        CardNumberAnalyzer, PatternAnalyzer)
+from .sinks import CarvedFile, CarveSink, FileSink, MemorySink, NullSink
+from .async_hound import AsyncHound, AsyncScan, ScanProgress
 from .color_utils import (
     colored_text,
     colored_bg_text,
     print_colored,
     print_colored_bg
 )
-from .file_signatures import FILE_SIGNATURES
+from .file_signatures import FILE_SIGNATURES, MASKED_SIGNATURES
+from .matcher import MaskedSignature, SignatureMatcher
+from .shards import ShardCoordinator, run_worker, run_local
 from .colors import get_color_hex, COLOR_PALETTE
 from .ascii_utils import scale_ascii_art
 from .logo import LOGO
@@ -19,5 +37,44 @@ __all__ = [
     'Carver',
     'open_drive',
     'list_partitions',
+    'read_partition_table',
+    'partition_layout',
+    'SegmentedImage',
+    'find_segments',
+    'CompressedImage',
+    'Qcow2Image',
+    'VhdImage',
+    'VhdxImage',
+    'VmdkImage',
+    'BadSectorMap',
+    'Catalog',
+    'ChangeMap',
+    'OutputManager',
+    'KnownHashes',
+    'EventLog',
+    'SurveyReport',
+    'RegionScheduler',
+    'Governor',
+    'TokenBucket',
+    'Analyzer',
+    'AnalyzerHit',
+    'RegexAnalyzer',
+    'KeywordAnalyzer',
+    'EmailAnalyzer',
+    'CardNumberAnalyzer',
+    'PatternAnalyzer',
+    'CarvedFile',
+    'CarveSink',
+    'FileSink',
+    'MemorySink',
+    'NullSink',
+    'AsyncHound',
+    'AsyncScan',
+    'ScanProgress',
+    'MaskedSignature',
+    'SignatureMatcher',
+    'ShardCoordinator',
+    'run_worker',
+    'run_local',
     'scale_ascii_art',
 ]
@@ -0,0 +1,280 @@
+# drivehound/analyzers.py
+
+"""
+analyzers.py
+
+Plugins that run in the same read pass as carving. Hound hands every
+analyzer each chunk together with the overlap carried over from the
+previous one and its absolute offset; analyzers return AnalyzerHit records,
+which are reported alongside carves.
+
+Writing an analyzer means subclassing Analyzer, setting overlap to the
+longest match it can produce, and implementing scan().
+"""
+
+import re
+import bisect
+from .matcher import SignatureMatcher, compile_signature
+
+
+class AnalyzerHit:
+    """
+    A match reported by an analyzer.
+
+    Attributes:
+        analyzer (str): Name of the analyzer that produced the hit.
+        kind (str): What was matched (e.g., 'email', 'card', a keyword or pattern name).
+        offset (int): Absolute offset of the match in the source.
+        length (int): Match length in bytes.
+        value (bytes): The matched bytes.
+        partition (str): Partition label for per-partition scans, else None.
+        relative_offset (int): Offset within that partition, else None.
+    """
+    __slots__ = ('analyzer', 'kind', 'offset', 'length', 'value', 'partition', 'relative_offset')
+
+    def __init__(self, analyzer, kind, offset, value):
+        self.analyzer = analyzer
+        self.kind = kind
+        self.offset = offset
+        self.length = len(value)
+        self.value = value
+        self.partition = None
+        self.relative_offset = None
+
+    def __repr__(self):
+        return f"AnalyzerHit({self.analyzer!r}, {self.kind!r}, offset={hex(self.offset)}, value={self.value!r})"
+
+
+class Analyzer:
+    """
+    Base class for scan-loop plugins.
+
+    Attributes:
+        name (str): Reported as AnalyzerHit.analyzer.
+        overlap (int): Longest match the analyzer can report. Data is held back
+            and re-presented so a match of up to this length crossing a chunk
+            boundary is seen whole, and at least this much preceding context is kept.
+    """
+    name = "analyzer"
+    overlap = 0
+
+    def scan(self, data, offset, start, limit):
+        """
+        Searches one window of the source.
+
+        Args:
+            data (bytes): Carried-over bytes followed by the new chunk.
+            offset (int): Absolute offset of data[0].
+            start (int): Matches starting before this index were already reported;
+                data[:start] is context only.
+            limit (int): Report only matches starting before this index; later ones
+                are presented again with the next chunk.
+
+        Returns:
+            iterable: AnalyzerHit records.
+        """
+        raise NotImplementedError
+
+
+class RegexAnalyzer(Analyzer):
+    """
+    Reports matches of a bytes regular expression, optionally filtered by a
+    validator called with the matched bytes.
+    """
+    def __init__(self, name, pattern, overlap, kind=None, validate=None, flags=0):
+        self.name = name
+        self.kind = kind or name
+        self.regex = re.compile(pattern, flags) if isinstance(pattern, bytes) else pattern
+        self.overlap = overlap
+        self.validate = validate
+
+    def scan(self, data, offset, start, limit):
+        hits = []
+        # Search from the start of the context so a match already reported is
+        # consumed whole rather than found again from its middle
+        for m in self.regex.finditer(data):
+            if m.start() >= limit:
+                break
+            if m.start() < start:
+                continue
+            value = m.group()
+            if self.validate is None or self.validate(value):
+                hits.append(AnalyzerHit(self.name, self._kind(m), offset + m.start(), value))
+        return hits
+
+    def _kind(self, match):
+        return self.kind
+
+
+class KeywordAnalyzer(RegexAnalyzer):
+    """
+    Searches for a list of keywords, in each of the given text encodings.
+    """
+    def __init__(self, keywords, case_sensitive=False, encodings=("utf-8",), name="keyword"):
+        self._variants = {}
+        for keyword in keywords:
+            for encoding in encodings:
+                raw = keyword.encode(encoding) if isinstance(keyword, str) else keyword
+                self._variants.setdefault(raw.lower() if not case_sensitive else raw, keyword)
+        pattern = b"|".join(re.escape(v) for v in sorted(self._variants, key=len, reverse=True))
+        super().__init__(name, pattern, max(map(len, self._variants)),
+                         flags=0 if case_sensitive else re.IGNORECASE)
+        self.case_sensitive = case_sensitive
+
+    def _kind(self, match):
+        value = match.group()
+        keyword = self._variants.get(value if self.case_sensitive else value.lower(), value)
+        return keyword if isinstance(keyword, str) else keyword.decode("latin-1")
+
+
+class EmailAnalyzer(RegexAnalyzer):
+    """Finds ASCII email addresses."""
+    def __init__(self, name="email"):
+        super().__init__(name, rb"[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63})*\.[A-Za-z]{2,24}",
+                         overlap=512)
+
+
+def luhn_valid(digits):
+    """True if a digit string passes the Luhn checksum used by payment cards."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ch - 48 if isinstance(ch, int) else int(ch)
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+class CardNumberAnalyzer(RegexAnalyzer):
+    """
+    Finds 13-19 digit payment card numbers (optionally space or dash
+    separated) that pass the Luhn check.
+    """
+    def __init__(self, name="card"):
+        super().__init__(name, rb"(?<![0-9])[0-9](?:[ -]?[0-9]){12,18}(?![0-9])", overlap=40,
+                         validate=self._valid)
+
+    @staticmethod
+    def _valid(value):
+        digits = bytes(c for c in value if 48 <= c <= 57)
+        return luhn_valid(digits) and len(set(digits)) > 1
+
+
+class PatternAnalyzer(Analyzer):
+    """
+    Finds custom byte patterns. Patterns are given like start signatures:
+    bytes, MaskedSignature, or hex text with '??' wildcards.
+    """
+    def __init__(self, patterns, name="pattern"):
+        """
+        Args:
+            patterns (dict): { kind: pattern }.
+        """
+        self.name = name
+        self.patterns = {kind: compile_signature(p) for kind, p in patterns.items()}
+        self.overlap = max(len(p) for p in self.patterns.values())
+        self._matcher = SignatureMatcher(self.patterns)
+
+    def scan(self, data, offset, start, limit):
+        hits = []
+        pos = start
+        while True:
+            hit = self._matcher.find(data, pos)
+            if hit is None or hit[0] >= limit:
+                break
+            idx, kind = hit
+            hits.append(AnalyzerHit(self.name, kind, offset + idx, bytes(data[idx:idx + len(self.patterns[kind])])))
+            pos = idx + 1
+        return hits
+
+
+class AnalyzerSet:
+    """
+    Drives a group of analyzers over one scan.
+
+    Chunks are fed with their absolute offsets. A single buffer keeps the last
+    `overlap` bytes (the largest of the analyzers') as carry-over, so every
+    analyzer sees matches that cross a chunk boundary once and in full. A
+    chunk that overlaps the end of the current window has its repeated bytes
+    dropped. Any other discontinuity, forwards or backwards (e.g. scheduled
+    ranges), ends the window and starts a new one at the chunk. Hits starting
+    in bytes that an earlier window already covered are not reported again.
+    """
+    def __init__(self, analyzers):
+        self.analyzers = list(analyzers)
+        self.overlap = max((a.overlap for a in self.analyzers), default=0)
+        self._buffer = b""
+        self._offset = 0     # absolute offset of _buffer[0]
+        self._start = 0      # index in _buffer before which matches were reported
+        self._window = 0     # absolute offset where the current window began
+        self._covered = []   # sorted, disjoint (start, end) of finished windows
+
+    @property
+    def end(self):
+        """Absolute offset just past the data fed so far."""
+        return self._offset + len(self._buffer)
+
+    def feed(self, chunk, offset):
+        """
+        Args:
+            chunk (bytes): Data read from the source.
+            offset (int): Absolute offset of chunk[0].
+
+        Returns:
+            list: AnalyzerHit records whose matches are now known to be whole.
+        """
+        hits = []
+        if self._window <= offset < self.end:
+            # Re-read of the current window: keep only the new tail
+            chunk = chunk[self.end - offset:]
+            offset = self.end
+        elif offset != self.end:
+            hits.extend(self.finish())
+            self._offset = self._window = offset
+        if not chunk:
+            return hits
+        self._buffer = self._buffer + chunk if self._buffer else chunk
+        limit = len(self._buffer) - self.overlap
+        if limit > self._start:
+            hits.extend(self._scan(limit))
+            keep = max(0, limit - self.overlap)
+            self._buffer = self._buffer[keep:]
+            self._offset += keep
+            self._start = limit - keep
+        return hits
+
+    def finish(self):
+        """Reports the matches held back in the carry-over and ends the window."""
+        hits = self._scan(len(self._buffer)) if len(self._buffer) > self._start else []
+        if self.end > self._window:
+            self._cover(self._window, self.end)
+        self._offset = self._window = self.end
+        self._buffer = b""
+        self._start = 0
+        return hits
+
+    def _cover(self, start, end):
+        merged = []
+        for s, e in self._covered:
+            if e < start or s > end:
+                merged.append((s, e))
+            else:
+                start, end = min(s, start), max(e, end)
+        merged.append((start, end))
+        merged.sort()
+        self._covered = merged
+
+    def _seen(self, offset):
+        i = bisect.bisect_right(self._covered, (offset, float("inf"))) - 1
+        return i >= 0 and self._covered[i][0] <= offset < self._covered[i][1]
+
+    def _scan(self, limit):
+        hits = []
+        for analyzer in self.analyzers:
+            hits.extend(analyzer.scan(self._buffer, self._offset, self._start, limit))
+        if self._covered:
+            hits = [h for h in hits if not self._seen(h.offset)]
+        hits.sort(key=lambda h: h.offset)
+        return hits
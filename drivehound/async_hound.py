@@ -0,0 +1,209 @@
+# drivehound/async_hound.py
+
+"""
+async_hound.py
+
+asyncio interface around the Hound engine. Each scan is stepped one chunk
+at a time on a bounded worker pool, so device reads never block the event
+loop, the loop gets control back between chunks, and scans can be watched
+and cancelled cooperatively. Many scans can share one loop and one pool.
+"""
+
+import os
+import time
+import asyncio
+import itertools
+import logging
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from .hound import Hound, ScanStats, ScanTick
+from .sinks import CarvedFile, FileSink, MemorySink
+
+ScanProgress = namedtuple('ScanProgress', ['bytes_scanned', 'total_bytes', 'files_carved', 'elapsed', 'done'])
+
+_END = object()
+
+
+class AsyncScan:
+    """
+    A running scan. Await it for the per-type counts, iterate progress()
+    for updates, and call cancel() to stop it between chunks.
+
+    Skip, suppression, analyzer and autotune counters are kept in `stats`
+    rather than on the shared Hound, so concurrent scans do not mix them.
+    """
+    def __init__(self, owner, drive, sink):
+        self.owner = owner
+        self.drive = drive
+        self.sink = sink
+        self.files_found = defaultdict(int)
+        self.stats = ScanStats()
+        self.carves = []
+        self.bytes_scanned = 0
+        self.total_bytes = None
+        self.started = time.monotonic()
+        self.done = False
+        self._cancel_requested = False
+        self._update = asyncio.Event()
+        self._carve_queue = asyncio.Queue()
+        self._task = asyncio.ensure_future(self._run())
+
+    def __await__(self):
+        return self._task.__await__()
+
+    def cancel(self):
+        """Requests cancellation; the scan stops after the chunk in flight."""
+        self._cancel_requested = True
+
+    def snapshot(self):
+        """
+        Returns:
+            ScanProgress: Current bytes scanned, source size, carve count and elapsed time.
+        """
+        return ScanProgress(self.bytes_scanned, self.total_bytes, len(self.carves),
+                            time.monotonic() - self.started, self.done)
+
+    async def progress(self):
+        """
+        Async iterator of ScanProgress snapshots, one per update, ending after
+        the final snapshot. Updates that arrive faster than the consumer reads
+        are coalesced.
+        """
+        while True:
+            event = self._update
+            if not self.done:
+                await event.wait()
+            snapshot = self.snapshot()
+            yield snapshot
+            if snapshot.done:
+                return
+
+    async def carves_as_completed(self):
+        """Async iterator of CarvedFile records as the scan produces them."""
+        while True:
+            carve = await self._carve_queue.get()
+            if carve is _END:
+                return
+            yield carve
+
+    def _notify(self):
+        # Wake current waiters and arm a fresh event for the next update
+        event, self._update = self._update, asyncio.Event()
+        event.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        executor = self.owner.executor
+        scan = self.owner.hound._scan(self.drive, self.sink, self.files_found, ticks=True, stats=self.stats)
+        pending = None
+        try:
+            while not self._cancel_requested:
+                pending = loop.run_in_executor(executor, next, scan, _END)
+                item = await asyncio.shield(pending)
+                pending = None
+                if item is _END:
+                    break
+                if isinstance(item, ScanTick):
+                    self.bytes_scanned, self.total_bytes = item
+                elif isinstance(item, CarvedFile):
+                    self.carves.append(item)
+                    self._carve_queue.put_nowait(item)
+                self._notify()
+                # Give other scans and tasks a turn between chunks
+                await asyncio.sleep(0)
+            else:
+                logging.info(f"Scan of {self.drive} cancelled at offset {hex(self.bytes_scanned)}")
+        finally:
+            if pending is not None:
+                # Task was cancelled mid-chunk: let the worker finish before closing
+                try:
+                    await pending
+                except Exception:
+                    pass
+            await loop.run_in_executor(executor, scan.close)
+            self.done = True
+            self._carve_queue.put_nowait(_END)
+            self._notify()
+        return self.files_found
+
+
+class AsyncHound:
+    """
+    Async front end to a Hound. All scans started from one AsyncHound share
+    a bounded thread pool for blocking reads and searches.
+    """
+    def __init__(self, hound=None, max_workers=4, executor=None, **hound_kwargs):
+        """
+        Args:
+            hound (Hound, optional): Engine to drive; built from hound_kwargs if omitted.
+            max_workers (int): Worker threads shared by all scans (ignored with executor).
+            executor (Executor, optional): Externally managed pool to use instead.
+            **hound_kwargs: Passed to Hound when no engine is given.
+        """
+        self.hound = hound if hound is not None else Hound(**hound_kwargs)
+        self._owns_executor = executor is None
+        self._scan_ids = itertools.count()
+        self._scans = []
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="drivehound")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def start(self, drive, sink=None):
+        """
+        Starts a scan on the running event loop.
+
+        Args:
+            drive (str/list): The drive identifier, as for Hound.recover_files.
+            sink (CarveSink, optional): Destination for carved data; defaults to
+                writing files into the scan's own subdirectory of the engine's
+                output_dir (scan_0, scan_1, ...), so concurrent scans cannot
+                overwrite each other's files.
+
+        Returns:
+            AsyncScan: Handle to await, watch or cancel.
+        """
+        if sink is None:
+            scan_dir = os.path.join(self.hound.output_dir, f"scan_{next(self._scan_ids)}")
+            sink = FileSink(scan_dir, self.hound.output)
+        scan = AsyncScan(self, drive, sink)
+        self._scans = [s for s in self._scans if not s.done] + [scan]
+        return scan
+
+    async def recover_files(self, drive):
+        """Async counterpart of Hound.recover_files; returns counts per file type."""
+        return await self.start(drive)
+
+    async def iter_carves(self, drive, sink=None):
+        """
+        Async counterpart of Hound.iter_carves. Defaults to a MemorySink.
+        Leaving the loop early cancels the scan.
+        """
+        scan = self.start(drive, sink if sink is not None else MemorySink())
+        try:
+            async for carve in scan.carves_as_completed():
+                yield carve
+        finally:
+            scan.cancel()
+            await scan
+
+    async def aclose(self):
+        """
+        Cancels scans still running, waits for them to stop between chunks and
+        shuts down an owned pool off the event loop, so other tasks keep running.
+        """
+        running = [scan for scan in self._scans if not scan.done]
+        for scan in running:
+            scan.cancel()
+        await asyncio.gather(*(scan._task for scan in running), return_exceptions=True)
+        self._scans = []
+        if self._owns_executor:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown, True)
+
+    def close(self):
+        """Blocking shutdown for use outside a running event loop."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
@@ -0,0 +1,224 @@
+# drivehound/autotune.py
+
+"""
+autotune.py
+
+Runtime tuning of chunk size and read-ahead depth. AutoTuner measures read
+and search time per chunk during a short warmup, hill-climbs the chunk size
+towards the best throughput and then picks a read-ahead depth from the
+read/search cost ratio. PrefetchReader provides the read-ahead.
+"""
+
+import logging
+import threading
+from collections import deque
+
+
+class AutoTuner:
+    """
+    Hill-climbs chunk size on measured throughput, then settles.
+
+    Time is accounted from the read and search durations passed to observe(),
+    so the tuner is independent of the wall clock and of other work.
+    """
+    def __init__(self, chunk_size, min_chunk_size=64*1024, max_chunk_size=16*1024*1024,
+                 max_queue_depth=8, warmup_seconds=3.0, trial_seconds=0.25, min_trial_chunks=3):
+        """
+        Args:
+            chunk_size (int): Starting chunk size.
+            min_chunk_size (int): Smallest chunk size tried.
+            max_chunk_size (int): Largest chunk size tried.
+            max_queue_depth (int): Upper bound for the read-ahead depth.
+            warmup_seconds (float): Measured time after which tuning stops.
+            trial_seconds (float): Measured time spent on each candidate size.
+            min_trial_chunks (int): Minimum chunks observed per candidate.
+        """
+        self.chunk_size = chunk_size
+        self.queue_depth = 2
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.max_queue_depth = max_queue_depth
+        self.warmup_seconds = warmup_seconds
+        self.trial_seconds = trial_seconds
+        self.min_trial_chunks = min_trial_chunks
+        self.settled = False
+        self.results = {}   # chunk_size -> (throughput, read_seconds, search_seconds)
+        self._initial = chunk_size
+        self._growing = True
+        self._elapsed = 0.0
+        self._reset_trial()
+
+    def _reset_trial(self):
+        self._bytes = 0
+        self._chunks = 0
+        self._read = 0.0
+        self._search = 0.0
+
+    def observe(self, nbytes, read_seconds, search_seconds):
+        """
+        Records one chunk. Updates chunk_size and queue_depth when a trial ends.
+
+        Args:
+            nbytes (int): Bytes in the chunk.
+            read_seconds (float): Time spent waiting for the chunk.
+            search_seconds (float): Time spent searching it.
+        """
+        if self.settled:
+            return
+        self._bytes += nbytes
+        self._chunks += 1
+        self._read += read_seconds
+        self._search += search_seconds
+        self._elapsed += read_seconds + search_seconds
+        if self._chunks < self.min_trial_chunks or self._read + self._search < self.trial_seconds:
+            return
+
+        busy = max(self._read + self._search, 1e-9)
+        self.results[self.chunk_size] = (self._bytes / busy, self._read, self._search)
+        self._reset_trial()
+
+        candidate = self._next_candidate()
+        if candidate is None or self._elapsed >= self.warmup_seconds:
+            self._settle()
+        else:
+            self.chunk_size = candidate
+
+    def _next_candidate(self):
+        best = max(self.results, key=lambda size: self.results[size][0])
+        if self._growing:
+            if best == self.chunk_size and self.chunk_size * 2 <= self.max_chunk_size:
+                return self.chunk_size * 2
+            # Growing stopped helping; try the other direction once
+            self._growing = False
+            if best != self._initial:
+                return None
+            candidate = self._initial // 2
+        else:
+            if best != self.chunk_size:
+                return None
+            candidate = self.chunk_size // 2
+        if candidate < self.min_chunk_size or candidate in self.results:
+            return None
+        return candidate
+
+    def _settle(self):
+        best = max(self.results, key=lambda size: self.results[size][0])
+        _, read, search = self.results[best]
+        self.chunk_size = best
+        # Reads slower than searching benefit from more chunks in flight
+        ratio = read / max(search, 1e-9)
+        self.queue_depth = max(1, min(self.max_queue_depth, round(ratio) + 1))
+        self.settled = True
+        logging.info(f"Autotune settled on chunk_size={self.chunk_size} queue_depth={self.queue_depth} "
+                     f"({self.results[best][0] / (1024 * 1024):.1f} MB/s)")
+
+    def settings(self):
+        """
+        Returns:
+            dict: The chosen chunk_size, queue_depth and measured throughput (bytes/s).
+        """
+        throughput = self.results.get(self.chunk_size, (0.0,))[0]
+        return {
+            'chunk_size': self.chunk_size,
+            'queue_depth': self.queue_depth,
+            'throughput': throughput,
+            'settled': self.settled,
+        }
+
+
+class PrefetchReader:
+    """
+    Wraps a DriveChunkReader and reads up to `depth` chunks ahead on a
+    background thread, overlapping device I/O with searching.
+    """
+    def __init__(self, reader, depth=2):
+        self.reader = reader
+        self.depth = depth
+        self.position = reader.position
+        self._chunks = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getattr__(self, name):
+        # Delegate file_obj, bad_map, sector_size, ... to the wrapped reader
+        if name == 'reader':
+            raise AttributeError(name)
+        return getattr(self.reader, name)
+
+    @property
+    def chunk_size(self):
+        return self.reader.chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        self.reader.chunk_size = value
+
+    def _start(self):
+        self._stop = False
+        self._eof = False
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop and len(self._chunks) >= self.depth:
+                    self._cond.wait()
+                if self._stop:
+                    return
+            try:
+                data = self.reader.read_chunk()
+            except Exception as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                if self._stop:
+                    return
+                self._chunks.append(data)
+                if not data:
+                    self._eof = True
+                self._cond.notify_all()
+                if self._eof:
+                    return
+
+    def read_chunk(self):
+        with self._cond:
+            while not self._chunks and self._error is None and not self._eof:
+                self._cond.wait()
+            if self._chunks:
+                data = self._chunks.popleft()
+                self._cond.notify_all()
+            elif self._error is not None:
+                raise self._error
+            else:
+                data = b""
+        self.position += len(data)
+        return data
+
+    def _halt(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._chunks.clear()
+
+    def seek(self, offset):
+        """Discards read-ahead data and restarts reading at offset."""
+        self._halt()
+        self.reader.seek(offset)
+        self.position = offset
+        self._start()
+
+    def close(self):
+        self._halt()
+        self.reader.close()
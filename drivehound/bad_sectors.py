@@ -0,0 +1,140 @@
+# drivehound/bad_sectors.py
+
+"""
+bad_sectors.py
+
+Tracks unreadable ranges of a failing device in a ddrescue-style mapfile so
+that a rerun can skip known-bad areas instead of hammering them again.
+"""
+
+import os
+import bisect
+import logging
+
+# ddrescue block status characters
+STATUS_FINISHED = '+'
+STATUS_BAD = '-'
+STATUS_NON_TRIED = '?'
+# Statuses that mark areas ddrescue could not read
+UNREADABLE_STATUSES = ('-', '*', '/')
+
+
+class BadSectorMap:
+    """
+    A sorted, non-overlapping list of unreadable byte ranges plus the extent
+    that has been read so far.
+    """
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str, optional): Mapfile to load from and save to. Loaded if it exists.
+        """
+        self.path = path
+        self.starts = []
+        self.ends = []
+        self.rescued_end = 0
+        if path and os.path.isfile(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def bad_bytes(self):
+        return sum(e - s for s, e in zip(self.starts, self.ends))
+
+    def ranges(self):
+        """Returns the bad ranges as (start, end) tuples."""
+        return list(zip(self.starts, self.ends))
+
+    def add_bad(self, start, size):
+        """
+        Records an unreadable range, merging it with any touching ranges.
+
+        Args:
+            start (int): Absolute offset of the range.
+            size (int): Length of the range in bytes.
+        """
+        end = start + size
+        idx = bisect.bisect_left(self.ends, start)
+        # Absorb every range that overlaps or touches [start, end)
+        while idx < len(self.starts) and self.starts[idx] <= end:
+            start = min(start, self.starts[idx])
+            end = max(end, self.ends[idx])
+            del self.starts[idx]
+            del self.ends[idx]
+        self.starts.insert(idx, start)
+        self.ends.insert(idx, end)
+
+    def bad_end(self, pos):
+        """
+        Returns the end of the bad range containing pos, or None if pos is readable.
+        """
+        idx = bisect.bisect_right(self.starts, pos) - 1
+        if idx >= 0 and pos < self.ends[idx]:
+            return self.ends[idx]
+        return None
+
+    def next_bad(self, pos):
+        """
+        Returns the start of the first bad range beginning after pos, or None.
+        """
+        idx = bisect.bisect_right(self.starts, pos)
+        if idx < len(self.starts):
+            return self.starts[idx]
+        return None
+
+    def load(self, path):
+        """
+        Loads bad ranges from a ddrescue-style mapfile.
+
+        Args:
+            path (str): Path to the mapfile.
+        """
+        status_line_seen = False
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                parts = line.split()
+                if not status_line_seen:
+                    # First data line is 'current_pos current_status [current_pass]'
+                    status_line_seen = True
+                    continue
+                if len(parts) < 3:
+                    continue
+                pos, size, status = int(parts[0], 0), int(parts[1], 0), parts[2]
+                if status in UNREADABLE_STATUSES:
+                    self.add_bad(pos, size)
+                if status != STATUS_NON_TRIED:
+                    self.rescued_end = max(self.rescued_end, pos + size)
+        logging.info(f"Loaded {len(self)} bad ranges ({self.bad_bytes} bytes) from {path}")
+
+    def save(self, path=None):
+        """
+        Writes the map in ddrescue mapfile format.
+
+        Args:
+            path (str, optional): Destination; defaults to the path given at construction.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for the bad sector map.")
+        blocks = []
+        cursor = 0
+        for start, end in self.ranges():
+            if start > cursor:
+                blocks.append((cursor, start - cursor, STATUS_FINISHED))
+            blocks.append((start, end - start, STATUS_BAD))
+            cursor = end
+        if self.rescued_end > cursor:
+            blocks.append((cursor, self.rescued_end - cursor, STATUS_FINISHED))
+
+        with open(path, "w") as f:
+            f.write("# Mapfile. Created by drivehound\n")
+            f.write("# current_pos  current_status  current_pass\n")
+            f.write(f"0x{self.rescued_end:08X}     {STATUS_NON_TRIED}               1\n")
+            f.write("#      pos        size  status\n")
+            for pos, size, status in blocks:
+                f.write(f"0x{pos:08X}  0x{size:08X}  {status}\n")
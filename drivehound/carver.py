@@ -1,6 +1,10 @@
 # carver.py
 import os
+import time
 import logging
+from .win_drive_tools import open_drive
+from .autotune import AutoTuner
+from .matcher import SignatureMatcher, compile_signature
 
 # Example usage: Carve a specific file type from a disk image or raw file data.
 # This module provides a Carver class that can:
@@ -11,24 +15,37 @@ import logging
 # It supports partial searching, offset-based adjustments, and chunked reading for large files.
 
 class Carver:
-    def __init__(self, signature_key, signatures_dict, sector_size=512, output_dir="carved_output"):
+    def __init__(self, signature_key, signatures_dict, sector_size=512, output_dir="carved_output",
+                 chunk_size=None, autotune=False):
         """
         Initialize the Carver with a specific signature key and a dictionary of signatures.
 
         Args:
             signature_key (str): The key from the signatures_dict to carve.
             signatures_dict (dict): Dictionary of signatures in format:
-                signature_key: (start_bytes, end_bytes_or_None, extension)
+                signature_key: (start_bytes, end_bytes_or_None, extension[, size_parser])
+                start_bytes may also be a MaskedSignature or a hex string with '??' wildcards.
+                A size parser (see file_signatures.riff_size) bounds carves with no end marker.
             sector_size (int): Sector size to read at a time. Defaults to 512 for disk-like sources.
             output_dir (str): Directory to store carved files.
+            chunk_size (int, optional): Bytes read per iteration. Defaults to 64 sectors.
+            autotune (bool): If True, tune the chunk size from measured throughput while carving.
         """
         self.signature_key = signature_key
         self.signatures = signatures_dict
         if signature_key not in self.signatures:
             raise ValueError(f"Signature key {signature_key} not found in provided dictionary.")
-        self.start_sig, self.end_sig, self.extension = self.signatures[signature_key]
+        signature = self.signatures[signature_key]
+        self.start_sig, self.end_sig, self.extension = signature[:3]
+        # Optional size parser: the carve ends at the length declared in the file's header
+        self.sizer = signature[3] if len(signature) > 3 else None
+        self.start_sig = compile_signature(self.start_sig)
+        self._matcher = SignatureMatcher({signature_key: self.start_sig})
         self.sector_size = sector_size
         self.output_dir = output_dir
+        self.chunk_size = chunk_size or sector_size * 64  # read bigger chunks for better performance
+        self.autotune = autotune
+        self.tuned_settings = None
         os.makedirs(self.output_dir, exist_ok=True)
         self._file_counter = 0
 
@@ -37,13 +54,14 @@ class Carver:
         Carve files of the specified signature type from the given source file.
 
         Args:
-            source_path (str): Path to the source file (e.g., disk image, memory dump)
+            source_path (str/list): Path to the source file (e.g., disk image, memory dump),
+                or the segments of a split image.
 
         Returns:
             int: The number of files carved.
         """
-        # Open in binary mode
-        with open(source_path, "rb") as src:
+        # Open in binary mode; split images are read as one stream
+        with open_drive(source_path, "rb") as src:
             return self.carve_from_stream(src)
 
     def carve_from_stream(self, src):
@@ -62,41 +80,89 @@ class Carver:
         # Once found, we will keep reading until the end pattern is located (if end pattern is defined).
         total_carved = 0
         buffer = b""
-        chunk_size = self.sector_size * 64  # read bigger chunks for better performance
+        chunk_size = self.chunk_size
+        tuner = AutoTuner(chunk_size, min_chunk_size=self.sector_size) if self.autotune else None
         eof_reached = False
         file_in_progress = False
         outfile = None
 
         while not eof_reached:
+            read_started = time.perf_counter()
             data = src.read(chunk_size)
+            search_started = time.perf_counter()
             if not data:
                 eof_reached = True
             else:
                 buffer += data
 
-            # Process the buffer
-            # If we are not currently extracting a file, look for start_sig
-            if not file_in_progress:
-                start_pos = buffer.find(self.start_sig)
-                if start_pos >= 0:
+            # Process the buffer until it needs more data
+            while True:
+                # If we are not currently extracting a file, look for start_sig
+                if not file_in_progress:
+                    hit = self._matcher.find(buffer)
+                    start_pos = hit[0] if hit else -1
+                    if start_pos < 0:
+                        # Keep buffer small if we didn't find anything: avoid memory blowup
+                        # Retain last len(start_sig)-1 bytes to not miss a signature crossing chunks
+                        max_retain = len(self.start_sig) - 1 if len(self.start_sig) > 1 else 1
+                        buffer = buffer[-max_retain:]
+                        break
                     # Found a start signature
                     file_in_progress = True
                     # Create a new output file
                     out_name = f"{self.signature_key}_{self._file_counter}{self.extension}"
                     out_path = os.path.join(self.output_dir, out_name)
                     outfile = open(out_path, "wb")
+                    self._file_counter += 1
+                    total_carved += 1
+                    written = 0
+                    sizer = self.sizer() if self.sizer else None
+                    request = next(sizer) if sizer else None
+                    end_offset = None
+                    if sizer:
+                        # Sized formats are written as their header is parsed below
+                        buffer = buffer[start_pos:]
+                        continue
                     # Write from start_pos onwards
                     outfile.write(buffer[start_pos:])
                     # Trim buffer to only what was beyond start_pos
                     buffer = b""
-                    self._file_counter += 1
-                    total_carved += 1
-                else:
-                    # Keep buffer small if we didn't find anything: avoid memory blowup
-                    # Retain last len(start_sig)-1 bytes to not miss a signature crossing chunks
-                    max_retain = len(self.start_sig) - 1 if len(self.start_sig) > 1 else 1
-                    buffer = buffer[-max_retain:]
-            else:
+                    break
+
+                # Feed the size parser the header bytes it asked for once they are buffered
+                while request is not None and request[0] + request[1] <= written + len(buffer):
+                    at = request[0] - written
+                    try:
+                        request = sizer.send(buffer[at:at + request[1]])
+                    except StopIteration as stop:
+                        request = None
+                        if stop.value is not None:
+                            end_offset = stop.value
+                if request is not None and eof_reached:
+                    # Header cut short by end of data: carve to EOF
+                    request = None
+                if end_offset is not None:
+                    take = max(0, end_offset - written)
+                    if take <= len(buffer):
+                        # Declared size reached: close the file and look for the next start
+                        outfile.write(buffer[:take])
+                        outfile.close()
+                        outfile = None
+                        file_in_progress = False
+                        buffer = buffer[take:]
+                        continue
+                    outfile.write(buffer)
+                    written += len(buffer)
+                    buffer = b""
+                    break
+                if request is not None:
+                    # Hold back from the header bytes the size parser still needs
+                    keep = request[0] - written
+                    outfile.write(buffer[:keep])
+                    written += keep
+                    buffer = buffer[keep:]
+                    break
+
                 # We are currently writing to a file. If end_sig is None, we write until EOF.
                 # If end_sig is defined, search for it
                 if self.end_sig is not None:
@@ -127,7 +193,16 @@ class Carver:
                     else:
                         # Just keep writing
                         outfile.write(buffer)
+                        written += len(buffer)
                         buffer = b""
+                break
+
+            if tuner and data and not tuner.settled:
+                tuner.observe(len(data), search_started - read_started, time.perf_counter() - search_started)
+                chunk_size = tuner.chunk_size
+
+        if tuner:
+            self.tuned_settings = tuner.settings()
 
         # If file_in_progress still True at the end (no end found and not ended):
         if file_in_progress and outfile:
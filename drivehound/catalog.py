@@ -0,0 +1,158 @@
+# drivehound/catalog.py
+
+"""
+catalog.py
+
+A SQLite-backed record of carving runs and the artifacts they produced.
+Later runs consult it to skip carves that were already recovered.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    bytes_scanned INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    source TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    file_type TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    path TEXT
+);
+CREATE INDEX IF NOT EXISTS artifacts_source_offset ON artifacts (source, offset);
+CREATE INDEX IF NOT EXISTS artifacts_sha256 ON artifacts (sha256);
+"""
+
+
+def source_id(drive):
+    """
+    Returns a stable identifier for a drive, image path or list of segments.
+
+    Args:
+        drive (str/list): The drive identifier as passed to open_drive.
+
+    Returns:
+        str: Absolute path for files, the identifier itself for devices.
+    """
+    if isinstance(drive, (list, tuple)):
+        return "+".join(source_id(p) for p in drive)
+    if os.path.exists(drive):
+        return os.path.abspath(drive)
+    return str(drive)
+
+
+class Catalog:
+    """
+    Records every carved artifact (source, offset, length, type, hash, run).
+
+    Inserts are buffered and written in one transaction per batch_size rows.
+    The connection is shared between threads behind a lock.
+    """
+    def __init__(self, path="drivehound_catalog.db", batch_size=500):
+        """
+        Args:
+            path (str): SQLite database file; ':memory:' is accepted.
+            batch_size (int): Number of artifacts to buffer before committing.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start_run(self, source):
+        """
+        Registers a new run and returns its id.
+
+        Args:
+            source (str): Source identifier (see source_id).
+
+        Returns:
+            int: The new run id.
+        """
+        with self._lock, self.conn:
+            cur = self.conn.execute("INSERT INTO runs (source, started) VALUES (?, ?)", (source, time.time()))
+            return cur.lastrowid
+
+    def finish_run(self, run_id, bytes_scanned=0):
+        """Flushes pending artifacts and marks the run as finished."""
+        self.flush()
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE runs SET finished = ?, bytes_scanned = ? WHERE run_id = ?",
+                              (time.time(), bytes_scanned, run_id))
+
+    def add_artifact(self, run_id, source, offset, length, file_type, sha256, path=None):
+        """Buffers one artifact row; commits once batch_size rows are pending."""
+        with self._lock:
+            self._pending.append((run_id, source, offset, length, file_type, sha256, path))
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def flush(self):
+        """Writes all buffered artifacts in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO artifacts (run_id, source, offset, length, file_type, sha256, path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        logging.debug(f"Catalog committed {len(rows)} artifacts")
+
+    def known_carves(self, source):
+        """
+        Returns the carves already recovered from a source.
+
+        Args:
+            source (str): Source identifier (see source_id).
+
+        Returns:
+            dict: {offset: (file_type, length)} for every cataloged artifact.
+        """
+        self.flush()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT offset, file_type, length FROM artifacts WHERE source = ?", (source,)).fetchall()
+        return {offset: (file_type, length) for offset, file_type, length in rows}
+
+    def artifacts(self, run_id=None):
+        """
+        Lists cataloged artifacts, optionally restricted to one run.
+
+        Returns:
+            list: Tuples of (run_id, source, offset, length, file_type, sha256, path).
+        """
+        self.flush()
+        query = "SELECT run_id, source, offset, length, file_type, sha256, path FROM artifacts"
+        params = ()
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        with self._lock:
+            return self.conn.execute(query + " ORDER BY source, offset", params).fetchall()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
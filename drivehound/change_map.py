@@ -0,0 +1,224 @@
+# drivehound/change_map.py
+
+"""
+change_map.py
+
+Per-block hash map of a scanned source. A later scan of the same source
+hashes it again, searches only the blocks that changed and carries the
+findings from unchanged regions forward.
+"""
+
+import os
+import json
+import stat
+import base64
+import hashlib
+import logging
+
+DIGEST_SIZE = 16
+
+
+def source_fingerprint(drive):
+    """
+    Identifies a source more tightly than its path. A regular file is also
+    identified by its device and inode, so a different image copied to the
+    same path does not match. A block device is also identified by its
+    serial number where the system exposes one.
+
+    Args:
+        drive (str/list): The drive identifier as passed to open_drive.
+
+    Returns:
+        str: Fingerprint to store with a change map.
+    """
+    if isinstance(drive, (list, tuple)):
+        return "+".join(source_fingerprint(p) for p in drive)
+    try:
+        st = os.stat(drive)
+    except (OSError, TypeError, ValueError):
+        return str(drive)
+    path = os.path.abspath(drive)
+    if stat.S_ISBLK(st.st_mode):
+        serial = _block_serial(drive)
+        return f"{path}#serial={serial}" if serial else path
+    return f"{path}#{st.st_dev}:{st.st_ino}"
+
+
+def _block_serial(drive):
+    """Reads a Linux block device's serial or WWID from sysfs, for the disk or its parent."""
+    node = os.path.realpath(os.path.join("/sys/class/block", os.path.basename(os.path.realpath(drive))))
+    for base in (node, os.path.dirname(node)):
+        for name in ("device/serial", "device/wwid", "wwid"):
+            try:
+                with open(os.path.join(base, name), "r") as f:
+                    value = f.read().strip()
+            except OSError:
+                continue
+            if value:
+                return value
+    return None
+
+
+class BlockHasher:
+    """
+    Incrementally hashes a byte stream in fixed-size blocks.
+    """
+    def __init__(self, block_size):
+        self.block_size = block_size
+        self.digests = []
+        self.size = 0
+        self._hash = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        self._fill = 0
+
+    def update(self, data):
+        view = memoryview(data)
+        while view:
+            take = min(len(view), self.block_size - self._fill)
+            self._hash.update(view[:take])
+            self._fill += take
+            self.size += take
+            view = view[take:]
+            if self._fill == self.block_size:
+                self.digests.append(self._hash.digest())
+                self._hash = hashlib.blake2b(digest_size=DIGEST_SIZE)
+                self._fill = 0
+
+    def finish(self):
+        """Closes the trailing partial block and returns all digests."""
+        if self._fill:
+            self.digests.append(self._hash.digest())
+            self._hash = hashlib.blake2b(digest_size=DIGEST_SIZE)
+            self._fill = 0
+        return self.digests
+
+
+class ChangeMap:
+    """
+    Block hashes and carve findings from the previous scan of a source,
+    persisted as JSON together with the source's fingerprint and size. A map
+    bound to a different source or size is discarded, so findings never
+    carry over onto evidence that was not examined.
+    """
+    def __init__(self, path, block_size=1024*1024):
+        """
+        Args:
+            path (str): File the map is loaded from (if present) and saved to.
+            block_size (int): Hash granularity in bytes. A stored map with a
+                different block size is discarded.
+        """
+        self.path = path
+        self.block_size = block_size
+        self.size = 0
+        self.source = None
+        self.digests = []
+        self.findings = []
+        if os.path.isfile(path):
+            self.load()
+
+    def has_baseline(self):
+        return bool(self.digests)
+
+    def load(self):
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if data.get("block_size") != self.block_size:
+            logging.warning(f"Change map {self.path} uses a different block size; ignoring it")
+            return
+        raw = base64.b64decode(data.get("digests", ""))
+        self.digests = [raw[i:i + DIGEST_SIZE] for i in range(0, len(raw), DIGEST_SIZE)]
+        self.size = data.get("size", 0)
+        self.source = data.get("source")
+        self.findings = data.get("findings", [])
+
+    def bind(self, source, size=None):
+        """
+        Ties the map to the source about to be scanned. A stored baseline from
+        another source, or of another size, is dropped.
+
+        Args:
+            source (str): Fingerprint from source_fingerprint().
+            size (int, optional): Current source size, if known.
+        """
+        if self.has_baseline() and (self.source != source or (size is not None and self.size != size)):
+            logging.warning(f"Change map {self.path} was made for {self.source or 'an unknown source'} "
+                            f"({self.size} bytes), not {source} ({size} bytes); ignoring it")
+            self.digests = []
+            self.findings = []
+            self.size = 0
+        self.source = source
+
+    def save(self):
+        data = {
+            "block_size": self.block_size,
+            "source": self.source,
+            "size": self.size,
+            "digests": base64.b64encode(b"".join(self.digests)).decode("ascii"),
+            "findings": sorted(self.findings, key=lambda f: f["offset"]),
+        }
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+
+    def changed_blocks(self, digests):
+        """
+        Compares new block digests against the stored ones.
+
+        Args:
+            digests (list): Block digests of the current source.
+
+        Returns:
+            set: Indices of blocks that differ or did not exist before.
+        """
+        return {i for i, d in enumerate(digests) if i >= len(self.digests) or self.digests[i] != d}
+
+    def carry_forward(self, changed, size):
+        """
+        Drops findings touched by a change and returns the rest.
+
+        A dropped finding's start block is added to `changed` so it is
+        searched again.
+
+        Returns:
+            list: Findings that are still valid.
+        """
+        kept = []
+        for finding in self.findings:
+            start = finding["offset"]
+            end = start + max(finding["length"], 1)
+            first, last = start // self.block_size, (end - 1) // self.block_size
+            if end > size or any(b in changed for b in range(first, last + 1)):
+                changed.add(first)
+            else:
+                kept.append(finding)
+        self.findings = kept
+        return kept
+
+    def ranges(self, changed, pad=0):
+        """
+        Merges changed block indices into byte ranges.
+
+        Args:
+            changed (set): Changed block indices.
+            pad (int): Bytes added before each range so signatures crossing
+                into a changed block are still seen.
+
+        Returns:
+            list: Sorted (start, end) byte ranges.
+        """
+        ranges = []
+        for index in sorted(changed):
+            start = max(0, index * self.block_size - pad)
+            end = (index + 1) * self.block_size
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def add_finding(self, offset, length, file_type, filename, sha256):
+        self.findings.append({
+            "offset": offset,
+            "length": length,
+            "file_type": file_type,
+            "filename": filename,
+            "sha256": sha256,
+        })
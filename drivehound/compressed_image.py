@@ -0,0 +1,501 @@
+# drivehound/compressed_image.py
+
+"""
+compressed_image.py
+
+Reads gzip, xz and bz2 compressed acquisitions as seekable byte streams, so
+they can be scanned without first being decompressed to scratch disk.
+
+The image is split into independently decodable units: gzip members, bz2
+streams and xz blocks. Their compressed and uncompressed offsets form a
+block-offset index. It is built during the first pass over the image (xz
+carries its own index and needs no pass) and cached in a per-user cache
+directory, never next to the evidence. With the index, a seek starts
+decoding at the nearest unit, and runs of small units are decoded in
+parallel.
+
+Random access is only as fine as the units. Inside a single large gzip
+member, decoder checkpoints taken while reading make later seeks cheap,
+but they live in memory only, so a new process re-inflates the member from
+its start. bz2 decoder state cannot be checkpointed: a single-stream bz2
+image decodes from the start on every backward seek. Multi-member gzip
+(e.g. from pigz or bgzip), multi-stream bz2 (pbzip2) and multi-block xz
+images give real random access.
+"""
+
+import io
+import os
+import bz2
+import json
+import hashlib
+import lzma
+import zlib
+import bisect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+GZIP_MAGIC = b"\x1f\x8b"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+BZ2_MAGIC = b"BZh"
+
+COMPRESSED_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".xz": "xz", ".bz2": "bz2"}
+_MAGICS = {"gzip": GZIP_MAGIC, "xz": XZ_MAGIC, "bz2": BZ2_MAGIC}
+
+INDEX_VERSION = 1
+
+
+def default_index_path(path):
+    """
+    Index cache location for an image: a file named after the image's
+    absolute path in $DRIVEHOUND_CACHE, else $XDG_CACHE_HOME/drivehound or
+    ~/.cache/drivehound.
+    """
+    cache = os.environ.get("DRIVEHOUND_CACHE") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "drivehound")
+    key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:32]
+    return os.path.join(cache, key + ".dhidx")
+
+
+def detect_compression(path):
+    """
+    Returns:
+        str: 'gzip', 'xz' or 'bz2' if path has a compressed-image extension
+             and starts with the matching magic bytes, else None.
+    """
+    fmt = COMPRESSED_EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+    if fmt is None or not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        head = f.read(len(_MAGICS[fmt]))
+    return fmt if head == _MAGICS[fmt] else None
+
+
+def _new_decoder(fmt):
+    if fmt == "gzip":
+        return zlib.decompressobj(zlib.MAX_WBITS | 16)
+    if fmt == "bz2":
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor(lzma.FORMAT_XZ)
+
+
+class _Cursor:
+    """
+    Sequential decoder positioned inside one unit.
+    """
+    def __init__(self, image, unit, comp_pos, uncomp_pos, decoder=None, tail=b""):
+        self.image = image
+        self.unit = unit
+        self.comp_pos = comp_pos      # Next compressed byte to feed
+        self.uncomp_pos = uncomp_pos  # Absolute uncompressed offset of the next output byte
+        self.decoder = decoder or _new_decoder(image.format)
+        self.tail = tail or image._unit_prefix(unit)
+        self.ended = False
+
+    def read(self, n):
+        """Returns up to n bytes, or b'' once the unit has ended."""
+        image = self.image
+        start, comp_len, uncomp_off, uncomp_len = image.units[self.unit]
+        comp_end = start + comp_len if comp_len is not None else None
+        while not self.ended:
+            if uncomp_len is not None and self.uncomp_pos >= uncomp_off + uncomp_len:
+                self.ended = True
+                break
+            if self.tail:
+                data, self.tail = self.tail, b""
+            elif image.format == "gzip" or self.decoder.needs_input:
+                want = image.read_size
+                if comp_end is not None:
+                    want = min(want, comp_end - self.comp_pos)
+                data = image._read_compressed(self.comp_pos, want) if want > 0 else b""
+                self.comp_pos += len(data)
+            else:
+                data = b""
+            out = self.decoder.decompress(data, n)
+            if image.format == "gzip":
+                self.tail = self.decoder.unconsumed_tail
+            if getattr(self.decoder, "eof", False):
+                self.ended = True
+            if out:
+                self.uncomp_pos += len(out)
+                image._maybe_checkpoint(self)
+                return out
+            if not data and not self.ended:
+                # Input exhausted without an end-of-stream marker: truncated image
+                logging.warning(f"{image.path}: compressed data ends early at offset {hex(self.comp_pos)}")
+                self.ended = True
+        return b""
+
+    def end_offset(self):
+        """Compressed offset just past this unit once it has ended."""
+        unused = getattr(self.decoder, "unused_data", b"")
+        return self.comp_pos - len(self.tail) - len(unused)
+
+
+class CompressedImage(io.RawIOBase):
+    """
+    A read-only, seekable file-like object over a gzip, xz or bz2 image.
+
+    The uncompressed size is only known once the index is complete; before
+    that, size is None and seeking relative to the end raises
+    io.UnsupportedOperation (call build_index() to force a pass).
+    """
+    def __init__(self, path, index_path=None, workers=None, checkpoint_interval=64*1024*1024,
+                 parallel_unit_size=32*1024*1024, read_size=256*1024):
+        """
+        Args:
+            path (str): Compressed image.
+            index_path (str, optional): Index cache; defaults to default_index_path(path),
+                outside the evidence directory. Pass False to keep the index in memory only.
+            workers (int, optional): Threads decoding units in parallel.
+            checkpoint_interval (int): Uncompressed bytes between in-memory decoder
+                checkpoints inside large gzip members (None disables them).
+            parallel_unit_size (int): Units up to this size are decoded whole, in parallel.
+            read_size (int): Compressed bytes fed to the decoder per step.
+        """
+        super().__init__()
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(6)
+        self.format = next((fmt for fmt, magic in _MAGICS.items() if head.startswith(magic)), None)
+        if self.format is None:
+            raise ValueError(f"{path} is not a gzip, xz or bz2 file.")
+        self.index_path = default_index_path(path) if index_path is None else index_path
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.checkpoint_interval = checkpoint_interval
+        self.parallel_unit_size = parallel_unit_size
+        self.read_size = read_size
+        self._file = open(path, "rb")
+        stat = os.stat(path)
+        self._source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        # Units: [comp_offset, comp_length, uncomp_offset, uncomp_length]; the
+        # last unit's lengths stay None until decoding reaches its end.
+        self.units = []
+        self.complete = False
+        self._prefixes = []      # xz: stream header of each unit
+        self._checkpoints = []   # (uncomp_pos, unit, comp_pos, tail, decoder) inside gzip members
+        self._checkpoint_positions = []
+        self._index_dirty = False
+        if self.format == "xz":
+            self._read_xz_index()
+        elif not self._load_index():
+            self.units = [[0, None, 0, None]]
+
+        self._pos = 0
+        self._cursor = None
+        self._executor = None
+        self._decoded = {}       # unit -> Future of its bytes
+
+    # -- io.RawIOBase -----------------------------------------------------
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    @property
+    def size(self):
+        if not self.complete:
+            return None
+        _, _, uncomp_off, uncomp_len = self.units[-1]
+        return uncomp_off + uncomp_len
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            if self.size is None:
+                raise io.UnsupportedOperation("Uncompressed size is unknown until the index is built.")
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position.")
+        self._pos = pos
+        return pos
+
+    def readinto(self, b):
+        data = self._read(self._pos, len(b))
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._save_index()
+            if self._executor:
+                self._executor.shutdown(wait=True)
+            self._decoded.clear()
+            self._file.close()
+        super().close()
+
+    def build_index(self):
+        """Decodes to the end of the image, completing (and caching) the index."""
+        while not self.complete:
+            cursor = self._cursor
+            if cursor is None or cursor.ended or cursor.unit != len(self.units) - 1:
+                cursor = self._cursor_for(self._indexed_end())
+            while cursor.read(self.read_size * 16):
+                pass
+            if not self._advance(cursor):
+                break
+        return self.size
+
+    # -- reading ----------------------------------------------------------
+
+    def _read(self, pos, n):
+        out = bytearray()
+        while len(out) < n:
+            if self.size is not None and pos >= self.size:
+                break
+            unit = self._unit_at(pos)
+            if unit is not None and self._parallel(unit):
+                data = self._decoded_unit(unit)
+                _, _, uncomp_off, uncomp_len = self.units[unit]
+                piece = data[pos - uncomp_off:pos - uncomp_off + n - len(out)]
+            else:
+                cursor = self._cursor_for(pos)
+                piece = cursor.read(n - len(out))
+                if not piece:
+                    if not self._advance(cursor):
+                        break
+                    continue
+            out += piece
+            pos += len(piece)
+        return bytes(out)
+
+    def _unit_at(self, pos):
+        """Index of the known unit holding pos, or None if pos is past the indexed area."""
+        i = bisect.bisect_right([u[2] for u in self.units], pos) - 1
+        if i < 0:
+            return None
+        _, _, uncomp_off, uncomp_len = self.units[i]
+        if uncomp_len is None or pos < uncomp_off + uncomp_len:
+            return i
+        return None
+
+    def _indexed_end(self):
+        _, _, uncomp_off, uncomp_len = self.units[-1]
+        return uncomp_off + (uncomp_len or 0)
+
+    def _cursor_for(self, pos):
+        """Returns a cursor positioned at pos, reusing or restarting decoding as cheaply as possible."""
+        cursor = self._cursor
+        restart = self._restart_point(pos)
+        if restart is None:
+            # pos lies beyond the end of the image
+            restart = (self.units[-1][2], lambda: self._unit_cursor(len(self.units) - 1))
+        if cursor is None or cursor.ended or cursor.uncomp_pos > pos or restart[0] > cursor.uncomp_pos:
+            self._cursor = cursor = restart[1]()
+        # Decode forward to pos, discarding output and growing the index on the way
+        while cursor.uncomp_pos < pos:
+            skipped = cursor.read(min(pos - cursor.uncomp_pos, self.read_size * 16))
+            if not skipped:
+                if not self._advance(cursor):
+                    break
+                cursor = self._cursor
+        return self._cursor
+
+    def _restart_point(self, pos):
+        """(uncomp_pos, factory) of the latest unit start or checkpoint at or before pos."""
+        best = None
+        unit = self._unit_at(pos)
+        while unit is None and self._discover_next():
+            unit = self._unit_at(pos)
+        if unit is not None:
+            best = (self.units[unit][2], lambda u=unit: self._unit_cursor(u))
+        i = bisect.bisect_right(self._checkpoint_positions, pos) - 1
+        if i >= 0 and (best is None or self._checkpoints[i][0] > best[0]):
+            uncomp_pos, unit, comp_pos, tail, decoder = self._checkpoints[i]
+            best = (uncomp_pos, lambda: _Cursor(self, unit, comp_pos, uncomp_pos, decoder.copy(), tail))
+        return best
+
+    def _unit_cursor(self, unit):
+        comp_off, _, uncomp_off, _ = self.units[unit]
+        return _Cursor(self, unit, comp_off, uncomp_off)
+
+    def _advance(self, cursor):
+        """
+        Moves past the end of the cursor's unit, recording it in the index.
+
+        Returns:
+            bool: False at the end of the image.
+        """
+        unit = self.units[cursor.unit]
+        if unit[3] is None:
+            unit[1] = cursor.end_offset() - unit[0]
+            unit[3] = cursor.uncomp_pos - unit[2]
+            self._index_dirty = True
+        nxt = cursor.unit + 1
+        if nxt >= len(self.units) and not self._discover_next():
+            return False
+        self._cursor = self._unit_cursor(nxt)
+        return True
+
+    def _discover_next(self):
+        """
+        Appends the unit following the last, fully indexed unit.
+
+        Returns:
+            bool: False if the image has no further units (or the last is still being indexed).
+        """
+        last = self.units[-1]
+        if self.complete or last[3] is None:
+            return False
+        comp_off = last[0] + last[1]
+        if self._read_compressed(comp_off, len(_MAGICS[self.format])) != _MAGICS[self.format]:
+            # No further member/stream (trailing padding or end of file)
+            self.complete = True
+            self._index_dirty = True
+            self._save_index()
+            return False
+        self.units.append([comp_off, None, last[2] + last[3], None])
+        self._index_dirty = True
+        return True
+
+    def _read_compressed(self, offset, size):
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def _maybe_checkpoint(self, cursor):
+        if self.format != "gzip" or not self.checkpoint_interval:
+            return
+        positions = self._checkpoint_positions
+        pos = cursor.uncomp_pos
+        i = bisect.bisect_right(positions, pos)
+        previous = max(positions[i - 1] if i else 0, self.units[cursor.unit][2])
+        if pos - previous < self.checkpoint_interval:
+            return
+        if i < len(positions) and positions[i] - pos < self.checkpoint_interval:
+            return
+        positions.insert(i, pos)
+        self._checkpoints.insert(i, (pos, cursor.unit, cursor.comp_pos, cursor.tail, cursor.decoder.copy()))
+
+    # -- parallel decoding of whole units ----------------------------------
+
+    def _parallel(self, unit):
+        comp_len, uncomp_len = self.units[unit][1], self.units[unit][3]
+        return (self.workers > 1 and comp_len is not None and uncomp_len is not None
+                and uncomp_len <= self.parallel_unit_size and len(self.units) > 1)
+
+    def _decoded_unit(self, unit):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="drivehound-decode")
+        for stale in [u for u in self._decoded if u < unit]:
+            del self._decoded[stale]
+        # Keep the next few units decoding while this one is consumed
+        for ahead in range(unit, min(unit + self.workers, len(self.units))):
+            if ahead not in self._decoded and self._parallel(ahead):
+                self._decoded[ahead] = self._executor.submit(self._decode_unit, ahead)
+        return self._decoded[unit].result()
+
+    def _decode_unit(self, unit):
+        comp_off, comp_len, _, uncomp_len = self.units[unit]
+        with open(self.path, "rb") as f:
+            f.seek(comp_off)
+            data = self._unit_prefix(unit) + f.read(comp_len)
+        decoder = _new_decoder(self.format)
+        out = decoder.decompress(data)
+        if len(out) != uncomp_len:
+            raise IOError(f"{self.path}: unit {unit} decoded to {len(out)} bytes, expected {uncomp_len}")
+        return out
+
+    def _unit_prefix(self, unit):
+        return self._prefixes[unit] if self._prefixes else b""
+
+    # -- index ------------------------------------------------------------
+
+    def _load_index(self):
+        if not self.index_path or not os.path.isfile(self.index_path):
+            return False
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable index {self.index_path}: {e}")
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("format") != self.format or \
+                data.get("source") != self._source or not data.get("units"):
+            logging.info(f"Index {self.index_path} does not match {self.path}; rebuilding")
+            return False
+        self.units = [list(u) for u in data["units"]]
+        self.complete = data.get("complete", False)
+        return True
+
+    def _save_index(self):
+        if not self.index_path or not self._index_dirty or self.format == "xz":
+            return
+        data = {"version": INDEX_VERSION, "format": self.format, "source": self._source,
+                "complete": self.complete, "units": self.units}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+            with open(self.index_path, "w") as f:
+                json.dump(data, f)
+            self._index_dirty = False
+        except OSError as e:
+            logging.warning(f"Could not save index {self.index_path}: {e}")
+
+    def _read_xz_index(self):
+        """Builds the unit list from the indexes stored in every xz stream."""
+        streams = []
+        end = self._source["size"]
+        while end > 0:
+            # Skip stream padding (null bytes in multiples of four)
+            while end >= 4 and self._read_compressed(end - 4, 4) == b"\x00" * 4:
+                end -= 4
+            footer = self._read_compressed(end - 12, 12)
+            if len(footer) != 12 or footer[10:12] != b"YZ":
+                raise ValueError(f"{self.path}: invalid xz stream footer")
+            backward_size = (int.from_bytes(footer[4:8], "little") + 1) * 4
+            index_start = end - 12 - backward_size
+            records = _parse_xz_index(self._read_compressed(index_start, backward_size))
+            blocks_size = sum((unpadded + 3) & ~3 for unpadded, _ in records)
+            stream_start = index_start - blocks_size - 12
+            header = self._read_compressed(stream_start, 12)
+            if not header.startswith(XZ_MAGIC):
+                raise ValueError(f"{self.path}: invalid xz stream header at {hex(stream_start)}")
+            streams.append((stream_start, header, records))
+            end = stream_start
+
+        uncomp_off = 0
+        for stream_start, header, records in reversed(streams):
+            comp_off = stream_start + 12
+            for unpadded, uncomp_len in records:
+                self.units.append([comp_off, (unpadded + 3) & ~3, uncomp_off, uncomp_len])
+                self._prefixes.append(header)
+                comp_off += (unpadded + 3) & ~3
+                uncomp_off += uncomp_len
+        if not self.units:
+            self.units = [[0, 0, 0, 0]]
+            self._prefixes = [b""]
+        self.complete = True
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _parse_xz_index(data):
+    """Returns (unpadded_size, uncompressed_size) for every block of an xz index."""
+    if not data or data[0] != 0x00:
+        raise ValueError("Invalid xz index")
+    count, pos = _read_varint(data, 1)
+    records = []
+    for _ in range(count):
+        unpadded, pos = _read_varint(data, pos)
+        uncompressed, pos = _read_varint(data, pos)
+        records.append((unpadded, uncompressed))
+    return records
@@ -0,0 +1,140 @@
+# drivehound/events.py
+
+"""
+events.py
+
+Structured scan events. The scan thread only puts small tuples on a queue;
+a background thread serializes them as JSON lines and prints a rate-limited
+summary to the console, so hit volume and formatting stay off the scan path.
+"""
+
+import sys
+import json
+import time
+import queue
+import threading
+from collections import Counter
+
+_STOP = object()
+
+
+class EventLog:
+    """
+    Queue-backed event writer with a periodic console summary.
+
+    Each event becomes one JSON line: {"t": unix time, "event": kind, ...fields}.
+    """
+    def __init__(self, path=None, console=sys.stdout, summary_interval=1.0, max_queue=100000):
+        """
+        Args:
+            path (str, optional): JSON-lines file to append events to.
+            console (file, optional): Stream for the summary line; None disables it.
+            summary_interval (float): Minimum seconds between summary lines.
+            max_queue (int): Events buffered before emit() blocks the scan.
+        """
+        self.path = path
+        self.console = console
+        self.summary_interval = summary_interval
+        self.counts = Counter()
+        self.types = Counter()
+        self.position = None
+        self.size = None
+        self.started = time.monotonic()
+        self._queue = queue.Queue(max_queue)
+        self._file = open(path, "a", encoding="utf-8") if path else None
+        self._last_summary = 0.0
+        self._thread = threading.Thread(target=self._run, name="drivehound-events", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def emit(self, kind, **fields):
+        """Queues an event; serialization happens on the background thread."""
+        self._queue.put((time.time(), kind, fields))
+
+    def progress(self, position, size):
+        """Records scan progress for the summary without writing an event line."""
+        self._queue.put((None, position, size))
+
+    def close(self):
+        """Drains the queue, prints a final summary and closes the event file."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._summary(final=True)
+        if self._file:
+            self._file.close()
+
+    def summary(self):
+        """
+        Returns:
+            str: One-line summary of events seen so far.
+        """
+        elapsed = time.monotonic() - self.started
+        parts = [f"{self.counts[kind]} {kind}" for kind in sorted(self.counts)]
+        line = f"[{elapsed:7.1f}s] " + (", ".join(parts) or "no events")
+        if self.types:
+            top = ", ".join(f"{t}: {n}" for t, n in self.types.most_common(5))
+            line += f" ({top})"
+        if self.position is not None:
+            line += f" @ {hex(self.position)}"
+            if self.size:
+                line += f" / {hex(self.size)} ({100 * self.position / self.size:.1f}%)"
+        return line
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.summary_interval)
+            except queue.Empty:
+                self._summary()
+                continue
+            batch = [item]
+            # Drain whatever else is waiting so file writes are batched
+            while len(batch) < 4096:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = self._write(batch)
+            self._summary()
+            if stop:
+                return
+
+    def _write(self, batch):
+        lines = []
+        for item in batch:
+            if item is _STOP:
+                if self._file and lines:
+                    self._file.write("".join(lines))
+                return True
+            stamp, kind, fields = item
+            if stamp is None:
+                self.position, self.size = kind, fields
+                continue
+            self.counts[kind] += 1
+            if kind == "completed" and "file_type" in fields:
+                self.types[fields["file_type"]] += 1
+            if self._file:
+                record = {"t": round(stamp, 6), "event": kind}
+                record.update(fields)
+                lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if self._file and lines:
+            self._file.write("".join(lines))
+        return False
+
+    def _summary(self, final=False):
+        if self.console is None:
+            return
+        now = time.monotonic()
+        if not final and now - self._last_summary < self.summary_interval:
+            return
+        self._last_summary = now
+        self.console.write(self.summary() + "\n")
+        self.console.flush()
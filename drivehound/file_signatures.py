@@ -22,4 +22,57 @@ FILE_SIGNATURES = {
     "gif_89a": (bytes.fromhex("474946383961"), bytes.fromhex("003B"), ".gif"),
     "png": (bytes.fromhex("89504E470D0A1A0A"), bytes.fromhex("49454E44AE426082"), ".png"),
 
-}
\ No newline at end of file
+}
+
+# Size parsers for formats that declare their length instead of ending in a marker.
+# A parser is a generator function: it yields (offset, length) requests for header bytes
+# relative to the start of the carve, receives those bytes, and returns the total carve
+# length, or None if the header gives no usable size (the carve then runs to the end of data).
+
+def riff_size():
+    """RIFF: the chunk size at offset 4 covers everything after the first 8 bytes."""
+    size = int.from_bytes((yield (4, 4)), "little")
+    if size < 4:
+        return None
+    return 8 + size + (size & 1)
+
+
+# Top-level ISO-BMFF boxes; the walk stops at the first header that is not one of these
+ISOBMFF_TOP_LEVEL = {b"ftyp", b"styp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pdin", b"moof",
+                     b"mfra", b"meta", b"uuid", b"sidx", b"ssix", b"prft", b"emsg", b"pnot", b"junk"}
+
+
+def isobmff_size():
+    """ISO-BMFF (MP4, MOV, 3GP, M4A): walks top-level box headers to the end of the last box."""
+    pos = 0
+    while True:
+        header = yield (pos, 8)
+        size, box = int.from_bytes(header[:4], "big"), header[4:8]
+        if box not in ISOBMFF_TOP_LEVEL:
+            return pos if pos else None
+        if size == 0:
+            return None  # Box runs to the end of the file
+        if size == 1:
+            size = int.from_bytes((yield (pos + 8, 8)), "big")
+            if size < 16:
+                return pos if pos else None
+        elif size < 8:
+            return pos if pos else None
+        pos += size
+
+
+# Formats whose magic has variable bytes between fixed parts. Start signatures are hex
+# strings where '??' matches any byte (see matcher.MaskedSignature). None of these have
+# an end marker; a fourth element gives the size parser that bounds the carve. They are
+# kept out of FILE_SIGNATURES and can be merged in explicitly:
+# Hound(signatures={**FILE_SIGNATURES, **MASKED_SIGNATURES})
+MASKED_SIGNATURES = {
+    "wav": ("52494646????????57415645", None, ".wav", riff_size),          # RIFF....WAVE
+    "avi": ("52494646????????41564920", None, ".avi", riff_size),          # RIFF....AVI
+    "webp": ("52494646????????57454250", None, ".webp", riff_size),        # RIFF....WEBP
+    "mp4_isom": ("????????6674797069736F6D", None, ".mp4", isobmff_size),  # ....ftypisom
+    "mp4_mp42": ("????????667479706D703432", None, ".mp4", isobmff_size),  # ....ftypmp42
+    "mov_qt": ("????????6674797071742020", None, ".mov", isobmff_size),    # ....ftypqt
+    "m4a": ("????????667479704D344120", None, ".m4a", isobmff_size),       # ....ftypM4A
+    "3gp": ("????????6674797033677035", None, ".3gp", isobmff_size),       # ....ftyp3gp5
+}
@@ -0,0 +1,296 @@
+# drivehound/governor.py
+
+"""
+governor.py
+
+Bounds the load a scan puts on a live host. Reads pass through token
+buckets for bytes per second and I/O operations per second. They run on
+dedicated reader threads at idle I/O priority and a raised nice level. The
+byte rate backs off while device latency is above a target and recovers as
+it falls.
+"""
+
+import os
+import time
+import ctypes
+import logging
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Linux ioprio_set(2) constants
+IOPRIO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_SET_SYSCALL = {
+    "x86_64": 251, "amd64": 251, "i386": 289, "i686": 289,
+    "aarch64": 30, "arm64": 30, "riscv64": 30, "armv7l": 314,
+    "ppc64le": 273, "ppc64": 273, "s390x": 282,
+}
+
+
+def set_io_priority(io_class="idle", level=7, tid=0):
+    """
+    Sets the Linux I/O scheduling class of a thread (the calling thread by
+    default). Threads created afterwards inherit it.
+
+    Args:
+        io_class (str): 'idle', 'best-effort' or 'realtime'.
+        level (int): Priority within the class, 0 (highest) to 7.
+        tid (int): Native thread id, 0 for the calling thread.
+
+    Returns:
+        bool: True if the priority was applied, False where unsupported or refused.
+    """
+    if io_class not in IOPRIO_CLASSES:
+        raise ValueError(f"io_class must be one of {sorted(IOPRIO_CLASSES)}, not {io_class!r}.")
+    nr = _IOPRIO_SET_SYSCALL.get(platform.machine().lower())
+    if not platform.system() == "Linux" or nr is None:
+        return False
+    value = (IOPRIO_CLASSES[io_class] << _IOPRIO_CLASS_SHIFT) | (level if io_class != "idle" else 0)
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.syscall(nr, _IOPRIO_WHO_PROCESS, tid, value) != 0:
+        logging.warning(f"ioprio_set failed: {os.strerror(ctypes.get_errno())}")
+        return False
+    return True
+
+
+def set_nice(nice, tid=0):
+    """
+    Raises the nice value of a thread (the calling thread by default). A
+    thread already at or above nice is left alone.
+
+    Returns:
+        bool: True if applied.
+    """
+    setpriority = getattr(os, "setpriority", None)
+    if setpriority is None:
+        return False
+    tid = tid or threading.get_native_id()
+    try:
+        # On Linux the nice value is per thread, so target the thread itself
+        if os.getpriority(os.PRIO_PROCESS, tid) >= nice:
+            return True
+        setpriority(os.PRIO_PROCESS, tid, nice)
+    except OSError as e:
+        logging.warning(f"Could not set nice {nice}: {e}")
+        return False
+    return True
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. take() blocks until enough tokens accumulate;
+    requests larger than the burst wait for the burst and go into debt, so
+    the long-run rate holds for any request size.
+    """
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate (float): Tokens added per second.
+            burst (float, optional): Bucket capacity. Defaults to one second of rate.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self._rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self._rate
+
+    @rate.setter
+    def rate(self, value):
+        with self._lock:
+            self._refill()
+            self._rate = float(value)
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    def take(self, amount=1):
+        """
+        Removes amount tokens, sleeping as needed.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class Governor:
+    """
+    Resource limits shared by every reader of a scan.
+    """
+    def __init__(self, bytes_per_second=None, iops=None, io_class="idle", io_level=7, nice=10,
+                 target_latency=None, min_rate=1024*1024, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            bytes_per_second (float, optional): Read bandwidth cap.
+            iops (float, optional): Read request cap.
+            io_class (str, optional): Linux I/O class for reading threads; None leaves it.
+            io_level (int): Priority within io_class.
+            nice (int, optional): Nice value for reading threads; None leaves it.
+            target_latency (float, optional): Seconds per read above which the byte
+                rate backs off. Without a bandwidth cap the starting rate is the
+                throughput observed when latency first exceeds the target.
+            min_rate (float): The adaptive byte rate never drops below this.
+        """
+        self.bytes_per_second = bytes_per_second
+        self.io_class = io_class
+        self.io_level = io_level
+        self.nice = nice
+        self.target_latency = target_latency
+        self.min_rate = min_rate
+        self._clock = clock
+        self._bandwidth = TokenBucket(bytes_per_second, clock=clock, sleep=sleep) if bytes_per_second else None
+        self._iops = TokenBucket(iops, clock=clock, sleep=sleep) if iops else None
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.latency = None          # smoothed seconds per read
+        self.throughput = None       # smoothed bytes per second while reading
+        self.throttled_seconds = 0.0
+        self.bytes_read = 0
+        self.reads = 0
+
+    @property
+    def current_rate(self):
+        """Byte rate currently enforced, or None when unlimited."""
+        return self._bandwidth.rate if self._bandwidth else None
+
+    def enter_thread(self):
+        """
+        Applies the I/O class and nice value to the calling thread, once per
+        thread. The change lasts for the thread's lifetime, so GovernedReader
+        calls it only on its own reader threads.
+        """
+        if getattr(self._local, "applied", False):
+            return
+        self._local.applied = True
+        if self.io_class:
+            set_io_priority(self.io_class, self.io_level)
+        if self.nice is not None:
+            set_nice(self.nice)
+
+    def throttle(self, nbytes):
+        """Waits until a read of nbytes is allowed."""
+        waited = 0.0
+        if self._iops:
+            waited += self._iops.take(1)
+        if self._bandwidth:
+            waited += self._bandwidth.take(nbytes)
+        if waited:
+            with self._lock:
+                self.throttled_seconds += waited
+
+    def observe(self, nbytes, seconds):
+        """Feeds one read's size and latency into the adaptive rate."""
+        with self._lock:
+            self.bytes_read += nbytes
+            self.reads += 1
+            if nbytes and seconds > 0:
+                rate = nbytes / seconds
+                self.throughput = rate if self.throughput is None else 0.8 * self.throughput + 0.2 * rate
+            self.latency = seconds if self.latency is None else 0.8 * self.latency + 0.2 * seconds
+            if self.target_latency is None:
+                return
+            if self.latency > self.target_latency:
+                # Multiplicative decrease while the device is struggling
+                if self._bandwidth is None:
+                    if not self.throughput:
+                        return
+                    self._bandwidth = TokenBucket(max(self.min_rate, self.throughput), clock=self._clock,
+                                                  sleep=self._sleep)
+                self._bandwidth.rate = max(self.min_rate, self._bandwidth.rate * 0.7)
+            elif self._bandwidth is not None:
+                # Additive increase back towards the configured cap
+                ceiling = self.bytes_per_second or float("inf")
+                step = (self.bytes_per_second or self._bandwidth.rate) * 0.05
+                self._bandwidth.rate = min(ceiling, self._bandwidth.rate + step)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Bytes and reads so far, smoothed latency and throughput,
+                  enforced byte rate and total seconds spent throttled.
+        """
+        with self._lock:
+            return {
+                'bytes_read': self.bytes_read,
+                'reads': self.reads,
+                'latency': self.latency,
+                'throughput': self.throughput,
+                'rate': self.current_rate,
+                'throttled_seconds': self.throttled_seconds,
+            }
+
+
+class GovernedReader:
+    """
+    Wraps a DriveChunkReader so every read goes through a Governor.
+
+    Reads run on a reader thread owned by this wrapper, and only that thread
+    gets the governor's I/O class and nice value. The calling thread, whether
+    the main thread, an AsyncHound worker or a thread of an embedding
+    application, keeps its priority. An unprivileged process could not lower
+    a raised nice value again. The reader thread exits on close(), so
+    nothing is left running at reduced priority. Seeks and opening the
+    device still happen on the caller's thread at its normal priority.
+    """
+    def __init__(self, reader, governor):
+        self.reader = reader
+        self.governor = governor
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="drivehound-governed",
+                                            initializer=governor.enter_thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getattr__(self, name):
+        # Delegate position, file_obj, bad_map, size, ... to the wrapped reader
+        if name in ('reader', '_executor'):
+            raise AttributeError(name)
+        return getattr(self.reader, name)
+
+    @property
+    def chunk_size(self):
+        return self.reader.chunk_size
+
+    @chunk_size.setter
+    def chunk_size(self, value):
+        self.reader.chunk_size = value
+
+    def read_chunk(self):
+        return self._executor.submit(self._read).result()
+
+    def _read(self):
+        governor = self.governor
+        governor.throttle(self.reader.chunk_size)
+        started = time.perf_counter()
+        data = self.reader.read_chunk()
+        governor.observe(len(data), time.perf_counter() - started)
+        return data
+
+    def seek(self, offset):
+        self.reader.seek(offset)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.reader.close()
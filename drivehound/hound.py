@@ -1,11 +1,345 @@
 # drivehound/hound.py
 
 import os
+import queue
 import logging
 import time
-from collections import defaultdict
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter, defaultdict, namedtuple
 from .file_signatures import FILE_SIGNATURES
-from .win_drive_tools import open_drive
+from .win_drive_tools import open_drive, partition_layout, stream_size
+from .catalog import Catalog, source_id
+from .change_map import ChangeMap, BlockHasher, source_fingerprint
+from .autotune import AutoTuner, PrefetchReader
+from .sinks import CarvedFile, FileSink, MemorySink
+from .output_manager import OutputManager
+from .matcher import SignatureMatcher, compile_signature
+from .known_hashes import KnownHashes
+from .survey import survey
+from .scheduler import RegionScheduler
+from .vm_disks import VirtualDisk
+from .analyzers import AnalyzerHit, AnalyzerSet
+from .governor import GovernedReader
+
+
+class ScanTick(namedtuple('ScanTick', ['position', 'size'])):
+    """Progress marker yielded between chunks by Hound._scan(ticks=True)."""
+    __slots__ = ()
+
+
+class ScanStats:
+    """
+    Counters of one scan call. Concurrent unit scans under the same call
+    share one instance, so updates are locked.
+
+    Attributes:
+        skipped (int): Carves skipped because the catalog already holds them.
+        suppressed (int): Carves discarded as known files.
+        hits (Counter): Analyzer hits per analyzer name.
+        tuned_settings (dict): Autotune result, if autotuning ran.
+    """
+    def __init__(self):
+        self.skipped = 0
+        self.suppressed = 0
+        self.hits = Counter()
+        self.tuned_settings = None
+        self._lock = threading.Lock()
+
+    def add(self, skipped=0, suppressed=0, hits=None):
+        with self._lock:
+            self.skipped += skipped
+            self.suppressed += suppressed
+            if hits:
+                self.hits.update(hits)
+
+    def hit(self, analyzer):
+        with self._lock:
+            self.hits[analyzer] += 1
+
+
+def _intersect_ranges(ranges, allowed):
+    """Clips (start, end) ranges to the sorted allowed ranges, keeping their order."""
+    clipped = []
+    for start, end in ranges:
+        for lo, hi in allowed:
+            if lo < end and hi > start:
+                clipped.append((max(start, lo), min(end, hi)))
+    return clipped
+
+
+def _uncovered(start, end, covered):
+    """Parts of [start, end) outside the sorted, disjoint covered intervals."""
+    parts = []
+    for lo, hi in covered:
+        if hi <= start:
+            continue
+        if lo >= end:
+            break
+        if lo > start:
+            parts.append((start, lo))
+        start = max(start, hi)
+    if start < end:
+        parts.append((start, end))
+    return parts
+
+
+def _cover(covered, start, end):
+    """Adds [start, end) to the sorted, disjoint covered intervals, merging neighbours."""
+    merged = []
+    for lo, hi in covered:
+        if hi < start or lo > end:
+            merged.append((lo, hi))
+        else:
+            start, end = min(start, lo), max(end, hi)
+    merged.append((start, end))
+    merged.sort()
+    return merged
+
+
+class _Extraction:
+    """
+    A file being carved: where it started, the sink handle it streams into,
+    and a running length and SHA-256 of everything written so far. A format
+    with a size parser ends at the length its header declares.
+    """
+    def __init__(self, file_type, start_offset, end_sig, end_search_offset, filename, sink, sizer=None):
+        self.file_type = file_type
+        self.start_offset = start_offset
+        self.end_sig = end_sig
+        # Running size parser and its pending (relative offset, length) header request
+        self.sizer = sizer() if sizer else None
+        self.request = next(self.sizer) if self.sizer else None
+        self.end_offset = None             # Absolute end once the size parser has finished
+        # Absolute offset from which the end signature may be searched
+        self.end_search_offset = end_search_offset
+        self.filename = filename
+        self.sink = sink
+        self.handle = sink.open(file_type, start_offset, filename)
+        self.length = 0
+        self.hasher = hashlib.sha256()
+
+    def write(self, data):
+        if not data:
+            return
+        self.sink.write(self.handle, data)
+        self.hasher.update(data)
+        self.length += len(data)
+
+    def close(self, complete, known_hashes=None, suppress=False):
+        """
+        Closes the sink handle and returns the finished CarvedFile. A carve whose
+        hash is in known_hashes is marked known and, with suppress, discarded
+        from the sink instead of being closed.
+        """
+        sha256 = self.hasher.hexdigest()
+        known = known_hashes is not None and sha256 in known_hashes
+        if known and suppress:
+            self.sink.discard(self.handle)
+            payload = None
+        else:
+            payload = self.sink.close(self.handle)
+        return CarvedFile(self.file_type, self.start_offset, self.length, sha256,
+                          self.filename, complete, payload, known)
+
+
+class _CarveStream:
+    """
+    Push-based carving state machine. Chunks are fed in order with their
+    absolute offsets tracked internally; carves are streamed into the sink
+    and returned as CarvedFile records from feed() and finish().
+    """
+    def __init__(self, hound, files_found, sink, start_offset=0, limit=None, known=None, run_id=None, reserved=None):
+        self.hound = hound
+        self.files_found = files_found
+        self.sink = sink
+        self.limit = limit                 # No new carves start at or beyond this offset
+        self.known = known or {}
+        self.run_id = run_id
+        self.reserved = reserved or set()  # Output names that must not be reused
+        self.buffer = b""
+        self.buffer_offset = start_offset  # Absolute offset of buffer[0]
+        self.extraction = None
+        self.skip_until = start_offset     # Data before this offset is discarded
+        self.skipped = 0
+        self.suppressed = 0
+
+    @property
+    def done(self):
+        """True once every offset before limit was searched and no carve is open."""
+        return self.limit is not None and self.extraction is None and self.buffer_offset >= self.limit
+
+    def jump(self, offset):
+        """Repositions the stream after the reader has seeked forward to offset."""
+        self.buffer = b""
+        self.buffer_offset = offset
+
+    def feed(self, chunk):
+        """
+        Processes the next chunk of data.
+
+        Returns:
+            list: CarvedFile records completed within this chunk.
+        """
+        self.buffer += chunk
+        completed = []
+        pos = 0
+        if self.skip_until > self.buffer_offset:
+            pos = min(len(self.buffer), self.skip_until - self.buffer_offset)
+
+        while True:
+            extraction = self.extraction
+            if extraction:
+                if extraction.sizer:
+                    self._parse_size(extraction)
+                end_sig = extraction.end_sig
+                if extraction.end_offset is not None:
+                    stop = max(pos, extraction.end_offset - self.buffer_offset)
+                    if stop <= len(self.buffer):
+                        extraction.write(self.buffer[pos:stop])
+                        carve = self._complete(extraction, found_end=True)
+                        if carve:
+                            completed.append(carve)
+                        pos = stop
+                        continue
+                    keep = len(self.buffer)
+                elif extraction.sizer:
+                    # Hold back from the header bytes the size parser still needs
+                    needed = extraction.start_offset + extraction.request[0] - self.buffer_offset
+                    keep = min(len(self.buffer), max(pos, needed))
+                elif end_sig:
+                    search_from = max(pos, extraction.end_search_offset - self.buffer_offset)
+                    end_pos = self.buffer.find(end_sig, search_from)
+                    if end_pos >= 0:
+                        stop = end_pos + len(end_sig)
+                        extraction.write(self.buffer[pos:stop])
+                        carve = self._complete(extraction, found_end=True)
+                        if carve:
+                            completed.append(carve)
+                        pos = stop
+                        continue
+                    # Hold back a partial end signature that may straddle the next chunk
+                    keep = max(pos, len(self.buffer) - (len(end_sig) - 1))
+                else:
+                    keep = len(self.buffer)
+                extraction.write(self.buffer[pos:keep])
+                pos = keep
+                break
+
+            hit = self.hound._find_start(self.buffer, pos)
+            if hit is None:
+                # Retain enough tail to catch a start signature crossing chunks
+                pos = max(pos, len(self.buffer) - (self.hound.max_start_sig_len - 1))
+                break
+            idx, file_type = hit
+            offset = self.buffer_offset + idx
+            if self.limit is not None and offset >= self.limit:
+                pos = idx
+                break
+            known = self.known.get(offset)
+            if known and known[0] == file_type:
+                # Already recovered by an earlier run: skip over the whole carve
+                self.skipped += 1
+                if self.hound.events:
+                    self.hound.events.emit("skipped", file_type=file_type, offset=offset)
+                elif self.hound.verbose:
+                    logging.info(f"Skipping {file_type} at offset {hex(offset)}, already in catalog")
+                self.skip_until = offset + max(known[1], 1)
+                pos = min(len(self.buffer), self.skip_until - self.buffer_offset)
+                continue
+            self.extraction = self._start(file_type, offset)
+            pos = idx
+
+        self.buffer = self.buffer[pos:]
+        self.buffer_offset += pos
+        return completed
+
+    def finish(self):
+        """
+        Flushes the remaining buffer into any open extraction at end of data.
+
+        Returns:
+            list: The CarvedFile closed at EOF, if any.
+        """
+        completed = []
+        if self.extraction:
+            self.extraction.write(self.buffer)
+            carve = self._complete(self.extraction, found_end=False)
+            if carve:
+                completed.append(carve)
+        self.buffer = b""
+        return completed
+
+    def _parse_size(self, extraction):
+        """Feeds buffered header bytes to a carve's size parser until it needs more or finishes."""
+        while extraction.request is not None:
+            rel, length = extraction.request
+            at = extraction.start_offset + rel - self.buffer_offset
+            if at < 0:
+                # Header bytes already flushed (a jump): fall back to carving without a size
+                extraction.sizer = extraction.request = None
+                return
+            if at + length > len(self.buffer):
+                return
+            try:
+                extraction.request = extraction.sizer.send(self.buffer[at:at + length])
+            except StopIteration as stop:
+                extraction.sizer = extraction.request = None
+                if stop.value is not None:
+                    extraction.end_offset = extraction.start_offset + stop.value
+                    extraction.sink.reserve(extraction.handle, stop.value)
+
+    def _start(self, file_type, offset):
+        signature = self.hound.signatures[file_type]
+        start_sig, end_sig, ext = signature[:3]
+        sizer = signature[3] if len(signature) > 3 else None
+        index = self.files_found[file_type]
+        prefix = file_type if self.run_id is None else f"{file_type}_{self.run_id}"  # Unique across cataloged runs
+        filename = f"{prefix}_{index}{ext}"
+        while filename in self.reserved:
+            index += 1
+            filename = f"{prefix}_{index}{ext}"
+        self.files_found[file_type] += 1
+        if self.hound.events:
+            self.hound.events.emit("found", file_type=file_type, offset=offset, filename=filename)
+        elif self.hound.verbose:
+            logging.info(f"Found {file_type} at offset {hex(offset)}, saving as {filename}")
+        return _Extraction(file_type, offset, end_sig, offset + len(start_sig), filename, self.sink, sizer)
+
+    def _complete(self, extraction, found_end):
+        """Closes a carve; returns None if it was suppressed as a known file."""
+        self.extraction = None
+        hound = self.hound
+        suppress = hound.known_action == "suppress"
+        carve = extraction.close(found_end, hound.known_hashes, suppress)
+        if carve.known and suppress:
+            # Free the name and count for the next carve of this type
+            self.files_found[carve.file_type] -= 1
+            if not self.files_found[carve.file_type]:
+                # A type whose only carves were suppressed was not found
+                del self.files_found[carve.file_type]
+            self.suppressed += 1
+            if hound.events:
+                hound.events.emit("suppressed", file_type=carve.file_type, offset=carve.offset,
+                                  length=carve.length, sha256=carve.sha256)
+            elif hound.verbose:
+                logging.info(f"Suppressed known {carve.file_type} file at offset {hex(carve.offset)}")
+            return None
+        if hound.events:
+            hound.events.emit("completed", file_type=carve.file_type, offset=carve.offset, length=carve.length,
+                              sha256=carve.sha256, filename=carve.filename, complete=found_end)
+        elif hound.verbose:
+            suffix = "" if found_end else " (no end signature)"
+            logging.info(f"Completed {carve.file_type} file{suffix} started at offset {hex(carve.offset)}")
+        return carve
+
+    def abort(self):
+        """Closes an unfinished carve's sink handle when a scan is abandoned."""
+        if self.extraction:
+            self.extraction.close(False)
+            self.extraction = None
+
 
 class Hound:
     def __init__(self, signatures=FILE_SIGNATURES, 
@@ -13,17 +347,63 @@ class Hound:
                  chunk_size=512*1024, 
                  output_dir="recovered_files", 
                  target_filetype=None,
-                 verbose=True):
+                 verbose=True,
+                 fault_tolerant=False,
+                 error_map=None,
+                 catalog=None,
+                 change_map=None,
+                 change_block_size=1024*1024,
+                 autotune=False,
+                 max_open_files=64,
+                 write_block_size=1024*1024,
+                 preallocate=False,
+                 known_hashes=None,
+                 known_action="suppress",
+                 events=None,
+                 analyzers=None,
+                 governor=None):
         """
         Hound provides a verbose, tuned, and potentially faster file recovery approach.
 
         Args:
-            signatures (dict): Dictionary of file signatures: { "type": (start_sig, end_sig, extension) }
+            signatures (dict): Dictionary of file signatures: { "type": (start_sig, end_sig, extension) }.
+                start_sig may be bytes, a MaskedSignature or a hex string with '??' wildcards.
+                An optional fourth element is a size parser (see file_signatures.riff_size)
+                that ends the carve at the length declared in the file's header.
             sector_size (int): Sector size for offset calculations.
             chunk_size (int): Number of bytes to read per iteration; larger is generally faster.
             output_dir (str): Directory to store recovered files.
             target_filetype (str): If provided, only recover this specific file type.
             verbose (bool): If True, print verbose logs.
+            fault_tolerant (bool): If True, skip and zero-fill unreadable sectors instead of aborting.
+            error_map (str): Path of a ddrescue-style bad sector map to reuse and update.
+            catalog (str/Catalog): SQLite catalog (path or instance) recording carved artifacts.
+                Carves already in the catalog for the same source are skipped.
+            change_map (str): Path of a block-hash change map. When it holds a previous
+                scan of the source, only changed blocks are searched and findings from
+                unchanged blocks are carried forward.
+            change_block_size (int): Block size hashed for the change map.
+            autotune (bool): If True, tune chunk size and read-ahead depth from measured
+                throughput during the first seconds of each scan. The chosen settings
+                are logged and kept in `tuned_settings`.
+            max_open_files (int): Output file handles kept open at once; carves beyond
+                this are closed and reopened in append mode as data arrives.
+            write_block_size (int): Carved data is buffered per file and written in
+                multiples of this size.
+            preallocate (bool): Reserve disk space with fallocate for carves whose
+                length is declared in their header (see MASKED_SIGNATURES), so
+                large media files are written without fragmenting.
+            known_hashes (str/KnownHashes): Known-file SHA-256 set (hash list, saved
+                filter or instance). Carves are hashed as they stream and checked on completion.
+            known_action (str): 'suppress' to discard known carves before they are
+                committed to disk, or 'flag' to keep them with CarvedFile.known set.
+            events (EventLog): Structured event channel. When set, per-carve events go
+                there instead of the log, and scan progress feeds its console summary.
+            analyzers (list): Analyzer plugins run over every chunk of the same read
+                pass. Their AnalyzerHit records are yielded by iter_carves alongside
+                carves and counted per analyzer in `last_hits`.
+            governor (Governor): Rate limits, I/O priority, nice value and latency
+                target applied to every read, for scans of busy production disks.
         """
         self.signatures = signatures
         self.sector_size = sector_size
@@ -31,6 +411,25 @@ class Hound:
         self.output_dir = output_dir
         self.target_filetype = target_filetype
         self.verbose = verbose
+        self.fault_tolerant = fault_tolerant
+        self.error_map = error_map
+        if isinstance(catalog, str):
+            catalog = Catalog(catalog)
+        self.catalog = catalog
+        self.change_map = change_map
+        self.change_block_size = change_block_size
+        self.autotune = autotune
+        self.stats = ScanStats()
+        if known_action not in ("suppress", "flag"):
+            raise ValueError(f"known_action must be 'suppress' or 'flag', not {known_action!r}.")
+        if isinstance(known_hashes, str):
+            known_hashes = KnownHashes.from_file(known_hashes)
+        self.known_hashes = known_hashes
+        self.known_action = known_action
+        self.events = events
+        self.analyzers = list(analyzers or [])
+        self.governor = governor
+        self.output = OutputManager(max_open=max_open_files, block_size=write_block_size, preallocate=preallocate)
         os.makedirs(self.output_dir, exist_ok=True)
 
         # Configure logging
@@ -47,7 +446,8 @@ class Hound:
         # Filter out any signatures that don't have a valid start signature
         # We only handle start-signature based carving here. 
         # If a format doesn't have a start signature, it is very tricky to carve reliably.
-        valid_signatures = {k: v for k, v in self.signatures.items() if v[0] is not None}
+        valid_signatures = {k: (compile_signature(v[0]),) + tuple(v[1:])
+                            for k, v in self.signatures.items() if v[0] is not None}
         if not valid_signatures:
             logging.warning("No signatures with a valid start signature found. Nothing will be carved.")
         self.signatures = valid_signatures
@@ -57,13 +457,84 @@ class Hound:
         else:
             # No valid signatures, just set a default
             self.max_start_sig_len = 1
+        self._matcher = SignatureMatcher({k: v[0] for k, v in self.signatures.items()})
+
+    def __getstate__(self):
+        # Copies sent to worker processes keep the settings; output pool,
+        # counters and matcher state are rebuilt on the other side
+        state = dict(self.__dict__)
+        output = state.pop('output')
+        state['output'] = (output.max_open, output.block_size, output.preallocate)
+        del state['stats'], state['_matcher']
+        return state
+
+    def __setstate__(self, state):
+        max_open, block_size, preallocate = state['output']
+        state['output'] = OutputManager(max_open=max_open, block_size=block_size, preallocate=preallocate)
+        self.__dict__.update(state)
+        self.stats = ScanStats()
+        self._matcher = SignatureMatcher({k: v[0] for k, v in self.signatures.items()})
 
-    def recover_files(self, drive):
+    @property
+    def last_skipped(self):
+        """Carves skipped as already recovered by the latest scan call."""
+        return self.stats.skipped
+
+    @property
+    def last_suppressed(self):
+        """Known carves suppressed by the latest scan call."""
+        return self.stats.suppressed
+
+    @property
+    def last_hits(self):
+        """Analyzer hits per analyzer in the latest scan call."""
+        return self.stats.hits
+
+    @property
+    def tuned_settings(self):
+        """Autotune result of the latest scan call, or None."""
+        return self.stats.tuned_settings
+
+    def _open_reader(self, drive):
+        """
+        Opens the drive as a chunk reader, enabling fault tolerance if requested.
+        With a governor every read is throttled, and with autotune the reader
+        is wrapped in a PrefetchReader.
+        """
+        options = {}
+        if self.fault_tolerant:
+            options = {'fault_tolerant': True, 'error_map': self.error_map}
+        reader = open_drive(
+            drive,
+            mode="rb",
+            sector_size=self.sector_size,
+            chunk_size=self.chunk_size,
+            **options
+        )
+        if self.governor:
+            reader = GovernedReader(reader, self.governor)
+        if self.autotune:
+            reader = PrefetchReader(reader)
+        return reader
+
+    def _find_start(self, buffer, pos):
+        """
+        Finds the earliest start signature in buffer at or after pos.
+
+        Returns:
+            tuple: (index, file_type), or None if no signature occurs.
+        """
+        return self._matcher.find(buffer, pos)
+
+    def recover_files(self, drive, schedule=None):
         """
         Recovers files from a specified drive using known file signatures.
 
         Args:
-            drive (str/int): The drive identifier (e.g., 'C' for Windows partition, or '/dev/sda1' on Linux)
+            drive (str/int/list): The drive identifier (e.g., 'C' for Windows partition, or '/dev/sda1' on Linux),
+                or a list of split image segments to scan as one device.
+            schedule (list, optional): (start, end) ranges in the order to scan them,
+                e.g. from plan_schedule(). Defaults to a sequential scan.
 
         Returns:
             dict: A dictionary with file types as keys and counts as values.
@@ -72,104 +543,479 @@ class Hound:
         files_found = defaultdict(int)
 
         # If no signatures with start bytes, just return immediately
-        if not self.signatures:
+        if not self.signatures and not self.analyzers:
             if self.verbose:
                 logging.info("No valid start-signature-based files to recover.")
             return files_found
 
-        buffer = b""
         total_files_carved = 0
-        active_extractions = []  # Each element: { 'file_type', 'outfile', 'end_sig', 'start_offset' }
-
-        with open_drive(
-    		drive,
-		mode="rb",
-    		sector_size=self.sector_size,
-    		chunk_size=self.chunk_size
-		) as reader:
-
-            while True:
-                chunk = reader.read_chunk()
-                if not chunk:
-                    # EOF reached
-                    break
-
-                buffer += chunk
-
-                # Handle continuing extraction for files that are currently being carved.
-                new_active = []
-                for extraction in active_extractions:
-                    if extraction['end_sig']:
-                        end_pos = buffer.find(extraction['end_sig'])
-                        if end_pos >= 0:
-                            # Found the end of the file
-                            extraction['outfile'].write(buffer[:end_pos + len(extraction['end_sig'])])
-                            extraction['outfile'].close()
-                            if self.verbose:
-                                logging.info(f"Completed {extraction['file_type']} file started at offset {hex(extraction['start_offset'])}")
-                            buffer = buffer[end_pos + len(extraction['end_sig']):]
-                            continue
-                        else:
-                            # No end found yet, write entire buffer and continue
-                            extraction['outfile'].write(buffer)
-                            buffer = b""
-                            new_active.append(extraction)
-                    else:
-                        # No end signature, write until EOF
-                        extraction['outfile'].write(buffer)
-                        buffer = b""
-                        new_active.append(extraction)
-
-                active_extractions = new_active
-
-                # Try to find new start signatures if buffer has data
-                if buffer:
-                    something_found = True
-                    while something_found and self.signatures:
-                        something_found = False
-                        for file_type, (start_sig, end_sig, ext) in self.signatures.items():
-                            start_idx = buffer.find(start_sig)
-                            if start_idx >= 0:
-                                start_offset = (reader.position - len(buffer)) + start_idx
-                                filename = f"{file_type}_{files_found[file_type]}{ext}"
-                                files_found[file_type] += 1
-                                total_files_carved += 1
-                                if self.verbose:
-                                    logging.info(f"Found {file_type} at offset {hex(start_offset)}, saving as {filename}")
-                                out_path = os.path.join(self.output_dir, filename)
-                                outfile = open(out_path, "wb")
-                                # Write from start_idx onwards
-                                outfile.write(buffer[start_idx:])
-                                # Clear the buffer because we've written everything after start_idx
-                                buffer = b""
-                                # Track extraction
-                                active_extractions.append({
-                                    'file_type': file_type,
-                                    'outfile': outfile,
-                                    'end_sig': end_sig,
-                                    'start_offset': start_offset
-                                })
-                                something_found = True
-                                # Break to re-check from start since buffer changed
-                                break
-
-                    # Keep some buffer tail if no active extractions:
-                    if not active_extractions and self.max_start_sig_len > 1:
-                        max_retain = self.max_start_sig_len - 1
-                        buffer = buffer[-max_retain:]
-
-            # End of file: Close any extractions without end sig
-            for extraction in active_extractions:
-                extraction['outfile'].write(buffer)
-                extraction['outfile'].close()
-                if self.verbose:
-                    logging.info(f"Completed {extraction['file_type']} file (no end signature) started at offset {hex(extraction['start_offset'])}")
+        for item in self._scan(drive, FileSink(self.output_dir, self.output), files_found,
+                               ranges=schedule, ordered=schedule is not None):
+            if isinstance(item, CarvedFile):
+                total_files_carved += 1
 
         end_time = time.time()
         elapsed = end_time - start_time
         if self.verbose:
             logging.info(f"Recovery complete. Total files carved: {total_files_carved}. Time taken: {elapsed:.2f} seconds.")
+            if self.last_skipped:
+                logging.info(f"  {self.last_skipped} carves skipped (already recovered)")
+            if self.last_suppressed:
+                logging.info(f"  {self.last_suppressed} known files suppressed")
             for ftype, count in files_found.items():
                 logging.info(f"  {ftype}: {count} files recovered")
+            for name, count in self.last_hits.items():
+                logging.info(f"  {name}: {count} analyzer hits")
 
         return files_found
+
+    def iter_carves(self, drive, sink=None, ranges=None, schedule=None):
+        """
+        Lazily scans a drive, yielding each carve as soon as it is complete.
+
+        Carved data is streamed into `sink` while the scan runs, so callers can
+        hash, classify or store it without a round trip through output_dir.
+
+        Args:
+            drive (str/int/list): The drive identifier, as for recover_files.
+            sink (CarveSink, optional): Destination for carved data. Defaults to a
+                MemorySink, making CarvedFile.payload the carved bytes.
+            ranges (list, optional): (start, end) byte ranges to search instead of
+                the whole drive. Carves must start inside a range but are followed
+                past its end to their end signature.
+            schedule (list, optional): Ranges scanned in the given priority order
+                rather than by offset, e.g. from plan_schedule().
+
+        Yields:
+            CarvedFile: One record per carve, in the order carves complete. With
+                analyzers configured, AnalyzerHit records are interleaved as their
+                matches are found.
+        """
+        if not self.signatures and not self.analyzers:
+            return
+        sink = sink if sink is not None else MemorySink()
+        if schedule is not None:
+            yield from self._scan(drive, sink, defaultdict(int), ranges=schedule, ordered=True)
+        else:
+            yield from self._scan(drive, sink, defaultdict(int), ranges=ranges)
+
+    def plan_schedule(self, drive, ranges=None, survey=None, heuristics=True, region_size=64*1024*1024):
+        """
+        Orders the regions of a drive so the likeliest results are scanned first.
+
+        The plan always covers the whole drive exactly once; priorities only
+        change the order. Carve offsets stay absolute.
+
+        Args:
+            drive (str/list): The drive identifier, as for recover_files.
+            ranges (list, optional): (start, end) ranges of interest, scanned first.
+            survey (SurveyReport, optional): Prior survey; denser regions rank higher.
+            heuristics (bool): Favour the middle of the drive and the start of each partition.
+            region_size (int): Granularity of the plan.
+
+        Returns:
+            list: (start, end) ranges for the schedule argument of recover_files or iter_carves.
+        """
+        with open_drive(drive, "rb") as f:
+            layout = partition_layout(f, self.sector_size) if heuristics else []
+            size = stream_size(f)
+        if size is None:
+            raise ValueError(f"Cannot schedule {drive}: size is unknown.")
+        scheduler = RegionScheduler(size, region_size)
+        if heuristics:
+            scheduler.boost_heuristics(layout)
+        if survey is not None:
+            scheduler.boost_survey(survey)
+        for start, end in ranges or ():
+            scheduler.boost(start, end)
+        return scheduler.plan()
+
+    def survey(self, drive, fraction=0.01, randomize=False, seed=None, max_samples=None):
+        """
+        Previews a drive by searching a sample of chunks spread across it.
+
+        Args:
+            drive (str/list): The drive identifier, as for recover_files.
+            fraction (float): Share of the drive to read (0.01 reads 1%).
+            randomize (bool): Sample random chunks instead of an even stride.
+            seed (int, optional): Seed for repeatable random samples.
+            max_samples (int, optional): Cap on the number of chunks read.
+
+        Returns:
+            SurveyReport: Hit counts, extrapolated totals per type and the estimated full-scan time.
+        """
+        with self._open_reader(drive) as reader:
+            if reader.size is None:
+                raise ValueError(f"Cannot survey {drive}: size is unknown.")
+            report = survey(self, reader, reader.size, fraction, randomize, seed, max_samples)
+        if self.verbose:
+            logging.info(report.summary())
+        return report
+
+    def scan_units(self, drive):
+        """
+        Returns:
+            list: Partition tuples for every partition and gap of a raw disk or image.
+        """
+        with open_drive(drive, "rb") as f:
+            return partition_layout(f, self.sector_size)
+
+    def recover_partitions(self, drive, workers=None, processes=False):
+        """
+        Recovers files partition by partition, scanning partitions and the gaps
+        between them concurrently. Each unit's files go to a subdirectory of
+        output_dir named after its label ('p1', 'gap0', ...). last_skipped and
+        the other last_* totals cover all units.
+
+        By default units run on threads: their device reads overlap, but
+        signature matching is Python code bound by the GIL and does not spread
+        across cores. With processes=True each unit is scanned in a worker
+        process by a copy of this Hound, so matching uses several cores.
+
+        Args:
+            drive (str/list): Raw disk or image with an MBR or GPT partition table.
+            workers (int, optional): Concurrent scans; defaults to one per unit, up to the CPU count.
+            processes (bool): Scan units in a process pool. A catalog, event log,
+                governor or error map cannot be shared across processes and is
+                refused with ValueError.
+
+        Returns:
+            dict: { label: { file_type: count } }.
+        """
+        units = self.scan_units(drive)
+        found = {}
+        self.stats = ScanStats()
+        if processes:
+            self._scan_units_in_processes(drive, units, workers, found, self.stats)
+        else:
+            for _ in self._scan_units(drive, units, self._unit_file_sink, workers, found, self.stats):
+                pass
+        if self.verbose:
+            for unit in units:
+                counts = found.get(unit.label) or {}
+                summary = ", ".join(f"{t}: {n}" for t, n in counts.items()) or "nothing"
+                logging.info(f"{unit.label} [{hex(unit.start)}-{hex(unit.end)}]: {summary}")
+        return {label: dict(counts) for label, counts in found.items()}
+
+    def iter_partition_carves(self, drive, sink=None, workers=None):
+        """
+        Lazily scans every partition and gap concurrently (threads, as for
+        recover_partitions), yielding carves as they complete. Each CarvedFile is labelled with its partition and
+        partition-relative offset; CarvedFile.offset stays absolute.
+
+        Args:
+            drive (str/list): Raw disk or image.
+            sink (CarveSink, optional): Destination shared by all units; must be
+                thread safe. Defaults to a MemorySink.
+            workers (int, optional): Concurrent scans.
+        """
+        if not self.signatures and not self.analyzers:
+            return
+        sink = sink if sink is not None else MemorySink()
+        self.stats = ScanStats()
+        yield from self._scan_units(drive, self.scan_units(drive), lambda unit: sink, workers, {}, self.stats)
+
+    def _unit_file_sink(self, unit):
+        return FileSink(os.path.join(self.output_dir, unit.label), self.output)
+
+    def _scan_units_in_processes(self, drive, units, workers, found, stats):
+        """
+        Runs one range scan per unit in a process pool, each writing its own
+        unit's files, and adds up their counts and counters.
+        """
+        if self.catalog or self.events or self.governor or self.error_map:
+            raise ValueError("A catalog, event log, governor or error map cannot be used with processes=True.")
+        if not units:
+            return
+        workers = workers or min(len(units), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_scan_unit, self, drive, unit) for unit in units]
+            for unit, future in zip(units, futures):
+                counts, skipped, suppressed, hits = future.result()
+                found[unit.label] = counts
+                stats.add(skipped, suppressed, hits)
+
+    def _scan_units(self, drive, units, sink_for, workers, found, stats):
+        """
+        Runs one range scan per unit on a thread pool, yielding labelled carves.
+        All units add their counters to the shared stats.
+        """
+        if not units:
+            return
+        workers = workers or min(len(units), os.cpu_count() or 1)
+        results = queue.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def work(unit):
+            files_found = found.setdefault(unit.label, defaultdict(int))
+            scan = self._scan(drive, sink_for(unit), files_found, ticks=True, ranges=[(unit.start, unit.end)],
+                              stats=stats)
+            try:
+                for item in scan:
+                    if stop.is_set():
+                        break
+                    if isinstance(item, (CarvedFile, AnalyzerHit)):
+                        item.partition = unit.label
+                        item.relative_offset = item.offset - unit.start
+                        results.put(item)
+            except BaseException as e:
+                results.put(e)
+            finally:
+                scan.close()
+                results.put(done)
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drivehound-unit")
+        try:
+            for unit in units:
+                pool.submit(work, unit)
+            remaining = len(units)
+            while remaining:
+                item = results.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
+            pool.shutdown(wait=True)
+
+    def _scan(self, drive, sink, files_found, ticks=False, ranges=None, ordered=False, stats=None):
+        """
+        Generator behind recover_files and iter_carves: opens the drive, applies
+        the catalog, change map and autotuning, and yields every CarvedFile.
+
+        With ticks=True a ScanTick (bytes scanned, source size) is also yielded
+        after every chunk, letting a driver such as AsyncHound step the scan
+        one chunk at a time. With ranges, only those byte ranges are searched
+        and the change map is not used; with ordered=True they are scanned in
+        the order given instead of by offset. Hits of the configured analyzers
+        are yielded as AnalyzerHit records.
+
+        Counters go to stats; without one, a fresh ScanStats becomes the
+        Hound's `stats`, read by last_skipped and the other last_* properties.
+        """
+        if stats is None:
+            stats = self.stats = ScanStats()
+        source = source_id(drive)
+        run_id = None
+        known = {}
+        if self.catalog:
+            known = self.catalog.known_carves(source)
+            run_id = self.catalog.start_run(source)
+
+        change_map = None
+        if self.change_map and ranges is None:
+            change_map = ChangeMap(self.change_map, self.change_block_size)
+        tuner = AutoTuner(self.chunk_size) if self.autotune else None
+        analysis = AnalyzerSet(self.analyzers) if self.analyzers else None
+        if self.events:
+            self.events.emit("scan_started", source=source)
+
+        with self._open_reader(drive) as reader:
+            reserved = set()
+            if change_map:
+                change_map.bind(source_fingerprint(drive), reader.size)
+            if change_map and change_map.has_baseline():
+                # Differential rescan: search only changed blocks, keep the rest
+                ranges, carried, hits = self._plan_rescan(reader, change_map, analysis)
+                for finding in carried:
+                    known[finding["offset"]] = (finding["file_type"], finding["length"])
+                    files_found[finding["file_type"]] += 1
+                    reserved.add(finding["filename"])
+                for hit in self._report_hits(hits):
+                    stats.hit(hit.analyzer)
+                    yield hit
+                # Analyzers have already seen every block during hashing
+                analysis = None
+
+            if ranges is not None or change_map is None:
+                allocated = self._allocated_ranges(reader)
+                if ranges is None:
+                    ranges = allocated
+                elif allocated is not None:
+                    # Schedules and explicit ranges never reach into unallocated clusters either
+                    ranges = _intersect_ranges(ranges, allocated)
+
+            if ranges is not None:
+                # Bytes already searched, including the inside of carves that ran past a range
+                covered = []
+                for start, end in (ranges if ordered else sorted(ranges)):
+                    for start, end in _uncovered(start, end, covered):
+                        reader.seek(start)
+                        stream = _CarveStream(self, files_found, sink, start_offset=start, limit=end,
+                                              known=known, run_id=run_id, reserved=reserved)
+                        for item in self._pump(reader, stream, tuner=tuner, ticks=ticks, analysis=analysis):
+                            if isinstance(item, CarvedFile):
+                                self._record(item, source, run_id, change_map)
+                            elif isinstance(item, AnalyzerHit):
+                                stats.hit(item.analyzer)
+                            yield item
+                        stats.add(stream.skipped, stream.suppressed)
+                        covered = _cover(covered, start, max(end, stream.buffer_offset))
+            else:
+                hasher = BlockHasher(change_map.block_size) if change_map else None
+                stream = _CarveStream(self, files_found, sink, known=known, run_id=run_id)
+                observer = hasher.update if hasher else None
+                for item in self._pump(reader, stream, observer=observer, tuner=tuner, ticks=ticks,
+                                       analysis=analysis):
+                    if isinstance(item, CarvedFile):
+                        self._record(item, source, run_id, change_map)
+                    elif isinstance(item, AnalyzerHit):
+                        stats.hit(item.analyzer)
+                    yield item
+                stats.add(stream.skipped, stream.suppressed)
+                if change_map:
+                    change_map.digests = hasher.finish()
+                    change_map.size = hasher.size
+            if analysis:
+                for hit in self._report_hits(analysis.finish()):
+                    stats.hit(hit.analyzer)
+                    yield hit
+
+            if self.fault_tolerant and len(reader.bad_map):
+                logging.warning(f"Skipped {reader.bad_map.bad_bytes} unreadable bytes in {len(reader.bad_map)} ranges")
+            bytes_scanned = reader.position
+
+        if self.catalog:
+            self.catalog.finish_run(run_id, bytes_scanned)
+        if self.events:
+            self.events.emit("scan_finished", source=source, bytes_scanned=bytes_scanned,
+                             skipped=stats.skipped, suppressed=stats.suppressed)
+        if tuner:
+            stats.tuned_settings = tuner.settings()
+        if change_map:
+            change_map.save()
+
+    def _pump(self, reader, stream, observer=None, tuner=None, ticks=False, analysis=None):
+        """
+        Feeds chunks from reader into stream until EOF or the stream's limit,
+        yielding every completed CarvedFile.
+
+        Args:
+            reader (DriveChunkReader): Source positioned at the stream's start offset.
+            stream (_CarveStream): Carving state machine.
+            observer (callable, optional): Called with every chunk read. Disables
+                seeking past skipped carves, since the observer must see every byte.
+            tuner (AutoTuner, optional): Fed read and search timings; its chosen
+                chunk size and queue depth are applied to the reader.
+            ticks (bool): Also yield a ScanTick after every chunk.
+            analysis (AnalyzerSet, optional): Fed every chunk with its offset; its hits
+                are yielded. Like an observer, it disables seeking past skipped carves.
+        """
+        seekable = observer is None and analysis is None and self._seekable(reader)
+        try:
+            yield from self._pump_chunks(reader, stream, seekable, observer, tuner, ticks, analysis)
+        except BaseException:
+            # Close the sink handle of a carve left open by an abandoned scan
+            stream.abort()
+            raise
+        yield from stream.finish()
+
+    def _pump_chunks(self, reader, stream, seekable, observer, tuner, ticks, analysis):
+        while not stream.done:
+            read_started = time.perf_counter()
+            chunk = reader.read_chunk()
+            if not chunk:
+                # EOF reached
+                break
+            search_started = time.perf_counter()
+            if observer:
+                observer(chunk)
+            completed = stream.feed(chunk)
+            hits = analysis.feed(chunk, reader.position - len(chunk)) if analysis else ()
+            if tuner and not tuner.settled:
+                tuner.observe(len(chunk), search_started - read_started, time.perf_counter() - search_started)
+                reader.chunk_size = tuner.chunk_size
+                reader.depth = tuner.queue_depth
+            if seekable and stream.skip_until > reader.position:
+                # Jump over a known carve instead of reading it
+                reader.seek(stream.skip_until)
+                stream.jump(reader.position)
+            yield from completed
+            yield from self._report_hits(hits)
+            if self.events:
+                self.events.progress(reader.position, reader.size)
+            if ticks:
+                yield ScanTick(reader.position, reader.size)
+
+    def _report_hits(self, hits):
+        """Passes analyzer hits on, emitting events if configured."""
+        for hit in hits:
+            if self.events:
+                self.events.emit("hit", analyzer=hit.analyzer, kind=hit.kind, offset=hit.offset,
+                                 length=hit.length, value=hit.value.decode("latin-1"))
+            yield hit
+
+    def _plan_rescan(self, reader, change_map, analysis=None):
+        """
+        Hashes the whole source and works out which byte ranges need searching.
+        Analyzers are fed during the same pass, since the change map does not
+        keep their hits from the previous scan.
+
+        Returns:
+            tuple: (ranges, carried, hits) where ranges are padded (start, end)
+                   byte ranges covering changed blocks, carried are the findings
+                   kept from the previous scan and hits are the analyzer hits
+                   over the whole source.
+        """
+        hasher = BlockHasher(change_map.block_size)
+        hits = []
+        while True:
+            chunk = reader.read_chunk()
+            if not chunk:
+                break
+            hasher.update(chunk)
+            if analysis:
+                hits += analysis.feed(chunk, reader.position - len(chunk))
+        if analysis:
+            hits += analysis.finish()
+        digests = hasher.finish()
+
+        changed = change_map.changed_blocks(digests)
+        carried = change_map.carry_forward(changed, hasher.size)
+        change_map.digests = digests
+        change_map.size = hasher.size
+        ranges = change_map.ranges(changed, pad=self.max_start_sig_len - 1)
+        if self.verbose:
+            logging.info(f"Change map: {len(changed)} of {len(digests)} blocks changed, "
+                         f"{len(carried)} findings carried forward")
+        return ranges, carried, hits
+
+    def _allocated_ranges(self, reader):
+        """
+        Guest ranges holding data when the source is a sparse VM disk, so that
+        unallocated clusters are never read; None for ordinary sources.
+        """
+        if not isinstance(reader.file_obj, VirtualDisk):
+            return None
+        ranges = reader.file_obj.allocated_ranges()
+        if self.verbose:
+            used = sum(end - start for start, end in ranges)
+            logging.info(f"Scanning {used} allocated bytes of a {reader.size} byte virtual disk")
+        return ranges
+
+    @staticmethod
+    def _seekable(reader):
+        seekable = getattr(reader.file_obj, "seekable", None)
+        return bool(seekable and seekable())
+
+    def _record(self, carve, source, run_id, change_map):
+        """Adds a completed carve to the catalog and change map, if configured."""
+        if self.catalog:
+            self.catalog.add_artifact(run_id, source, carve.offset, carve.length,
+                                      carve.file_type, carve.sha256, carve.path)
+        if change_map:
+            change_map.add_finding(carve.offset, carve.length, carve.file_type, carve.filename, carve.sha256)
+
+
+def _scan_unit(hound, drive, unit):
+    """Worker process body of Hound.recover_partitions(processes=True)."""
+    files_found = defaultdict(int)
+    stats = ScanStats()
+    for _ in hound._scan(drive, hound._unit_file_sink(unit), files_found, ranges=[(unit.start, unit.end)],
+                         stats=stats):
+        pass
+    return dict(files_found), stats.skipped, stats.suppressed, dict(stats.hits)
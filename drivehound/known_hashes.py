@@ -0,0 +1,116 @@
+# drivehound/known_hashes.py
+
+"""
+known_hashes.py
+
+Compact membership test for large known-file hash sets (e.g., OS and
+application files). SHA-256 digests are stored in a Bloom filter, so tens
+of millions of hashes take a few bytes each instead of a Python set.
+
+A Bloom filter never misses a hash that was added, but may report a small
+fraction of other hashes as known (error_rate). Hound's 'flag' action keeps
+such files on disk; 'suppress' trades that small risk for less output.
+"""
+
+import math
+import struct
+
+_MAGIC = b"DHBLOOM1"
+_HEADER = struct.Struct("<QQQ")  # bits, hash count, items
+_HEX_DIGITS = set("0123456789abcdefABCDEF")
+
+
+class KnownHashes:
+    """
+    Bloom filter of SHA-256 digests.
+    """
+    def __init__(self, capacity, error_rate=1e-6):
+        """
+        Args:
+            capacity (int): Number of hashes the filter is sized for.
+            error_rate (float): Target false-positive rate at capacity.
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+        capacity = max(capacity, 1)
+        bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_bits = max(bits, 64)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def from_file(cls, path, error_rate=1e-6):
+        """
+        Loads a hash list or a filter previously written by save().
+
+        Hash lists are text with one entry per line; the first 64-digit hex
+        field on each line is taken as the SHA-256 (so plain lists and CSV
+        exports both work), and lines without one are ignored.
+        """
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) == _MAGIC:
+                return cls._load(f)
+        capacity = sum(1 for _ in _iter_hashes(path))
+        known = cls(capacity, error_rate)
+        for digest in _iter_hashes(path):
+            known.add(digest)
+        return known
+
+    def save(self, path):
+        """Writes the filter in binary form for fast reloading with from_file()."""
+        with open(path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+
+    @classmethod
+    def _load(cls, f):
+        num_bits, num_hashes, count = _HEADER.unpack(f.read(_HEADER.size))
+        known = cls.__new__(cls)
+        known.num_bits = num_bits
+        known.num_hashes = num_hashes
+        known.count = count
+        known.bits = bytearray(f.read())
+        if len(known.bits) != (num_bits + 7) // 8:
+            raise ValueError("Truncated known-hash filter.")
+        return known
+
+    def add(self, digest):
+        """Adds a SHA-256 given as hex text or 32 raw bytes."""
+        bits = self.bits
+        for pos in self._positions(digest):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest):
+        bits = self.bits
+        for pos in self._positions(digest):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def memory_bytes(self):
+        return len(self.bits)
+
+    def _positions(self, digest):
+        if isinstance(digest, str):
+            digest = bytes.fromhex(digest)
+        # Digests are already uniform: split into two 64-bit values for double hashing
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+
+def _iter_hashes(path):
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            for field in line.replace(",", " ").replace('"', " ").split():
+                if len(field) == 64 and set(field) <= _HEX_DIGITS:
+                    yield field
+                    break
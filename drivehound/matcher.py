@@ -0,0 +1,199 @@
+# drivehound/matcher.py
+
+"""
+matcher.py
+
+Masked (wildcard) signatures and a compiled multi-signature matcher.
+
+A MaskedSignature such as 'RIFF????WAVE' is searched by its longest fixed
+run of bytes (the anchor) with bytes.find, and only anchor hits are checked
+against the full pattern and mask. Plain byte strings are matched directly.
+"""
+
+import re
+import threading
+
+_HEX_TOKEN = re.compile(r'\?\?|[0-9A-Fa-f]{2}')
+
+
+class MaskedSignature:
+    """
+    A start signature with wildcard bytes.
+
+    A mask byte of 0xFF means the pattern byte must match exactly, 0x00 means
+    any byte is accepted; partial masks compare only the selected bits.
+    """
+    def __init__(self, pattern, mask):
+        """
+        Args:
+            pattern (bytes): Expected byte values.
+            mask (bytes): Bit mask of the same length as pattern.
+        """
+        if len(pattern) != len(mask):
+            raise ValueError("Pattern and mask must have the same length.")
+        if not any(mask):
+            raise ValueError("A masked signature needs at least one fixed byte.")
+        self.pattern = bytes(p & m for p, m in zip(pattern, mask))
+        self.mask = bytes(mask)
+        self.anchor, self.anchor_offset = self._longest_fixed_run()
+        self._mask_int = int.from_bytes(self.mask, 'big')
+        self._pattern_int = int.from_bytes(self.pattern, 'big')
+
+    @classmethod
+    def from_hex(cls, text):
+        """
+        Builds a signature from hex text where '??' is a wildcard byte.
+
+        Example:
+            MaskedSignature.from_hex("52 49 46 46 ?? ?? ?? ?? 57 41 56 45")  # RIFF....WAVE
+        """
+        tokens = _HEX_TOKEN.findall(text.replace(" ", ""))
+        if "".join(tokens) != text.replace(" ", ""):
+            raise ValueError(f"Invalid masked signature: {text}")
+        pattern = bytes(0 if t == "??" else int(t, 16) for t in tokens)
+        mask = bytes(0 if t == "??" else 0xFF for t in tokens)
+        return cls(pattern, mask)
+
+    def __len__(self):
+        return len(self.pattern)
+
+    def __eq__(self, other):
+        return isinstance(other, MaskedSignature) and (self.pattern, self.mask) == (other.pattern, other.mask)
+
+    def __hash__(self):
+        return hash((self.pattern, self.mask))
+
+    def __repr__(self):
+        text = " ".join("??" if m == 0 else f"{p:02X}" for p, m in zip(self.pattern, self.mask))
+        return f"MaskedSignature.from_hex({text!r})"
+
+    def _longest_fixed_run(self):
+        best_start, best_len = 0, 0
+        run_start = None
+        for i, m in enumerate(self.mask + b"\x00"):
+            if m == 0xFF:
+                if run_start is None:
+                    run_start = i
+            elif run_start is not None:
+                if i - run_start > best_len:
+                    best_start, best_len = run_start, i - run_start
+                run_start = None
+        if best_len == 0:
+            # Only partial masks: anchor on nothing and verify every position
+            return b"", 0
+        return self.pattern[best_start:best_start + best_len], best_start
+
+    def matches(self, data, start):
+        """True if the full pattern matches data at start."""
+        window = data[start:start + len(self.pattern)]
+        if len(window) < len(self.pattern):
+            return False
+        return int.from_bytes(window, 'big') & self._mask_int == self._pattern_int
+
+
+def compile_signature(sig):
+    """
+    Normalizes a start signature: bytes stay bytes, MaskedSignature is kept,
+    and a hex string with '??' wildcards becomes a MaskedSignature.
+    """
+    if isinstance(sig, str):
+        return MaskedSignature.from_hex(sig)
+    return sig
+
+
+class SignatureMatcher:
+    """
+    Finds the earliest occurrence of any of a set of start signatures.
+
+    Signatures sharing an anchor are searched once. The next anchor hit is
+    cached per buffer, so repeated calls that walk forward through the same
+    buffer do not rescan it.
+    """
+    def __init__(self, signatures):
+        """
+        Args:
+            signatures (dict): { key: start_signature } where each value is
+                bytes or a MaskedSignature. Earlier keys win ties.
+        """
+        self.keys = list(signatures)
+        # anchor bytes -> list of (key, signature or None for plain bytes, anchor_offset)
+        self.anchors = {}
+        for key, sig in signatures.items():
+            if isinstance(sig, MaskedSignature):
+                entry = (key, sig, sig.anchor_offset)
+                anchor = sig.anchor
+            else:
+                entry = (key, None, 0)
+                anchor = bytes(sig)
+            self.anchors.setdefault(anchor, []).append(entry)
+        self._order = {key: i for i, key in enumerate(self.keys)}
+        # Per-thread anchor cache so concurrent scans can share one matcher
+        self._local = threading.local()
+
+    def find(self, buffer, pos=0):
+        """
+        Returns:
+            tuple: (index, key) of the earliest match starting at or after pos, or None.
+        """
+        local = self._local
+        if getattr(local, 'buffer', None) is not buffer:
+            local.buffer = buffer
+            local.cache = {}
+        best = None
+        for anchor, entries in self.anchors.items():
+            hit = self._find_anchor(buffer, pos, anchor, entries)
+            if hit and (best is None or hit[0] < best[0] or
+                        (hit[0] == best[0] and self._order[hit[1]] < self._order[best[1]])):
+                best = hit
+        return best
+
+    def _find_anchor(self, buffer, pos, anchor, entries):
+        cache = self._local.cache
+        cached = cache.get(anchor)
+        if cached is not None and cached[0] <= pos and (cached[1] is None or cached[1][0] >= pos):
+            return cached[1]
+        hit = self._search_anchor(buffer, pos, anchor, entries)
+        cache[anchor] = (pos, hit)
+        return hit
+
+    def _search_anchor(self, buffer, pos, anchor, entries):
+        max_offset = max(offset for _, _, offset in entries)
+        search = pos
+        while True:
+            if anchor:
+                idx = buffer.find(anchor, search)
+                if idx < 0:
+                    return None
+            else:
+                if search >= len(buffer):
+                    return None
+                idx = search
+            found = None
+            for key, sig, offset in entries:
+                start = idx - offset
+                if start < pos:
+                    continue
+                if sig is None or sig.matches(buffer, start):
+                    if found is None or start < found[0] or \
+                            (start == found[0] and self._order[key] < self._order[found[1]]):
+                        found = (start, key)
+            if found:
+                # An entry with a larger anchor offset may start earlier at a later anchor hit
+                if max_offset == 0 or self._nothing_earlier(buffer, found, idx, pos, anchor, entries):
+                    return found
+            search = idx + 1
+
+    def _nothing_earlier(self, buffer, found, idx, pos, anchor, entries):
+        """Checks later anchor hits that could still yield a start before found."""
+        limit = found[0] + max(offset for _, _, offset in entries)
+        search = idx + 1
+        while anchor:
+            nxt = buffer.find(anchor, search, limit + len(anchor))
+            if nxt < 0:
+                return True
+            for key, sig, offset in entries:
+                start = nxt - offset
+                if pos <= start < found[0] and (sig is None or sig.matches(buffer, start)):
+                    return False
+            search = nxt + 1
+        return True
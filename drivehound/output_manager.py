@@ -0,0 +1,198 @@
+# drivehound/output_manager.py
+
+"""
+output_manager.py
+
+Shared output for many concurrent extractions. Writes are coalesced per
+file into block-aligned writes, and only a bounded LRU pool of file
+handles is kept open; evicted files are reopened to continue where they
+left off.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+
+class _OutputFile:
+    __slots__ = ('path', 'pending', 'written', 'created', 'preallocated')
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = bytearray()
+        self.written = 0
+        self.created = False
+        self.preallocated = False
+
+
+class OutputManager:
+    """
+    Coalescing writer with an LRU pool of open file handles. Thread safe, so
+    one manager can serve every scan of a Hound.
+    """
+    def __init__(self, max_open=64, block_size=1024*1024, preallocate=False):
+        """
+        Args:
+            max_open (int): Maximum file handles kept open at once.
+            block_size (int): Writes are issued in multiples of this size
+                (except the final tail of each file).
+            preallocate (bool): Reserve disk space with fallocate when open()
+                is given an expected size.
+        """
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1.")
+        self.max_open = max_open
+        self.block_size = block_size
+        self.preallocate = preallocate
+        self.writes_issued = 0
+        self.bytes_written = 0
+        self._files = set()
+        self._handles = OrderedDict()  # _OutputFile -> file object, least recently used first
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close_all()
+
+    def open(self, path, expected_size=None):
+        """
+        Registers an output file. It is created (or truncated) on the first
+        write that reaches disk, so a carve discarded while still buffered
+        never touches the output directory.
+
+        Args:
+            path (str): Output path.
+            expected_size (int, optional): Final size, if known, for preallocation.
+
+        Returns:
+            A handle to pass to write() and close().
+        """
+        with self._lock:
+            entry = _OutputFile(path)
+            self._files.add(entry)
+            if expected_size:
+                self.reserve(entry, expected_size)
+        return entry
+
+    def reserve(self, entry, size):
+        """
+        Reserves disk space with fallocate for a file whose final size is
+        known, possibly only after some of it was written. Does nothing
+        unless the manager preallocates.
+
+        Args:
+            entry: Handle returned by open().
+            size (int): Expected final size in bytes.
+        """
+        if not (self.preallocate and size and hasattr(os, "posix_fallocate")):
+            return
+        with self._lock:
+            if entry.preallocated:
+                return
+            # Reopen so writes land in place rather than after the reserved space
+            handle = self._handles.pop(entry, None)
+            if handle:
+                handle.close()
+            entry.preallocated = True
+            handle = self._handle(entry)
+            try:
+                os.posix_fallocate(handle.fileno(), 0, size)
+            except OSError as e:
+                logging.debug(f"fallocate failed for {entry.path}: {e}")
+                entry.preallocated = False
+                handle.seek(0, os.SEEK_END)
+
+    def write(self, entry, data):
+        """Buffers data for key, issuing block-aligned writes as blocks fill."""
+        with self._lock:
+            entry.pending += data
+            if len(entry.pending) >= self.block_size:
+                size = len(entry.pending) - len(entry.pending) % self.block_size
+                self._flush(entry, size)
+
+    def close(self, entry):
+        """
+        Writes any buffered tail and releases the file.
+
+        Returns:
+            str: The file's path.
+        """
+        with self._lock:
+            self._files.discard(entry)
+            if entry.pending or not entry.created:
+                self._flush(entry, len(entry.pending))
+            handle = self._handles.pop(entry, None)
+            if entry.preallocated:
+                # Drop any space reserved beyond what was actually written
+                handle = handle or open(entry.path, "r+b")
+                handle.truncate(entry.written)
+            if handle:
+                handle.close()
+        return entry.path
+
+    def discard(self, entry):
+        """Drops buffered data and removes whatever of the file already reached disk."""
+        with self._lock:
+            self._files.discard(entry)
+            entry.pending.clear()
+            handle = self._handles.pop(entry, None)
+            if handle:
+                handle.close()
+            if entry.created:
+                try:
+                    os.remove(entry.path)
+                except OSError as e:
+                    logging.debug(f"Could not remove discarded output {entry.path}: {e}")
+
+    def flush_all(self):
+        with self._lock:
+            for entry in self._files:
+                if entry.pending:
+                    self._flush(entry, len(entry.pending))
+
+    def close_all(self):
+        with self._lock:
+            for entry in list(self._files):
+                self.close(entry)
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    @property
+    def open_handles(self):
+        return len(self._handles)
+
+    def _flush(self, entry, size):
+        handle = self._handle(entry)
+        if entry.preallocated:
+            handle.seek(entry.written)
+        if not size:
+            return
+        handle.write(entry.pending[:size])
+        del entry.pending[:size]
+        entry.written += size
+        self.writes_issued += 1
+        self.bytes_written += size
+
+    def _handle(self, entry):
+        handle = self._handles.get(entry)
+        if handle is not None:
+            self._handles.move_to_end(entry)
+            return handle
+        while len(self._handles) >= self.max_open:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        if not entry.created:
+            mode = "w+b"
+        elif entry.preallocated:
+            # Preallocated files already have their final size; write in place
+            mode = "r+b"
+        else:
+            mode = "ab"
+        handle = open(entry.path, mode, buffering=0)
+        entry.created = True
+        self._handles[entry] = handle
+        return handle
@@ -1,6 +1,7 @@
 # drivehound/recovery_tester.py
 
 from .hound import Hound
+from .events import EventLog
 from .win_drive_tools import list_partitions
 from .color_utils import colored_text
 from .ascii_utils import scale_ascii_art
@@ -8,6 +9,8 @@ from .logo import LOGO
 import sys
 import time
 import logging
+import logging.handlers
+import queue
 
 def display_ascii_art(scale: int, color: str):
     scaled_logo = scale_ascii_art(LOGO, scale)
@@ -43,6 +46,12 @@ class ColorFormatter(logging.Formatter):
 def setup_logging(log_file="recovery_tester.log"):
     """
     Configures logging to allow colored output in the console.
+
+    Records are handed to a queue and formatted by a background listener,
+    so slow console or file output never stalls the caller.
+
+    Returns:
+        QueueListener: The started listener; stop() it to flush on exit.
     """
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
@@ -55,8 +64,11 @@ def setup_logging(log_file="recovery_tester.log"):
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(ColorFormatter('%(asctime)s [%(levelname)s] %(message)s'))
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    return listener
 
 
 def main():
@@ -64,9 +76,10 @@ def main():
     scale = 2
     color = "#00FF00"  # Green
     log_file = "recovery_tester.log"
+    events_file = "recovery_events.jsonl"
     
     # Setup Logging
-    setup_logging()
+    listener = setup_logging(log_file)
     
     # Display ASCII Art
     print("\n")
@@ -115,12 +128,18 @@ def main():
             print("Please enter 'y' or 'n'.")
     
     # Initialize Hound and Start Recovery
-    hound = Hound(verbose=True)
+    # Per-file hits go to the event file; the console shows a periodic summary
+    events = EventLog(events_file, console=sys.stdout, summary_interval=2.0)
+    hound = Hound(verbose=True, events=events)
     
     # Display Progress
     print("Starting recovery...")
     start_time = time.time()
-    recovered_files = hound.recover_files(drive=drive)
+    try:
+        recovered_files = hound.recover_files(drive=drive)
+    finally:
+        events.close()
+        listener.stop()
     end_time = time.time()
     
     # Display Recovery Results
@@ -135,4 +154,5 @@ def main():
     print("===================\n")
     print(colored_text(f"Recovered files are saved in the '{hound.output_dir}' directory.", "cyan"))
     print(colored_text(f"Detailed logs can be found in '{log_file}'.", "cyan"))
+    print(colored_text(f"Per-file events are recorded in '{events_file}'.", "cyan"))
     print(colored_text(f"Time taken: {end_time - start_time:.2f} seconds.", "cyan"))
@@ -0,0 +1,103 @@
+# drivehound/scheduler.py
+
+"""
+scheduler.py
+
+Priority ordering of scan regions. The source is cut into fixed-size
+regions and each region gets a weight from user ranges, a prior survey and
+layout heuristics. Scanning regions heaviest first surfaces the likely
+results early, while the plan still covers every byte exactly once.
+"""
+
+import bisect
+
+# Default weights: user ranges always come first, then survey density, then heuristics
+USER_WEIGHT = 100.0
+SURVEY_WEIGHT = 10.0
+HEURISTIC_WEIGHT = 1.0
+
+
+class RegionScheduler:
+    """
+    Builds a full-coverage scan plan ordered by region priority.
+    """
+    def __init__(self, size, region_size=64*1024*1024):
+        """
+        Args:
+            size (int): Source size in bytes.
+            region_size (int): Granularity of the plan.
+        """
+        if region_size <= 0:
+            raise ValueError("region_size must be positive.")
+        self.size = size
+        self.region_size = region_size
+        self._bounds = sorted(set(range(0, size, region_size)) | {size})
+        self._boosts = []  # (start, end, weight)
+
+    def boost(self, start, end, weight=USER_WEIGHT):
+        """Raises the priority of the bytes in [start, end)."""
+        start, end = max(0, start), min(self.size, end)
+        if start >= end:
+            return
+        for edge in (start, end):
+            i = bisect.bisect_left(self._bounds, edge)
+            if i == len(self._bounds) or self._bounds[i] != edge:
+                self._bounds.insert(i, edge)
+        self._boosts.append((start, end, weight))
+
+    def boost_survey(self, report, weight=SURVEY_WEIGHT):
+        """Boosts the regions holding surveyed samples in proportion to their hit density."""
+        densities = [(offset, length, sum(hits.values()) / length)
+                     for offset, length, hits in report.samples if hits]
+        if not densities:
+            return
+        peak = max(d for _, _, d in densities)
+        for offset, length, density in densities:
+            region = offset - offset % self.region_size
+            self.boost(region, region + self.region_size, weight * density / peak)
+
+    def boost_heuristics(self, partitions=(), data_span=256*1024*1024, weight=HEURISTIC_WEIGHT):
+        """
+        Applies layout heuristics: regions nearer the middle of the source rank
+        higher, and so does the first data_span bytes of every partition, where
+        filesystems tend to place their data areas.
+
+        Args:
+            partitions (list): Partition tuples from partition_layout; gaps are ignored.
+            data_span (int): Bytes after each partition start to boost.
+        """
+        half = self.size / 2 or 1
+        for start in range(0, self.size, self.region_size):
+            end = min(start + self.region_size, self.size)
+            centre = (start + end) / 2
+            self.boost(start, end, weight * 0.5 * (1 - abs(centre - half) / half))
+        for part in partitions:
+            if part.scheme != "gap":
+                self.boost(part.start, min(part.end, part.start + data_span), weight)
+
+    def plan(self):
+        """
+        Returns:
+            list: Disjoint (start, end) ranges covering [0, size), highest priority
+                  first; ties keep ascending offset order. Ranges that end up
+                  adjacent in the plan are merged.
+        """
+        bounds = self._bounds
+        # Sweep: every boost starts and ends on a bound, so add it as a difference
+        delta = [0.0] * len(bounds)
+        for start, end, weight in self._boosts:
+            delta[bisect.bisect_left(bounds, start)] += weight
+            delta[bisect.bisect_left(bounds, end)] -= weight
+        pieces = []
+        weight = 0.0
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            weight += delta[i]
+            pieces.append((-round(weight, 9), start, end))
+        pieces.sort()
+        plan = []
+        for _, start, end in pieces:
+            if plan and plan[-1][1] == start:
+                plan[-1] = (plan[-1][0], end)
+            else:
+                plan.append((start, end))
+        return plan
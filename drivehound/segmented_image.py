@@ -0,0 +1,137 @@
+# drivehound/segmented_image.py
+
+"""
+segmented_image.py
+
+Presents split raw acquisitions (disk.001, disk.002, ...) as one seekable
+byte stream. Segments are opened lazily, one at a time, so nothing is
+concatenated or staged to disk before a scan.
+"""
+
+import io
+import os
+import re
+import bisect
+import logging
+
+# Matches the numeric extension used by split raw images, e.g. 'disk.001'
+SEGMENT_PATTERN = re.compile(r'^(?P<base>.+)\.(?P<index>\d{3,})$')
+
+
+def find_segments(path):
+    """
+    Finds every segment of a split image given the path of its first segment.
+
+    Args:
+        path (str): Path to the first segment (e.g., 'disk.001' or 'disk.000').
+
+    Returns:
+        list: Ordered segment paths. A path that is not the first segment of a
+              split image is returned on its own.
+    """
+    match = SEGMENT_PATTERN.match(path)
+    if not match:
+        return [path]
+
+    base, index = match.group('base'), match.group('index')
+    width = len(index)
+    number = int(index)
+    if number > 1:
+        # Only the first segment of a series expands to the whole set
+        return [path]
+
+    segments = []
+    while True:
+        candidate = f"{base}.{number:0{width}d}"
+        if not os.path.isfile(candidate):
+            break
+        segments.append(candidate)
+        number += 1
+    return segments or [path]
+
+
+class SegmentedImage(io.RawIOBase):
+    """
+    A read-only, seekable file-like object over an ordered list of segment files.
+
+    Only one segment is held open at a time; it is swapped as reads and seeks
+    cross segment boundaries.
+    """
+    def __init__(self, paths):
+        """
+        Args:
+            paths (list): Ordered list of segment paths.
+        """
+        super().__init__()
+        if not paths:
+            raise ValueError("SegmentedImage requires at least one segment.")
+        self.paths = list(paths)
+        self.sizes = [os.path.getsize(p) for p in self.paths]
+        # Absolute start offset of every segment
+        self.starts = []
+        total = 0
+        for size in self.sizes:
+            self.starts.append(total)
+            total += size
+        self.size = total
+        self._pos = 0
+        self._index = None
+        self._handle = None
+        logging.debug(f"Opened segmented image with {len(self.paths)} segments, {self.size} bytes")
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position.")
+        self._pos = pos
+        return self._pos
+
+    def _segment(self, index):
+        """Returns an open handle for segment `index`, closing the previous one."""
+        if self._index != index:
+            if self._handle:
+                self._handle.close()
+            self._handle = open(self.paths[index], "rb")
+            self._index = index
+        return self._handle
+
+    def readinto(self, b):
+        view = memoryview(b).cast('B')
+        filled = 0
+        while filled < len(view) and self._pos < self.size:
+            # Last segment starting at or before pos; empty segments are never picked
+            index = bisect.bisect_right(self.starts, self._pos) - 1
+            handle = self._segment(index)
+            handle.seek(self._pos - self.starts[index])
+            remaining = self.starts[index] + self.sizes[index] - self._pos
+            want = min(len(view) - filled, remaining)
+            n = handle.readinto(view[filled:filled + want])
+            if not n:
+                # Segment shrank underneath us; treat as end of data
+                break
+            filled += n
+            self._pos += n
+        return filled
+
+    def close(self):
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+            self._index = None
+        super().close()
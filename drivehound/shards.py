@@ -0,0 +1,435 @@
+# drivehound/shards.py
+
+"""
+shards.py
+
+Sharded scanning of one shared image across many workers.
+
+A ShardCoordinator splits the image into byte-range shards and serves them
+over a multiprocessing manager (plain TCP with an auth key). Workers on any
+node call run_worker() with the coordinator's address and key; each leases
+a shard, scans it with Hound and returns a carve manifest. The coordinator
+retries failed or expired shards, merges the manifests and can extract the
+files.
+
+Manager connections exchange pickles, so anyone holding the auth key can
+run code on the coordinator. The key is random unless one is given, and
+listening beyond loopback has to be asked for explicitly.
+"""
+
+import os
+import time
+import heapq
+import socket
+import secrets
+import itertools
+import ipaddress
+import logging
+import threading
+import multiprocessing
+from multiprocessing.managers import BaseManager
+from .hound import Hound
+from .sinks import CarvedFile, NullSink
+from .output_manager import OutputManager
+from .win_drive_tools import open_drive, stream_size
+
+# Seconds before a leased shard is handed to another worker
+DEFAULT_LEASE_TIMEOUT = 600.0
+
+# Shard states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class _ShardService:
+    """
+    Shard bookkeeping shared by the coordinator and its manager server.
+    All methods are called from manager server threads.
+    """
+    def __init__(self, config, shards, max_attempts, lease_timeout):
+        self.config = config
+        self.max_attempts = max_attempts
+        self.lease_timeout = lease_timeout
+        self.shards = {i: {'start': start, 'end': end, 'state': PENDING, 'attempts': 0,
+                           'leased_at': None, 'manifest': None, 'errors': []}
+                       for i, (start, end) in enumerate(shards)}
+        self._lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.shards:
+            self.finished.set()
+
+    def get_config(self):
+        return self.config
+
+    def lease(self, worker=None):
+        """
+        Hands out the next pending shard.
+
+        Returns:
+            tuple: (shard_id, start, end); 'wait' if all remaining shards are
+                   leased to other workers; None once every shard is settled.
+        """
+        with self._lock:
+            self._expire_leases()
+            for shard_id, shard in self.shards.items():
+                if shard['state'] == PENDING:
+                    shard['state'] = LEASED
+                    shard['attempts'] += 1
+                    shard['leased_at'] = time.monotonic()
+                    logging.debug(f"Shard {shard_id} leased to {worker} (attempt {shard['attempts']})")
+                    return (shard_id, shard['start'], shard['end'])
+            if any(s['state'] == LEASED for s in self.shards.values()):
+                return 'wait'
+            return None
+
+    def complete(self, shard_id, manifest):
+        with self._lock:
+            shard = self.shards[shard_id]
+            if shard['state'] != DONE:
+                shard['state'] = DONE
+                shard['manifest'] = manifest
+            self._check_finished()
+
+    def fail(self, shard_id, error):
+        with self._lock:
+            shard = self.shards[shard_id]
+            if shard['state'] == DONE:
+                return
+            shard['errors'].append(error)
+            logging.warning(f"Shard {shard_id} failed (attempt {shard['attempts']}): {error}")
+            shard['state'] = FAILED if shard['attempts'] >= self.max_attempts else PENDING
+            self._check_finished()
+
+    def status(self):
+        with self._lock:
+            counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+            for shard in self.shards.values():
+                counts[shard['state']] += 1
+            return counts
+
+    def _expire_leases(self):
+        if self.lease_timeout is None:
+            return
+        now = time.monotonic()
+        for shard_id, shard in self.shards.items():
+            if shard['state'] == LEASED and now - shard['leased_at'] > self.lease_timeout:
+                shard['errors'].append("lease expired")
+                logging.warning(f"Shard {shard_id} lease expired")
+                shard['state'] = FAILED if shard['attempts'] >= self.max_attempts else PENDING
+
+    def _check_finished(self):
+        if all(s['state'] in (DONE, FAILED) for s in self.shards.values()):
+            self.finished.set()
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _authkey(key):
+    return bytes.fromhex(key) if isinstance(key, str) else bytes(key)
+
+
+class _WorkerManager(BaseManager):
+    pass
+
+
+_WorkerManager.register('shard_service')
+
+
+class ShardCoordinator:
+    """
+    Splits an image into shards and serves them to workers.
+    """
+    def __init__(self, drive, shard_size=64*1024*1024, address=("127.0.0.1", 0), authkey=None,
+                 max_attempts=3, lease_timeout=DEFAULT_LEASE_TIMEOUT, size=None, hound_kwargs=None,
+                 allow_remote=False):
+        """
+        Args:
+            drive (str/list): Image as the workers should open it.
+            shard_size (int): Bytes per shard.
+            address (tuple): (host, port) to listen on; port 0 picks a free port.
+            authkey (bytes/str, optional): Shared secret workers must present, as bytes
+                or hex. Defaults to a random key, available as `authkey` and `authkey_hex`.
+            max_attempts (int): Attempts per shard before it is marked failed.
+            lease_timeout (float, optional): Seconds after which an unfinished lease
+                is handed to another worker (covers workers that died). None waits
+                for a lease forever.
+            size (int, optional): Image size; measured locally if omitted.
+            hound_kwargs (dict, optional): Hound settings sent to every worker.
+            allow_remote (bool): Required to listen on a non-loopback address. Only do
+                so on a trusted network: the key is all that guards the server.
+        """
+        if not _is_loopback(address[0]):
+            if not allow_remote:
+                raise ValueError(f"Refusing to serve shards on non-loopback address {address[0]!r} "
+                                 "without allow_remote=True.")
+            logging.warning(f"Shard coordinator will accept connections on {address[0]}; anyone with "
+                            "the auth key can run code on this host.")
+        self.drive = drive
+        self.shard_size = shard_size
+        self.address = address
+        self.authkey = _authkey(authkey) if authkey is not None else secrets.token_bytes(32)
+        if size is None:
+            with open_drive(drive, "rb") as f:
+                size = stream_size(f)
+        self.size = size
+        shards = [(start, min(start + shard_size, size)) for start in range(0, size, shard_size)]
+        config = {'drive': drive, 'hound_kwargs': dict(hound_kwargs or {})}
+        self.service = _ShardService(config, shards, max_attempts, lease_timeout)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """Starts serving shards on a background thread."""
+        service = self.service
+        manager_cls = type('_CoordinatorManager', (BaseManager,), {})
+        manager_cls.register('shard_service', callable=lambda: service)
+        manager = manager_cls(address=self.address, authkey=self.authkey)
+        self._server = manager.get_server()
+        # Also ends the loops of connected clients after their current request
+        self._server.stop_event = threading.Event()
+        self.address = self._server.address
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        logging.info(f"Shard coordinator serving {len(service.shards)} shards on {self.address}")
+
+    def _serve(self):
+        # Own accept loop rather than Server.serve_forever, whose accepter
+        # thread never exits and keeps the listening socket open
+        server = self._server
+        while not server.stop_event.is_set():
+            try:
+                conn = server.listener.accept()
+            except Exception:
+                # Failed handshake, including the wake-up connection from stop()
+                continue
+            if server.stop_event.is_set():
+                conn.close()
+                break
+            threading.Thread(target=server.handle_request, args=(conn,), daemon=True).start()
+        server.listener.close()
+
+    def stop(self):
+        """Stops serving and closes the listening socket, so later connections are refused."""
+        if self._server is not None:
+            self._server.stop_event.set()
+            host, port = self.address[:2]
+            host = {"": "127.0.0.1", "0.0.0.0": "127.0.0.1", "::": "::1"}.get(host, host)
+            try:
+                # Wake the accept loop so it sees the stop
+                socket.create_connection((host, port), timeout=1).close()
+            except OSError:
+                pass
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def wait(self, timeout=None):
+        """
+        Blocks until every shard is done or has failed permanently.
+
+        Returns:
+            bool: True if all shards settled before the timeout.
+        """
+        return self.service.finished.wait(timeout)
+
+    @property
+    def authkey_hex(self):
+        """The auth key as hex text, for passing to workers on other nodes."""
+        return self.authkey.hex()
+
+    @property
+    def failed_shards(self):
+        return [(sid, s['start'], s['end'], s['errors'])
+                for sid, s in self.service.shards.items() if s['state'] == FAILED]
+
+    def results(self, drive=None):
+        """
+        Merges the manifests of all completed shards into what a single
+        sequential scan reports.
+
+        Hits are deduplicated by offset, and hits lying inside an earlier
+        carve are dropped. The worker that reported a dropped carve did not
+        search inside it, while a sequential scan searches on from the end of
+        the earlier carve, so the part of a dropped carve past that end is
+        searched again locally.
+
+        Args:
+            drive (str/list, optional): Local path of the image, if it differs from the workers'.
+
+        Returns:
+            list: Manifest entries (dicts with offset, length, file_type, sha256) sorted by offset.
+        """
+        entries = []
+        for shard in self.service.shards.values():
+            if shard['manifest']:
+                entries.extend(shard['manifest'])
+        order = itertools.count()
+        heap = [(entry['offset'], next(order), entry) for entry in entries]
+        heapq.heapify(heap)
+        merged = []
+        covered = 0
+        searched = set()
+        hound = None
+        while heap:
+            offset, _, entry = heapq.heappop(heap)
+            if merged and offset == merged[-1]['offset']:
+                continue
+            end = offset + entry['length']
+            if offset < covered:
+                if end > covered and (covered, end) not in searched:
+                    searched.add((covered, end))
+                    if hound is None:
+                        hound = Hound(**{**self.service.config['hound_kwargs'], 'verbose': False})
+                    for found in scan_shard(hound, drive or self.drive, covered, end):
+                        heapq.heappush(heap, (found['offset'], next(order), found))
+                continue
+            merged.append(entry)
+            covered = end
+        return merged
+
+    def extract(self, output_dir, drive=None):
+        """
+        Writes every merged manifest entry to output_dir.
+
+        Args:
+            output_dir (str): Destination directory.
+            drive (str/list, optional): Local path of the image, if it differs from the workers'.
+
+        Returns:
+            dict: Counts per file type.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        counts = {}
+        # Lengths are known from the manifest, so output space can be reserved up front
+        with open_drive(drive or self.drive, "rb") as src, OutputManager(preallocate=True) as output:
+            for entry in self.results(drive):
+                index = counts.get(entry['file_type'], 0)
+                counts[entry['file_type']] = index + 1
+                src.seek(entry['offset'])
+                remaining = entry['length']
+                path = os.path.join(output_dir, f"{entry['file_type']}_{index}{entry['extension']}")
+                out = output.open(path, expected_size=entry['length'])
+                while remaining > 0:
+                    data = src.read(min(remaining, output.block_size))
+                    if not data:
+                        break
+                    output.write(out, data)
+                    remaining -= len(data)
+                output.close(out)
+        return counts
+
+
+def scan_shard(hound, drive, start, end):
+    """
+    Scans one shard and returns its carve manifest.
+
+    Returns:
+        list: Dicts with offset, length, file_type, extension and sha256 per carve.
+    """
+    manifest = []
+    for carve in hound.iter_carves(drive, sink=NullSink(), ranges=[(start, end)]):
+        if not isinstance(carve, CarvedFile):
+            continue
+        manifest.append({
+            'offset': carve.offset,
+            'length': carve.length,
+            'file_type': carve.file_type,
+            'extension': hound.signatures[carve.file_type][2],
+            'sha256': carve.sha256,
+        })
+    return manifest
+
+
+def run_worker(address, authkey, drive=None, max_shards=None, poll_interval=0.2, **hound_kwargs):
+    """
+    Connects to a coordinator and scans shards until none are left.
+
+    Args:
+        address (tuple): Coordinator (host, port).
+        authkey (bytes/str): The coordinator's auth key, as bytes or hex.
+        drive (str/list, optional): Local path of the image, if it differs from the coordinator's.
+        max_shards (int, optional): Stop after this many shards.
+        poll_interval (float): Seconds to wait while other workers hold the last shards.
+        **hound_kwargs: Override the Hound settings sent by the coordinator.
+
+    Returns:
+        int: Number of shards this worker completed.
+    """
+    manager = _WorkerManager(address=address, authkey=_authkey(authkey))
+    manager.connect()
+    service = manager.shard_service()
+    config = service.get_config()
+    kwargs = dict(config['hound_kwargs'])
+    kwargs.update(hound_kwargs)
+    kwargs.setdefault('verbose', False)
+    hound = Hound(**kwargs)
+    drive = drive or config['drive']
+    worker = f"{os.uname().nodename if hasattr(os, 'uname') else 'node'}:{os.getpid()}"
+
+    completed = 0
+    attempted = 0
+    while max_shards is None or attempted < max_shards:
+        lease = service.lease(worker)
+        if lease is None:
+            break
+        if lease == 'wait':
+            time.sleep(poll_interval)
+            continue
+        shard_id, start, end = lease
+        attempted += 1
+        try:
+            manifest = scan_shard(hound, drive, start, end)
+        except Exception as e:
+            service.fail(shard_id, f"{worker}: {e!r}")
+            continue
+        service.complete(shard_id, manifest)
+        completed += 1
+    return completed
+
+
+def run_local(drive, workers=None, shard_size=64*1024*1024, timeout=None,
+              lease_timeout=DEFAULT_LEASE_TIMEOUT, **hound_kwargs):
+    """
+    Runs a coordinator and worker processes on this machine.
+
+    Args:
+        drive (str/list): Image to scan.
+        workers (int, optional): Worker processes; defaults to the CPU count.
+        shard_size (int): Bytes per shard.
+        timeout (float, optional): Seconds to wait for all shards.
+        lease_timeout (float): Seconds before the shard of a worker that died is requeued.
+        **hound_kwargs: Hound settings for the workers.
+
+    Returns:
+        ShardCoordinator: The stopped coordinator, for results() and extract().
+    """
+    workers = workers or multiprocessing.cpu_count()
+    with ShardCoordinator(drive, shard_size=shard_size, lease_timeout=lease_timeout,
+                          hound_kwargs=hound_kwargs) as coordinator:
+        procs = [multiprocessing.Process(target=run_worker, args=(coordinator.address, coordinator.authkey))
+                 for _ in range(workers)]
+        for proc in procs:
+            proc.start()
+        coordinator.wait(timeout)
+        for proc in procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                logging.warning(f"Shard worker {proc.pid} did not exit; terminating it")
+                proc.terminate()
+                proc.join()
+    return coordinator
@@ -0,0 +1,155 @@
+# drivehound/sinks.py
+
+"""
+sinks.py
+
+Destinations for carved data. Hound streams every carve into a sink as it
+is found: FileSink writes to an output directory, MemorySink keeps bytes in
+memory, and custom sinks can hash, classify or forward data in the same pass.
+"""
+
+import io
+import os
+from .output_manager import OutputManager
+
+
+class CarvedFile:
+    """
+    A completed carve as yielded by Hound.iter_carves.
+
+    Attributes:
+        file_type (str): Signature key that matched.
+        offset (int): Absolute offset of the start signature in the source.
+        length (int): Number of bytes carved.
+        sha256 (str): Hex SHA-256 of the carved bytes.
+        filename (str): Suggested output name (e.g., 'png_0.png').
+        complete (bool): True if the end signature was found, False if the carve ran to end of data.
+        payload: Whatever the sink returned on close (a path for FileSink, bytes for MemorySink).
+        known (bool): True if the hash is in the Hound's known-hash set.
+        partition (str): Partition or gap label ('p1', 'gap0') for per-partition scans, else None.
+        relative_offset (int): Offset from the start of that partition, else None.
+    """
+    __slots__ = ('file_type', 'offset', 'length', 'sha256', 'filename', 'complete', 'payload', 'known',
+                 'partition', 'relative_offset')
+
+    def __init__(self, file_type, offset, length, sha256, filename, complete, payload=None, known=False):
+        self.file_type = file_type
+        self.offset = offset
+        self.length = length
+        self.sha256 = sha256
+        self.filename = filename
+        self.complete = complete
+        self.payload = payload
+        self.known = known
+        self.partition = None
+        self.relative_offset = None
+
+    @property
+    def path(self):
+        """Output path if the sink wrote the carve to disk, else None."""
+        return self.payload if isinstance(self.payload, str) else None
+
+    def __repr__(self):
+        return f"CarvedFile({self.file_type!r}, offset={hex(self.offset)}, length={self.length})"
+
+
+class CarveSink:
+    """
+    Base class for carve destinations.
+
+    open() is called when a start signature is found, write() with every
+    piece of the carve as the scan streams past it, and close() once the
+    carve ends. Whatever close() returns becomes CarvedFile.payload.
+    discard() replaces close() for carves that are suppressed. reserve() is
+    called once the final length of a carve is known from its header.
+    """
+    def open(self, file_type, offset, filename):
+        """Returns a handle passed back to write() and close()."""
+        raise NotImplementedError
+
+    def write(self, handle, data):
+        raise NotImplementedError
+
+    def close(self, handle):
+        return None
+
+    def discard(self, handle):
+        self.close(handle)
+
+    def reserve(self, handle, size):
+        """Hint that the carve will be size bytes long; ignored by default."""
+
+
+class FileSink(CarveSink):
+    """
+    Writes each carve to its own file in output_dir.
+
+    Output goes through an OutputManager, so many carves open at once share
+    a bounded pool of file handles and reach disk in large aligned writes.
+    """
+    def __init__(self, output_dir, manager=None):
+        """
+        Args:
+            output_dir (str): Destination directory.
+            manager (OutputManager, optional): Shared output manager; a private
+                one is created if omitted.
+        """
+        self.output_dir = output_dir
+        self.manager = manager if manager is not None else OutputManager()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def open(self, file_type, offset, filename):
+        return self.manager.open(os.path.join(self.output_dir, filename))
+
+    def write(self, handle, data):
+        self.manager.write(handle, data)
+
+    def close(self, handle):
+        return self.manager.close(handle)
+
+    def discard(self, handle):
+        self.manager.discard(handle)
+
+    def reserve(self, handle, size):
+        self.manager.reserve(handle, size)
+
+
+class MemorySink(CarveSink):
+    """
+    Keeps each carve in memory and returns its bytes.
+
+    Carves without an end signature run to the end of the source, so bound
+    memory with max_size when such signatures are in use.
+    """
+    def __init__(self, max_size=None):
+        """
+        Args:
+            max_size (int, optional): Bytes kept per carve; the rest is dropped
+                (length and hash still cover the whole carve).
+        """
+        self.max_size = max_size
+
+    def open(self, file_type, offset, filename):
+        return io.BytesIO()
+
+    def write(self, handle, data):
+        if self.max_size is not None:
+            room = self.max_size - handle.tell()
+            if room <= 0:
+                return
+            data = data[:room]
+        handle.write(data)
+
+    def close(self, handle):
+        return handle.getvalue()
+
+
+class NullSink(CarveSink):
+    """
+    Discards carved data; only type, offset, length and hash are reported.
+    """
+    def open(self, file_type, offset, filename):
+        return None
+
+    def write(self, handle, data):
+        pass
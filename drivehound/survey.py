@@ -0,0 +1,144 @@
+# drivehound/survey.py
+
+"""
+survey.py
+
+Quick triage of a drive before a full scan. A small sample of chunks spread
+across the device is read and searched, and the per-type signature density,
+expected hit counts and full-scan time are extrapolated from it.
+"""
+
+import math
+import time
+import random
+from collections import Counter
+
+
+class SurveyReport:
+    """
+    Result of Hound.survey.
+
+    Attributes:
+        size (int): Source size in bytes.
+        sampled_bytes (int): Bytes actually read.
+        samples (list): (offset, length, Counter of hits per type) for every sampled chunk.
+        counts (Counter): Signature hits per type across all samples.
+        expected (dict): Extrapolated hits per type for the whole source.
+        stderr (dict): Standard error of each expected count, from the spread between samples.
+        throughput (float): Measured read-and-search rate in bytes per second.
+        eta_seconds (float): Estimated time for a full scan at that rate.
+        elapsed (float): Seconds the survey took.
+    """
+    def __init__(self, size, samples, read_seconds, search_seconds, elapsed):
+        self.size = size
+        self.samples = samples
+        self.sampled_bytes = sum(length for _, length, _ in samples)
+        self.counts = Counter()
+        for _, _, hits in samples:
+            self.counts.update(hits)
+        self.elapsed = elapsed
+        busy = read_seconds + search_seconds
+        self.throughput = self.sampled_bytes / busy if busy > 0 else None
+        self.eta_seconds = size / self.throughput if self.throughput else None
+
+        scale = size / self.sampled_bytes if self.sampled_bytes else 0
+        self.expected = {t: n * scale for t, n in self.counts.items()}
+        self.stderr = {t: self._stderr(t) * scale for t in self.counts}
+
+    @property
+    def fraction(self):
+        return self.sampled_bytes / self.size if self.size else 0
+
+    def density(self, file_type):
+        """Expected hits of file_type per GiB."""
+        return self.expected.get(file_type, 0) / (self.size / 2**30) if self.size else 0
+
+    def hottest(self, n=None):
+        """
+        Returns:
+            list: (offset, length, total hits) of sampled chunks, densest first.
+        """
+        ranked = sorted(((off, length, sum(hits.values())) for off, length, hits in self.samples if hits),
+                        key=lambda s: -s[2])
+        return ranked[:n] if n is not None else ranked
+
+    def summary(self):
+        lines = [f"Surveyed {self.sampled_bytes} of {self.size} bytes ({100 * self.fraction:.2f}%) "
+                 f"in {self.elapsed:.2f}s"]
+        for file_type, expected in sorted(self.expected.items(), key=lambda e: -e[1]):
+            lines.append(f"  {file_type}: ~{expected:.0f} hits (+/- {self.stderr[file_type]:.0f}), "
+                         f"{self.density(file_type):.1f}/GiB")
+        if self.eta_seconds is not None:
+            lines.append(f"  Estimated full scan: {self.eta_seconds:.0f}s at {self.throughput / 2**20:.1f} MiB/s")
+        return "\n".join(lines)
+
+    def _stderr(self, file_type):
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        # Per-byte hit rate of each sample, weighted so short tail samples count less
+        total = self.sampled_bytes
+        mean = self.counts[file_type] / total
+        var = sum(length * (hits[file_type] / length - mean) ** 2
+                  for _, length, hits in self.samples) / total
+        return math.sqrt(var / (n - 1)) * total
+
+    def __repr__(self):
+        return f"SurveyReport(size={self.size}, sampled={self.sampled_bytes}, expected={self.expected})"
+
+
+def sample_offsets(size, chunk_size, fraction=0.01, randomize=False, seed=None, max_samples=None):
+    """
+    Picks chunk-aligned sample offsets across a source.
+
+    Args:
+        size (int): Source size.
+        chunk_size (int): Bytes per sample.
+        fraction (float): Share of the source to read.
+        randomize (bool): Random chunks instead of an even stride.
+        seed (int, optional): Seed for repeatable random samples.
+        max_samples (int, optional): Upper bound on the number of samples.
+
+    Returns:
+        list: Sorted sample offsets.
+    """
+    chunks = max(1, math.ceil(size / chunk_size))
+    count = min(chunks, max(1, math.ceil(chunks * fraction)))
+    if max_samples is not None:
+        count = min(count, max_samples)
+    if randomize:
+        indexes = sorted(random.Random(seed).sample(range(chunks), count))
+    else:
+        # Centre each sample within its stride so both ends of the device are covered
+        indexes = sorted({int((i + 0.5) * chunks / count) for i in range(count)})
+    return [i * chunk_size for i in indexes]
+
+
+def survey(hound, reader, size, fraction=0.01, randomize=False, seed=None, max_samples=None):
+    """
+    Samples a source with a Hound's signatures.
+
+    Counts are raw start-signature hits; a full scan reports fewer carves when
+    hits fall inside other carves.
+    """
+    started = time.perf_counter()
+    read_seconds = search_seconds = 0.0
+    samples = []
+    for offset in sample_offsets(size, reader.chunk_size, fraction, randomize, seed, max_samples):
+        t0 = time.perf_counter()
+        reader.seek(offset)
+        chunk = reader.read_chunk()
+        t1 = time.perf_counter()
+        hits = Counter()
+        pos = 0
+        while chunk:
+            hit = hound._find_start(chunk, pos)
+            if hit is None:
+                break
+            hits[hit[1]] += 1
+            pos = hit[0] + 1
+        read_seconds += t1 - t0
+        search_seconds += time.perf_counter() - t1
+        if chunk:
+            samples.append((offset, len(chunk), hits))
+    return SurveyReport(size, samples, read_seconds, search_seconds, time.perf_counter() - started)
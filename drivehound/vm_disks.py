@@ -0,0 +1,478 @@
+# drivehound/vm_disks.py
+
+"""
+vm_disks.py
+
+Sparse virtual machine disk formats (qcow2, VHD, VHDX and hosted sparse
+VMDK) presented as the guest disk: a seekable byte stream of the virtual
+size, in which unallocated clusters read as zeros.
+
+Every reader also reports its allocated extents, which Hound scans instead
+of the whole virtual disk, so scan time follows the data actually written.
+Offsets of hits are guest offsets. Backing (parent) images are not followed;
+clusters a differencing image does not hold read as zeros.
+"""
+
+import io
+import os
+import uuid
+import zlib
+import struct
+import logging
+from collections import OrderedDict
+
+QCOW2_MAGIC = b"QFI\xfb"
+VHDX_MAGIC = b"vhdxfile"
+VMDK_MAGIC = b"KDMV"
+VHD_COOKIE = b"conectix"
+
+VM_EXTENSIONS = {".qcow2": "qcow2", ".qcow": "qcow2", ".vhd": "vhd", ".vhdx": "vhdx", ".vmdk": "vmdk"}
+
+
+def detect_vm_format(path):
+    """
+    Returns:
+        str: 'qcow2', 'vhd', 'vhdx' or 'vmdk' if path has a VM disk extension and
+             the matching signature, else None.
+    """
+    fmt = VM_EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+    if fmt is None or not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        head = f.read(8)
+        if fmt == "vhd":
+            f.seek(0, os.SEEK_END)
+            if f.tell() < 512:
+                return None
+            f.seek(-512, os.SEEK_END)
+            return fmt if f.read(8) == VHD_COOKIE else None
+    magic = {"qcow2": QCOW2_MAGIC, "vhdx": VHDX_MAGIC, "vmdk": VMDK_MAGIC}[fmt]
+    return fmt if head.startswith(magic) else None
+
+
+def open_vm_disk(path):
+    """Opens a VM disk with the reader matching its format."""
+    fmt = detect_vm_format(path)
+    readers = {"qcow2": Qcow2Image, "vhd": VhdImage, "vhdx": VhdxImage, "vmdk": VmdkImage}
+    if fmt is None:
+        raise ValueError(f"{path} is not a supported VM disk image.")
+    return readers[fmt](path)
+
+
+class VirtualDisk(io.RawIOBase):
+    """
+    Base class for sparse disk readers. Subclasses set size and cluster_size
+    and implement _cluster() and _allocated().
+    """
+    format = None
+
+    def __init__(self, path, table_cache=64):
+        super().__init__()
+        self.path = path
+        self._file = open(path, "rb")
+        self._pos = 0
+        self._tables = OrderedDict()  # Lazily loaded second-level tables (LRU)
+        self._table_cache = table_cache
+        self.size = 0
+        self.cluster_size = 0
+
+    def _cluster(self, index):
+        """
+        Returns:
+            None for an unallocated (zero) cluster, the host file offset of an
+            allocated cluster, or the decoded bytes of a compressed one.
+        """
+        raise NotImplementedError
+
+    def _allocated(self):
+        """Yields the indexes of allocated clusters in increasing order."""
+        raise NotImplementedError
+
+    def allocated_ranges(self):
+        """
+        Returns:
+            list: Merged (start, end) guest byte ranges backed by data in the image.
+        """
+        ranges = []
+        cs = self.cluster_size
+        for index in self._allocated():
+            start, end = index * cs, min((index + 1) * cs, self.size)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            elif start < end:
+                ranges.append((start, end))
+        return ranges
+
+    @property
+    def allocated_bytes(self):
+        return sum(end - start for start, end in self.allocated_ranges())
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position.")
+        self._pos = pos
+        return pos
+
+    def readinto(self, b):
+        out = memoryview(b)
+        total = 0
+        cs = self.cluster_size
+        while total < len(out) and self._pos < self.size:
+            within = self._pos % cs
+            n = min(cs - within, len(out) - total, self.size - self._pos)
+            loc = self._cluster(self._pos // cs)
+            if loc is None:
+                data = b""
+            elif isinstance(loc, bytes):
+                data = loc[within:within + n]
+            else:
+                self._file.seek(loc + within)
+                data = self._file.read(n)
+            out[total:total + len(data)] = data
+            if len(data) < n:
+                # Unallocated cluster, or a truncated image: zero-fill
+                out[total + len(data):total + n] = bytes(n - len(data))
+            total += n
+            self._pos += n
+        return total
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def _read_at(self, offset, size):
+        self._file.seek(offset)
+        data = self._file.read(size)
+        if len(data) < size:
+            raise ValueError(f"{self.path}: truncated {self.format} image at offset {hex(offset)}")
+        return data
+
+    def _table(self, offset, count, fmt):
+        """Reads (and caches) a table of count entries of struct format fmt."""
+        key = (offset, count)
+        table = self._tables.get(key)
+        if table is None:
+            table = struct.unpack(fmt[0] + fmt[1:] * count, self._read_at(offset, count * struct.calcsize(fmt)))
+            self._tables[key] = table
+            if len(self._tables) > self._table_cache:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(key)
+        return table
+
+
+class Qcow2Image(VirtualDisk):
+    """
+    QEMU qcow2 (versions 2 and 3) with two-level L1/L2 cluster tables.
+    Compressed clusters are inflated on read; encrypted images are rejected.
+    """
+    format = "qcow2"
+    _OFFSET_MASK = 0x00FFFFFFFFFFFE00
+    _COMPRESSED = 1 << 62
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        header = self._read_at(0, 104)
+        (magic, version, backing_offset, _, cluster_bits, size, crypt, l1_size,
+         l1_offset) = struct.unpack(">4sIQIIQIIQ", header[:48])
+        if magic != QCOW2_MAGIC or version not in (2, 3):
+            raise ValueError(f"{path}: unsupported qcow2 header")
+        if crypt:
+            raise ValueError(f"{path}: encrypted qcow2 images are not supported")
+        if version == 3:
+            incompatible = struct.unpack(">Q", header[72:80])[0]
+            if incompatible & ~0x3:
+                # Anything beyond the dirty and corrupt bits (e.g. extended L2 entries)
+                raise ValueError(f"{path}: unsupported qcow2 features {hex(incompatible)}")
+        if backing_offset:
+            logging.warning(f"{path}: backing file not followed; clusters it provides read as zeros")
+        self.cluster_bits = cluster_bits
+        self.cluster_size = 1 << cluster_bits
+        self.size = size
+        self.l2_entries = self.cluster_size // 8
+        self.l1 = struct.unpack(f">{l1_size}Q", self._read_at(l1_offset, l1_size * 8)) if l1_size else ()
+        self._compressed_cache = OrderedDict()
+
+    def _l2(self, l1_index):
+        if l1_index >= len(self.l1):
+            return None
+        l2_offset = self.l1[l1_index] & self._OFFSET_MASK
+        if not l2_offset:
+            return None
+        return self._table(l2_offset, self.l2_entries, ">Q")
+
+    def _cluster(self, index):
+        l2 = self._l2(index // self.l2_entries)
+        if l2 is None:
+            return None
+        entry = l2[index % self.l2_entries]
+        if entry & self._COMPRESSED:
+            return self._compressed(entry)
+        if entry & 1:
+            # qcow2 v3 "reads as zeros" flag
+            return None
+        host = entry & self._OFFSET_MASK
+        return host or None
+
+    def _compressed(self, entry):
+        data = self._compressed_cache.get(entry)
+        if data is None:
+            x = 62 - (self.cluster_bits - 8)
+            host = entry & ((1 << x) - 1)
+            sectors = ((entry >> x) & ((1 << (self.cluster_bits - 8)) - 1)) + 1
+            self._file.seek(host)
+            raw = self._file.read(sectors * 512 - (host & 511))
+            data = zlib.decompressobj(-12).decompress(raw, self.cluster_size)
+            self._compressed_cache[entry] = data
+            if len(self._compressed_cache) > 16:
+                self._compressed_cache.popitem(last=False)
+        return data
+
+    def _allocated(self):
+        for l1_index in range(len(self.l1)):
+            l2 = self._l2(l1_index)
+            if l2 is None:
+                continue
+            base = l1_index * self.l2_entries
+            for i, entry in enumerate(l2):
+                if entry & self._COMPRESSED or (entry & self._OFFSET_MASK and not entry & 1):
+                    yield base + i
+
+
+class VhdImage(VirtualDisk):
+    """
+    Microsoft VHD: fixed, dynamic and differencing disks. Dynamic disks map
+    blocks through the block allocation table (BAT).
+    """
+    format = "vhd"
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        self._file.seek(0, os.SEEK_END)
+        file_size = self._file.tell()
+        footer = self._read_at(file_size - 512, 512)
+        if footer[:8] != VHD_COOKIE:
+            raise ValueError(f"{path}: missing VHD footer")
+        data_offset, = struct.unpack(">Q", footer[16:24])
+        self.size, = struct.unpack(">Q", footer[48:56])
+        self.disk_type, = struct.unpack(">I", footer[60:64])
+        if self.disk_type == 2:
+            # Fixed disk: raw data followed by the footer
+            self.cluster_size = 1024 * 1024
+            self.bat = None
+            return
+        if self.disk_type not in (3, 4):
+            raise ValueError(f"{path}: unsupported VHD disk type {self.disk_type}")
+        if self.disk_type == 4:
+            logging.warning(f"{path}: parent disk not followed; blocks it provides read as zeros")
+        header = self._read_at(data_offset, 1024)
+        if header[:8] != b"cxsparse":
+            raise ValueError(f"{path}: missing VHD dynamic disk header")
+        table_offset, = struct.unpack(">Q", header[16:24])
+        entries, block_size = struct.unpack(">II", header[28:36])
+        self.cluster_size = block_size
+        self.bat = struct.unpack(f">{entries}I", self._read_at(table_offset, entries * 4))
+        # Each block starts with a sector bitmap padded to whole sectors
+        sectors = block_size // 512
+        self.bitmap_size = max(512, ((sectors + 7) // 8 + 511) // 512 * 512)
+
+    def _cluster(self, index):
+        if self.bat is None:
+            return index * self.cluster_size
+        if index >= len(self.bat) or self.bat[index] == 0xFFFFFFFF:
+            return None
+        return self.bat[index] * 512 + self.bitmap_size
+
+    def _allocated(self):
+        if self.bat is None:
+            yield from range(-(-self.size // self.cluster_size))
+            return
+        for index, sector in enumerate(self.bat):
+            if sector != 0xFFFFFFFF:
+                yield index
+
+
+class VhdxImage(VirtualDisk):
+    """
+    Microsoft VHDX. Payload blocks are mapped through the BAT region; blocks
+    that are not fully or partially present read as zeros. A non-empty log
+    is not replayed.
+    """
+    format = "vhdx"
+    _BAT_GUID = uuid.UUID("2DC27766-F623-4200-9D64-115E9BFD4A08")
+    _METADATA_GUID = uuid.UUID("8B7CA206-4790-4B9A-B8FE-575F050F886E")
+    _FILE_PARAMETERS = uuid.UUID("CAA16737-FA36-4D43-B3B6-33F0AA44E76B")
+    _VIRTUAL_DISK_SIZE = uuid.UUID("2FA54224-CD1B-4876-B211-5DBED83BF4B8")
+    _LOGICAL_SECTOR_SIZE = uuid.UUID("8141BF1D-A96F-4709-BA47-F233A8FAAB5F")
+    _PRESENT = (6, 7)  # PAYLOAD_BLOCK_FULLY_PRESENT, PAYLOAD_BLOCK_PARTIALLY_PRESENT
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        if self._read_at(0, 8) != VHDX_MAGIC:
+            raise ValueError(f"{path}: missing VHDX file identifier")
+        self._check_log()
+        regions = self._regions()
+        if self._BAT_GUID not in regions or self._METADATA_GUID not in regions:
+            raise ValueError(f"{path}: VHDX region table lacks BAT or metadata")
+        metadata = self._metadata(*regions[self._METADATA_GUID])
+        block_size, flags = struct.unpack("<II", metadata[self._FILE_PARAMETERS][:8])
+        if flags & 2:
+            logging.warning(f"{path}: parent disk not followed; blocks it provides read as zeros")
+        self.size, = struct.unpack("<Q", metadata[self._VIRTUAL_DISK_SIZE][:8])
+        sector_size, = struct.unpack("<I", metadata[self._LOGICAL_SECTOR_SIZE][:4])
+        self.cluster_size = block_size
+        # A sector bitmap entry follows every chunk_ratio payload entries in the BAT
+        self.chunk_ratio = (2**23 * sector_size) // block_size
+        bat_offset, bat_length = regions[self._BAT_GUID]
+        self.bat = struct.unpack(f"<{bat_length // 8}Q", self._read_at(bat_offset, bat_length // 8 * 8))
+        self.blocks = -(-self.size // block_size)
+
+    def _check_log(self):
+        # Two headers at 64 KiB and 128 KiB; the one with the higher sequence number is current
+        best = None
+        for offset in (64 * 1024, 128 * 1024):
+            header = self._read_at(offset, 80)
+            if header[:4] != b"head":
+                continue
+            sequence, = struct.unpack("<Q", header[8:16])
+            log_guid = header[48:64]
+            if best is None or sequence > best[0]:
+                best = (sequence, log_guid)
+        if best and best[1] != b"\x00" * 16:
+            logging.warning(f"{self.path}: VHDX log is not empty and was not replayed")
+
+    def _regions(self):
+        table = self._read_at(192 * 1024, 64 * 1024)
+        if table[:4] != b"regi":
+            raise ValueError(f"{self.path}: missing VHDX region table")
+        count, = struct.unpack("<I", table[8:12])
+        regions = {}
+        for i in range(count):
+            entry = table[16 + 32 * i:48 + 32 * i]
+            guid = uuid.UUID(bytes_le=entry[:16])
+            offset, length = struct.unpack("<QI", entry[16:28])
+            regions[guid] = (offset, length)
+        return regions
+
+    def _metadata(self, offset, length):
+        table = self._read_at(offset, 64 * 1024)
+        if table[:8] != b"metadata":
+            raise ValueError(f"{self.path}: missing VHDX metadata table")
+        count, = struct.unpack("<H", table[10:12])
+        items = {}
+        for i in range(count):
+            entry = table[32 + 32 * i:64 + 32 * i]
+            guid = uuid.UUID(bytes_le=entry[:16])
+            item_offset, item_length = struct.unpack("<II", entry[16:24])
+            items[guid] = self._read_at(offset + item_offset, item_length)
+        return items
+
+    def _entry(self, index):
+        bat_index = index + index // self.chunk_ratio
+        return self.bat[bat_index] if bat_index < len(self.bat) else 0
+
+    def _cluster(self, index):
+        entry = self._entry(index)
+        if entry & 7 not in self._PRESENT:
+            return None
+        return entry & ~0xFFFFF
+
+    def _allocated(self):
+        for index in range(self.blocks):
+            if self._entry(index) & 7 in self._PRESENT:
+                yield index
+
+
+class VmdkImage(VirtualDisk):
+    """
+    VMware hosted sparse extent (monolithic sparse or stream-optimized VMDK),
+    mapped through its grain directory and grain tables. Compressed grains
+    of stream-optimized disks are inflated on read.
+    """
+    format = "vmdk"
+    _HEADER = struct.Struct("<4sIIQQQQIQQQ?4sH")
+    _GD_AT_END = 0xFFFFFFFFFFFFFFFF
+    _COMPRESSED = 1 << 16
+
+    def __init__(self, path, **kwargs):
+        super().__init__(path, **kwargs)
+        header = self._parse_header(self._read_at(0, self._HEADER.size))
+        if header["gd_offset"] == self._GD_AT_END:
+            # Stream-optimized: the real header is in the footer, 1 KiB before the end
+            self._file.seek(0, os.SEEK_END)
+            footer_offset = self._file.tell() - 1024
+            header = self._parse_header(self._read_at(footer_offset, self._HEADER.size))
+        self.compressed = bool(header["flags"] & self._COMPRESSED)
+        self.grain_size = header["grain_size"] * 512
+        self.cluster_size = self.grain_size
+        self.size = header["capacity"] * 512
+        self.gt_entries = header["num_gtes"]
+        gd_entries = -(-header["capacity"] // (header["grain_size"] * self.gt_entries))
+        self.gd = struct.unpack(f"<{gd_entries}I", self._read_at(header["gd_offset"] * 512, gd_entries * 4))
+        self._grain_cache = OrderedDict()
+
+    def _parse_header(self, raw):
+        (magic, version, flags, capacity, grain_size, _, _, num_gtes, _, gd_offset, _, _, _,
+         compress) = self._HEADER.unpack(raw)
+        if magic != VMDK_MAGIC:
+            raise ValueError(f"{self.path}: not a hosted sparse VMDK extent")
+        if not grain_size or not num_gtes:
+            raise ValueError(f"{self.path}: invalid VMDK geometry")
+        return {"flags": flags, "capacity": capacity, "grain_size": grain_size,
+                "num_gtes": num_gtes, "gd_offset": gd_offset, "compress": compress}
+
+    def _grain_table(self, gd_index):
+        if gd_index >= len(self.gd) or not self.gd[gd_index]:
+            return None
+        return self._table(self.gd[gd_index] * 512, self.gt_entries, "<I")
+
+    def _cluster(self, index):
+        table = self._grain_table(index // self.gt_entries)
+        if table is None:
+            return None
+        sector = table[index % self.gt_entries]
+        if sector <= 1:
+            # 0: unallocated, 1: zeroed grain
+            return None
+        if self.compressed:
+            return self._compressed_grain(sector)
+        return sector * 512
+
+    def _compressed_grain(self, sector):
+        data = self._grain_cache.get(sector)
+        if data is None:
+            # Grain marker: guest LBA (8 bytes) and compressed size (4 bytes), then zlib data
+            _, size = struct.unpack("<QI", self._read_at(sector * 512, 12))
+            data = zlib.decompress(self._read_at(sector * 512 + 12, size))
+            self._grain_cache[sector] = data
+            if len(self._grain_cache) > 16:
+                self._grain_cache.popitem(last=False)
+        return data
+
+    def _allocated(self):
+        for gd_index in range(len(self.gd)):
+            table = self._grain_table(gd_index)
+            if table is None:
+                continue
+            base = gd_index * self.gt_entries
+            for i, sector in enumerate(table):
+                if sector > 1:
+                    yield base + i
@@ -1,11 +1,18 @@
 # drivehound/win_drive_tools.py
 
 import os
+import uuid
+import struct
 import binascii
 import subprocess
+from collections import namedtuple
 from pathlib import Path
 import re
 import logging
+from .segmented_image import SegmentedImage, find_segments
+from .bad_sectors import BadSectorMap
+from .compressed_image import CompressedImage, detect_compression
+from .vm_disks import open_vm_disk, detect_vm_format
 
 def open_physical_drive(
     number,
@@ -51,16 +58,47 @@ def open_windows_partition(
         opener
     )
 
+def stream_size(file_obj):
+    """
+    Returns the size in bytes of a seekable stream, or None if it cannot be determined.
+    """
+    size = getattr(file_obj, "size", None)
+    if isinstance(size, int):
+        return size
+    try:
+        current = file_obj.tell()
+        end = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(current)
+        return end
+    except (OSError, AttributeError, ValueError):
+        return None
+
 class DriveChunkReader:
     """
     A minimal context manager that wraps a file-like object
     and provides a .read_chunk() method for chunked reading.
+
+    In fault-tolerant mode, read errors shrink the read size down to a single
+    sector; sectors that still fail are skipped, filled with fill_byte and
+    recorded in a BadSectorMap. Ranges already in the map are never re-read.
+    When the size is known, reads stop there: failures past the end of the
+    device are EOF, not bad sectors.
     """
-    def __init__(self, file_obj, sector_size=512, chunk_size=512*1024):
+    def __init__(self, file_obj, sector_size=512, chunk_size=512*1024,
+                 fault_tolerant=False, error_map=None, fill_byte=b"\x00", retries=1):
         self.file_obj = file_obj
-        self.sector_size = sector_size  # Not strictly used here, but kept for clarity
+        self.sector_size = sector_size  # Smallest unit read in fault-tolerant mode
         self.chunk_size = chunk_size
         self.position = 0
+        self.size = stream_size(file_obj)
+        self.fault_tolerant = fault_tolerant
+        self.fill_byte = fill_byte
+        self.retries = retries
+        if isinstance(error_map, BadSectorMap):
+            self.bad_map = error_map
+        else:
+            self.bad_map = BadSectorMap(error_map)
+        self._read_size = chunk_size
 
     def __enter__(self):
         return self
@@ -69,23 +107,90 @@ class DriveChunkReader:
         self.close()
 
     def read_chunk(self):
+        if self.fault_tolerant:
+            return self._read_tolerant(self.chunk_size)
         data = self.file_obj.read(self.chunk_size)
         if data:
             self.position += len(data)
         return data
 
+    def _read_tolerant(self, size):
+        out = bytearray()
+        while len(out) < size:
+            pos = self.position
+            remaining = None if self.size is None else self.size - pos
+            if remaining is not None and remaining <= 0:
+                break
+            bad_end = self.bad_map.bad_end(pos)
+            if bad_end is not None:
+                # Known-bad area: fill without touching the device
+                n = min(bad_end - pos, size - len(out))
+                if remaining is not None:
+                    n = min(n, remaining)
+                out += self.fill_byte * n
+                self.position += n
+                continue
+
+            want = min(self._read_size, size - len(out))
+            if remaining is not None:
+                want = min(want, remaining)
+            next_bad = self.bad_map.next_bad(pos)
+            if next_bad is not None:
+                want = min(want, next_bad - pos)
+
+            data = self._read_at(pos, want)
+            if data is None:
+                if want > self.sector_size:
+                    # Shrink towards a single sector and retry
+                    self._read_size = max(self.sector_size, (want // 2) // self.sector_size * self.sector_size)
+                    continue
+                logging.warning(f"Unreadable sector at offset {hex(pos)}, filling {want} bytes")
+                self.bad_map.add_bad(pos, want)
+                continue
+            if not data:
+                break
+            out += data
+            self.position += len(data)
+            self.bad_map.rescued_end = max(self.bad_map.rescued_end, self.position)
+            # Healthy region: grow back to full-size reads
+            self._read_size = min(self.chunk_size, self._read_size * 2)
+        return bytes(out)
+
+    def seek(self, offset):
+        """Moves the reader to an absolute offset."""
+        self.file_obj.seek(offset)
+        self.position = offset
+
+    def _read_at(self, pos, size):
+        """Reads size bytes at pos, returning None if every attempt raises OSError."""
+        for _ in range(1 + self.retries):
+            try:
+                self.file_obj.seek(pos)
+                return self.file_obj.read(size)
+            except OSError:
+                continue
+        return None
+
     def close(self):
+        if self.fault_tolerant and self.bad_map.path:
+            self.bad_map.save()
         self.file_obj.close()
 
-def open_drive(drive, mode="rb", sector_size=None, chunk_size=None):
+def open_drive(drive, mode="rb", sector_size=None, chunk_size=None, fault_tolerant=False, error_map=None):
     """
     Opens a Windows or POSIX drive, detecting whether the input is a physical drive or a file.
 
     Args:
-        drive (str): The drive identifier (e.g., 'C:', '\\.\PhysicalDrive0', '/dev/sda1')
+        drive (str/list): The drive identifier (e.g., 'C:', '\\.\PhysicalDrive0', '/dev/sda1').
+            A list of paths, or the first segment of a split image ('disk.001'),
+            is opened as one concatenated virtual device. A '.gz', '.xz' or '.bz2'
+            image is decompressed on the fly as a seekable CompressedImage, and
+            qcow2, VHD, VHDX and sparse VMDK disks are read as their guest disk.
         mode (str): Mode to open the drive/file (default 'rb')
         sector_size (int, optional): Sector size for chunk reading
         chunk_size (int, optional): Chunk size for reading
+        fault_tolerant (bool): Skip and fill unreadable sectors instead of raising
+        error_map (str/BadSectorMap, optional): ddrescue-style map of bad ranges to reuse and update
 
     Returns:
         File object or DriveChunkReader: Depending on the parameters
@@ -95,7 +200,21 @@ def open_drive(drive, mode="rb", sector_size=None, chunk_size=None):
 
     logging.debug(f"Attempting to open drive: {drive} with mode: {mode}")
 
-    if drive_letter_pattern.match(drive):
+    if isinstance(drive, (list, tuple)):
+        # Explicit list of segments
+        logging.debug(f"Detected segmented image with {len(drive)} segments")
+        f = SegmentedImage(drive)
+    elif detect_vm_format(drive):
+        logging.debug(f"Detected virtual machine disk: {drive}")
+        f = open_vm_disk(drive)
+    elif detect_compression(drive):
+        logging.debug(f"Detected compressed image: {drive}")
+        f = CompressedImage(drive)
+    elif os.path.isfile(drive) and len(find_segments(drive)) > 1:
+        # First segment of a split image; pull in its siblings
+        logging.debug(f"Detected split image starting at: {drive}")
+        f = SegmentedImage(find_segments(drive))
+    elif drive_letter_pattern.match(drive):
         # It's a drive letter, open as partition
         logging.debug(f"Detected drive letter: {drive}")
         f = open_windows_partition(drive, mode=mode)
@@ -113,10 +232,176 @@ def open_drive(drive, mode="rb", sector_size=None, chunk_size=None):
         f = open(drive, mode)
 
     if sector_size is not None and chunk_size is not None:
-        return DriveChunkReader(f, sector_size, chunk_size)
+        return DriveChunkReader(f, sector_size, chunk_size,
+                                fault_tolerant=fault_tolerant, error_map=error_map)
     
     return f
 
+class Partition(namedtuple('Partition', ['index', 'start', 'end', 'type', 'scheme', 'name'])):
+    """
+    A partition (or unpartitioned gap) on a raw disk, as byte offsets [start, end).
+
+    scheme is 'mbr', 'gpt' or 'gap'; type is the MBR type byte or the GPT type GUID.
+    """
+    __slots__ = ()
+
+    @property
+    def label(self):
+        return f"gap{self.index}" if self.scheme == "gap" else f"p{self.index}"
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+
+_MBR_EXTENDED = (0x05, 0x0F, 0x85)
+_MBR_GPT_PROTECTIVE = 0xEE
+_GPT_SIGNATURE = b"EFI PART"
+_GPT_HEADER = struct.Struct("<8s4sII4xQQQQ16sQII")
+_GPT_ENTRY = struct.Struct("<16s16sQQQ72s")
+# Upper bounds on header-declared table geometry (the usual table is 128 x 128 bytes)
+_GPT_MAX_ENTRIES = 1024
+_GPT_MAX_ENTRY_SIZE = 4096
+
+
+def _read_at(file_obj, offset, size):
+    file_obj.seek(offset)
+    return file_obj.read(size)
+
+
+def read_partition_table(file_obj, sector_size=512):
+    """
+    Parses the MBR or GPT partition table of a raw disk or image.
+
+    Args:
+        file_obj: Seekable binary stream positioned anywhere (e.g., from open_drive).
+        sector_size (int): Logical sector size; GPT is also probed at 4096.
+
+    Returns:
+        list: Partition tuples sorted by start offset; empty if no valid table is found.
+    """
+    disk_size = stream_size(file_obj)
+    mbr = _read_at(file_obj, 0, 512)
+    if len(mbr) < 512 or mbr[510:512] != b"\x55\xAA":
+        return []
+    entries = _mbr_entries(mbr)
+    if any(ptype == _MBR_GPT_PROTECTIVE for _, ptype, _, _ in entries):
+        for size in dict.fromkeys((sector_size, 512, 4096)):
+            partitions = _read_gpt(file_obj, size, disk_size)
+            if partitions is not None:
+                return partitions
+    partitions = _read_mbr(file_obj, entries, sector_size, disk_size)
+    return partitions if partitions is not None else []
+
+
+def _mbr_entries(sector):
+    entries = []
+    for i in range(4):
+        raw = sector[446 + 16 * i:462 + 16 * i]
+        status, ptype = raw[0], raw[4]
+        lba, count = struct.unpack_from("<II", raw, 8)
+        if ptype and count:
+            entries.append((status, ptype, lba, count))
+    return entries
+
+
+def _read_mbr(file_obj, entries, sector_size, disk_size):
+    partitions = []
+    for number, (status, ptype, lba, count) in enumerate(entries, start=1):
+        if status not in (0x00, 0x80):
+            # Not a partition table (e.g., a volume boot record)
+            return None
+        if ptype in _MBR_EXTENDED:
+            partitions.extend(_read_ebr_chain(file_obj, lba, sector_size, disk_size))
+        else:
+            partitions.append(Partition(number, lba * sector_size, (lba + count) * sector_size,
+                                        ptype, "mbr", ""))
+    if disk_size is not None and any(p.end > disk_size for p in partitions):
+        return None
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def _read_ebr_chain(file_obj, extended_lba, sector_size, disk_size):
+    partitions = []
+    ebr_lba = extended_lba
+    seen = set()
+    number = 5  # Logical partitions are numbered from 5
+    while ebr_lba not in seen:
+        seen.add(ebr_lba)
+        sector = _read_at(file_obj, ebr_lba * sector_size, 512)
+        if len(sector) < 512 or sector[510:512] != b"\x55\xAA":
+            break
+        entries = _mbr_entries(sector)
+        if not entries:
+            break
+        _, ptype, lba, count = entries[0]
+        if ptype not in _MBR_EXTENDED:
+            start = (ebr_lba + lba) * sector_size
+            partitions.append(Partition(number, start, start + count * sector_size, ptype, "mbr", ""))
+            number += 1
+        if len(entries) < 2 or entries[1][1] not in _MBR_EXTENDED:
+            break
+        ebr_lba = extended_lba + entries[1][2]
+    return partitions
+
+
+def _read_gpt(file_obj, sector_size, disk_size):
+    header = _read_at(file_obj, sector_size, _GPT_HEADER.size)
+    if len(header) < _GPT_HEADER.size or not header.startswith(_GPT_SIGNATURE):
+        return None
+    (_, _, _, _, _, _, _, _, _, entries_lba, num_entries, entry_size) = _GPT_HEADER.unpack(header)
+    if entry_size < _GPT_ENTRY.size or entry_size > _GPT_MAX_ENTRY_SIZE:
+        return None
+    # A corrupt header must not turn into a huge read
+    num_entries = min(num_entries, _GPT_MAX_ENTRIES)
+    table = _read_at(file_obj, entries_lba * sector_size, num_entries * entry_size)
+    partitions = []
+    for number in range(1, num_entries + 1):
+        raw = table[(number - 1) * entry_size:(number - 1) * entry_size + _GPT_ENTRY.size]
+        if len(raw) < _GPT_ENTRY.size:
+            break
+        type_guid, _, first_lba, last_lba, _, name = _GPT_ENTRY.unpack(raw)
+        if type_guid == b"\x00" * 16:
+            continue
+        start, end = first_lba * sector_size, (last_lba + 1) * sector_size
+        if disk_size is not None and end > disk_size:
+            end = disk_size
+        partitions.append(Partition(number, start, end, str(uuid.UUID(bytes_le=type_guid)), "gpt",
+                                    name.decode("utf-16-le", "replace").rstrip("\x00")))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def partition_layout(file_obj, sector_size=512, min_gap=None):
+    """
+    Splits a raw disk into scan units: every partition plus the gaps outside them.
+
+    Args:
+        file_obj: Seekable binary stream (e.g., from open_drive).
+        sector_size (int): Logical sector size.
+        min_gap (int, optional): Gaps smaller than this are dropped; defaults to one
+            sector. The partition table area itself is reported as gap0.
+
+    Returns:
+        list: Partition tuples covering the disk, sorted by start offset. A disk
+              without a partition table is a single gap spanning the whole device.
+    """
+    size = stream_size(file_obj)
+    partitions = read_partition_table(file_obj, sector_size)
+    min_gap = sector_size if min_gap is None else min_gap
+    units = []
+    covered = 0
+    gaps = 0
+    for part in partitions:
+        if part.start - covered >= min_gap:
+            units.append(Partition(gaps, covered, part.start, None, "gap", ""))
+            gaps += 1
+        units.append(part)
+        covered = max(covered, part.end)
+    if size is not None and size - covered >= min_gap:
+        units.append(Partition(gaps, covered, size, None, "gap", ""))
+    return units
+
+
 def list_partitions():
     """
     Lists available partitions on the system.
@@ -0,0 +1,111 @@
+import pytest
+from drivehound.hound import Hound
+from drivehound.sinks import CarvedFile
+from drivehound.analyzers import (AnalyzerHit, AnalyzerSet, CardNumberAnalyzer, EmailAnalyzer,
+                                  KeywordAnalyzer, PatternAnalyzer, luhn_valid)
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 100 + bytes.fromhex("49454E44AE426082")
+CHUNK = 4096
+
+def feed_all(analyzers, data, step):
+    pipeline = AnalyzerSet(analyzers)
+    hits = []
+    for pos in range(0, len(data), step):
+        hits += pipeline.feed(data[pos:pos + step], pos)
+    return hits + pipeline.finish()
+
+def test_luhn():
+    assert luhn_valid(b"4111111111111111")
+    assert not luhn_valid(b"4111111111111112")
+
+@pytest.mark.parametrize("step", [7, 64, 4096])
+def test_matches_across_chunk_boundaries_are_reported_once(step):
+    data = (b"x" * 50 + b"mail alice.smith@example.org now " + b"\0" * 30 +
+            b"card 4111 1111 1111 1111 end " + b"SECRET and secret" + b"\0" * 40)
+    hits = feed_all([EmailAnalyzer(), CardNumberAnalyzer(), KeywordAnalyzer(["secret"])], data, step)
+    found = [(h.analyzer, h.offset, h.value) for h in hits]
+    assert found == [
+        ("email", data.index(b"alice"), b"alice.smith@example.org"),
+        ("card", data.index(b"4111"), b"4111 1111 1111 1111"),
+        ("keyword", data.index(b"SECRET"), b"SECRET"),
+        ("keyword", data.index(b"secret"), b"secret"),
+    ]
+    assert hits[2].kind == "secret"
+
+def test_invalid_card_numbers_are_ignored():
+    assert feed_all([CardNumberAnalyzer()], b"4111111111111112 0000000000000000", 8) == []
+
+def test_reread_and_gaps_are_handled():
+    pipeline = AnalyzerSet([KeywordAnalyzer(["needle"])])
+    hits = pipeline.feed(b"....needle..", 0)
+    hits += pipeline.feed(b"..needle..need", 10)   # first two bytes were already fed
+    hits += pipeline.feed(b"le", 100)              # jump: 'need' must not join 'le'
+    hits += pipeline.finish()
+    assert [h.offset for h in hits] == [4, 12]
+
+def test_pattern_analyzer_accepts_wildcards():
+    data = b"..RIFF\x01\x02\x03\x04WAVE..MZ"
+    hits = feed_all([PatternAnalyzer({"wav": "52 49 46 46 ?? ?? ?? ?? 57 41 56 45", "mz": b"MZ"})], data, 5)
+    assert [(h.kind, h.offset) for h in hits] == [("wav", 2), ("mz", 16)]
+
+def test_hound_reports_hits_alongside_carves(tmp_path):
+    data = bytearray(6 * CHUNK)
+    data[100:100 + len(PNG)] = PNG
+    marker = b"contact bob@example.com"
+    data[CHUNK - 10:CHUNK - 10 + len(marker)] = marker
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(data))
+
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=CHUNK, verbose=False,
+                  analyzers=[EmailAnalyzer()])
+    items = list(hound.iter_carves(str(path)))
+    carves = [i for i in items if isinstance(i, CarvedFile)]
+    hits = [i for i in items if isinstance(i, AnalyzerHit)]
+    assert [c.offset for c in carves] == [100]
+    assert [(h.offset, h.value) for h in hits] == [(CHUNK - 2, b"bob@example.com")]
+
+    counts = hound.recover_files(str(path))
+    assert counts == {"png": 1}
+    assert hound.last_hits == {"email": 1}
+
+def test_backward_chunks_start_a_new_window():
+    pipeline = AnalyzerSet([KeywordAnalyzer(["needle"])])
+    hits = pipeline.feed(b"..needle..", 100)
+    hits += pipeline.feed(b"needle....", 0)        # lower range scanned later
+    hits += pipeline.feed(b"..needle..", 100)      # the same bytes again
+    hits += pipeline.finish()
+    assert [h.offset for h in hits] == [102, 0]
+
+def test_scheduled_scan_reports_the_same_hits(tmp_path):
+    data = bytearray(16 * CHUNK)
+    for offset in (100, 14 * CHUNK + 50):
+        data[offset:offset + 15] = b"bob@example.com"
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(data))
+
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=CHUNK, verbose=False,
+                  analyzers=[EmailAnalyzer()])
+    sequential = [h.offset for h in hound.iter_carves(str(path)) if isinstance(h, AnalyzerHit)]
+    schedule = [(8 * CHUNK, 16 * CHUNK), (0, 8 * CHUNK)]
+    scheduled = [h.offset for h in hound.iter_carves(str(path), schedule=schedule)
+                 if isinstance(h, AnalyzerHit)]
+    assert sequential == [100, 14 * CHUNK + 50]
+    assert sorted(scheduled) == sequential
+
+def test_differential_rescan_keeps_hits_in_unchanged_blocks(tmp_path):
+    data = bytearray(8 * CHUNK)
+    data[100:115] = b"bob@example.com"
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(data))
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=CHUNK, verbose=False, analyzers=[EmailAnalyzer()],
+                  change_map=str(tmp_path / "map.json"), change_block_size=CHUNK)
+    hound.recover_files(str(path))
+    assert hound.last_hits == {"email": 1}
+
+    data[7 * CHUNK:7 * CHUNK + 23] = b"contact eve@example.net"
+    path.write_bytes(bytes(data))
+    hits = [h for h in hound.iter_carves(str(path)) if isinstance(h, AnalyzerHit)]
+    assert [(h.offset, h.value) for h in hits] == [(100, b"bob@example.com"),
+                                                   (7 * CHUNK + 8, b"eve@example.net")]
+    hound.recover_files(str(path))
+    assert hound.last_hits == {"email": 2}
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import pytest
+from drivehound.async_hound import AsyncHound
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.dd"
+    path.write_bytes((b"\x00" * 4000 + PNG) * 10)
+    return str(path)
+
+def test_async_recover_files(image, tmp_path):
+    async def main():
+        async with AsyncHound(output_dir=str(tmp_path / "out"), chunk_size=1024, verbose=False) as ahound:
+            return await ahound.recover_files(image)
+    assert asyncio.run(main()) == {"png": 10}
+    assert len(list((tmp_path / "out" / "scan_0").iterdir())) == 10
+
+def test_async_progress_and_concurrent_scans(image, tmp_path):
+    async def watch(scan):
+        updates = [p async for p in scan.progress()]
+        return updates, await scan
+
+    async def main():
+        async with AsyncHound(output_dir=str(tmp_path / "out"), chunk_size=1024,
+                              verbose=False, max_workers=2) as ahound:
+            scans = [ahound.start(image) for _ in range(3)]
+            return await asyncio.gather(*(watch(s) for s in scans))
+
+    for updates, counts in asyncio.run(main()):
+        assert counts == {"png": 10}
+        assert updates[-1].done
+        assert updates[-1].bytes_scanned == updates[-1].total_bytes == 10 * (4000 + len(PNG))
+
+def test_async_cancel_stops_between_chunks(image, tmp_path):
+    async def main():
+        async with AsyncHound(output_dir=str(tmp_path / "out"), chunk_size=512, verbose=False) as ahound:
+            scan = ahound.start(image)
+            async for progress in scan.progress():
+                if progress.bytes_scanned >= 2048:
+                    scan.cancel()
+            await scan
+            return scan.snapshot()
+    final = asyncio.run(main())
+    assert final.done
+    assert final.bytes_scanned < final.total_bytes
+
+def test_async_iter_carves(image, tmp_path):
+    async def main():
+        async with AsyncHound(output_dir=str(tmp_path / "out"), chunk_size=1024, verbose=False) as ahound:
+            return [c async for c in ahound.iter_carves(image)]
+    carves = asyncio.run(main())
+    assert len(carves) == 10
+    assert all(c.payload == PNG for c in carves)
+
+def test_concurrent_scans_keep_their_own_files_and_stats(tmp_path):
+    a, b = tmp_path / "a.dd", tmp_path / "b.dd"
+    a.write_bytes(b"\x00" * 100 + PNG)
+    other = PNG.replace(b"\x22", b"\x44")
+    b.write_bytes(b"\x00" * 100 + other)
+
+    async def main():
+        async with AsyncHound(output_dir=str(tmp_path / "out"), chunk_size=1024, verbose=False) as ahound:
+            scans = [ahound.start(str(a)), ahound.start(str(b))]
+            await asyncio.gather(*scans)
+            return scans
+    scans = asyncio.run(main())
+    assert (tmp_path / "out" / "scan_0" / "png_0.png").read_bytes() == PNG
+    assert (tmp_path / "out" / "scan_1" / "png_0.png").read_bytes() == other
+    assert scans[0].stats is not scans[1].stats
+    assert scans[0].stats.skipped == 0
+
+def test_exit_keeps_the_loop_running_and_cancels_scans(image, tmp_path):
+    release = threading.Event()
+
+    async def main():
+        async def unblock():
+            await asyncio.sleep(0.05)
+            release.set()
+
+        async with AsyncHound(output_dir=str(tmp_path / "out"), chunk_size=512, verbose=False) as ahound:
+            scan = ahound.start(image)
+            # Occupy a pool thread until another task on the loop releases it
+            ahound.executor.submit(release.wait, 5)
+            helper = asyncio.ensure_future(unblock())
+        return helper.done(), scan.snapshot()
+
+    helper_ran, final = asyncio.run(main())
+    assert helper_ran
+    assert final.done
@@ -0,0 +1,54 @@
+import io
+import pytest
+from drivehound.autotune import AutoTuner, PrefetchReader
+from drivehound.win_drive_tools import DriveChunkReader
+from drivehound.hound import Hound
+
+def feed_until_settled(tuner, throughput_of):
+    """Feeds synthetic chunks whose cost follows throughput_of(chunk_size)."""
+    for _ in range(1000):
+        if tuner.settled:
+            break
+        size = tuner.chunk_size
+        seconds = size / throughput_of(size)
+        tuner.observe(size, seconds * 0.75, seconds * 0.25)
+    return tuner
+
+def test_tuner_climbs_to_best_chunk_size():
+    # Throughput peaks at 2 MiB
+    best = 2 * 1024 * 1024
+    curve = lambda size: 100e6 / (1 + abs(size.bit_length() - best.bit_length()))
+    tuner = feed_until_settled(AutoTuner(256 * 1024, warmup_seconds=100), curve)
+    assert tuner.settled
+    assert tuner.chunk_size == best
+    # Reads cost three times the search, so read ahead deeper
+    assert tuner.queue_depth == 4
+
+def test_tuner_shrinks_when_smaller_is_faster():
+    curve = lambda size: 1e12 / size
+    tuner = feed_until_settled(AutoTuner(512 * 1024, min_chunk_size=128 * 1024, warmup_seconds=100), curve)
+    assert tuner.chunk_size == 128 * 1024
+
+def test_prefetch_reader_matches_plain_reads():
+    data = bytes(range(256)) * 400
+    reader = PrefetchReader(DriveChunkReader(io.BytesIO(data), chunk_size=1000), depth=3)
+    out = reader.read_chunk() + reader.read_chunk()
+    reader.seek(50000)
+    rest = b""
+    while True:
+        chunk = reader.read_chunk()
+        if not chunk:
+            break
+        rest += chunk
+    reader.close()
+    assert out == data[:2000]
+    assert rest == data[50000:]
+    assert reader.position == len(data)
+
+def test_hound_autotune_carves_same_files(tmp_path):
+    png = bytes.fromhex("89504E470D0A1A0A") + b"\x11" * 5000 + bytes.fromhex("49454E44AE426082")
+    image = tmp_path / "image.dd"
+    image.write_bytes((b"\x00" * 70000 + png) * 20)
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=64 * 1024, verbose=False, autotune=True)
+    assert hound.recover_files(str(image)) == {"png": 20}
+    assert hound.tuned_settings["chunk_size"] >= 64 * 1024
@@ -0,0 +1,87 @@
+import io
+import pytest
+from drivehound.bad_sectors import BadSectorMap
+from drivehound.win_drive_tools import DriveChunkReader
+
+class FlakyFile(io.BytesIO):
+    """BytesIO that raises OSError for any read touching [bad_start, bad_end)."""
+    def __init__(self, data, bad_start, bad_end):
+        super().__init__(data)
+        self.bad_start = bad_start
+        self.bad_end = bad_end
+        self.bad_reads = 0
+
+    def read(self, size=-1):
+        pos = self.tell()
+        end = len(self.getbuffer()) if size < 0 else pos + size
+        if pos < self.bad_end and end > self.bad_start:
+            self.bad_reads += 1
+            raise OSError(5, "Input/output error")
+        return super().read(size)
+
+def test_bad_sector_map_merge_and_lookup():
+    bad = BadSectorMap()
+    bad.add_bad(1024, 512)
+    bad.add_bad(1536, 512)
+    bad.add_bad(4096, 512)
+    assert bad.ranges() == [(1024, 2048), (4096, 4608)]
+    assert bad.bad_end(1500) == 2048
+    assert bad.bad_end(3000) is None
+    assert bad.next_bad(3000) == 4096
+
+def test_fault_tolerant_reader_skips_and_maps(tmp_path):
+    data = bytes(range(256)) * 64  # 16 KiB
+    flaky = FlakyFile(data, 4096, 4608)
+    map_path = str(tmp_path / "disk.map")
+    reader = DriveChunkReader(flaky, sector_size=512, chunk_size=8192,
+                              fault_tolerant=True, error_map=map_path)
+    out = b""
+    while True:
+        chunk = reader.read_chunk()
+        if not chunk:
+            break
+        out += chunk
+    reader.close()
+
+    assert len(out) == len(data)
+    assert out[4096:4608] == b"\x00" * 512
+    assert out[:4096] == data[:4096] and out[4608:] == data[4608:]
+
+    reloaded = BadSectorMap(map_path)
+    assert reloaded.ranges() == [(4096, 4608)]
+    assert reloaded.rescued_end == len(data)
+
+def test_rerun_does_not_touch_mapped_ranges():
+    data = b"\xAA" * 8192
+    bad = BadSectorMap()
+    bad.add_bad(2048, 512)
+    flaky = FlakyFile(data, 2048, 2560)
+    reader = DriveChunkReader(flaky, sector_size=512, chunk_size=4096,
+                              fault_tolerant=True, error_map=bad)
+    out = reader.read_chunk() + reader.read_chunk()
+    assert flaky.bad_reads == 0
+    assert out[2048:2560] == b"\x00" * 512
+
+def test_strict_reader_raises():
+    reader = DriveChunkReader(FlakyFile(b"\x00" * 4096, 0, 512), chunk_size=1024)
+    with pytest.raises(OSError):
+        reader.read_chunk()
+
+def test_reads_past_the_end_are_eof_not_bad_sectors():
+    class FailingAtEnd(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() + max(size, 0) > len(self.getbuffer()):
+                raise OSError(5, "Input/output error")
+            return super().read(size)
+
+    reader = DriveChunkReader(FailingAtEnd(b"\x01" * 4096), sector_size=512, chunk_size=3000,
+                              fault_tolerant=True)
+    chunks = []
+    for _ in range(50):
+        chunk = reader.read_chunk()
+        if not chunk:
+            break
+        chunks.append(chunk)
+    assert b"".join(chunks) == b"\x01" * 4096
+    assert reader.position == 4096
+    assert len(reader.bad_map) == 0
@@ -0,0 +1,40 @@
+import hashlib
+import pytest
+from drivehound.catalog import Catalog
+from drivehound.hound import Hound
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 64 + bytes.fromhex("49454E44AE426082")
+JPG = bytes.fromhex("FFD8FFE000104A46") + b"\x33" * 64 + bytes.fromhex("FFD9")
+
+@pytest.fixture
+def image(tmp_path):
+    data = b"\x00" * 300 + PNG + b"\x00" * 5000 + JPG + b"\x00" * 700 + PNG + b"\x00" * 100
+    path = tmp_path / "image.dd"
+    path.write_bytes(data)
+    return str(path), data
+
+def test_catalog_records_artifacts(image, tmp_path):
+    path, data = image
+    with Catalog(str(tmp_path / "catalog.db"), batch_size=2) as catalog:
+        hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=1024, verbose=False, catalog=catalog)
+        found = hound.recover_files(path)
+        assert found == {"png": 2, "jpg_jfif": 1}
+
+        rows = catalog.artifacts()
+        assert [(r[2], r[3], r[4]) for r in rows] == [
+            (300, len(PNG), "png"),
+            (5300 + len(PNG), len(JPG), "jpg_jfif"),
+            (6000 + len(PNG) + len(JPG), len(PNG), "png"),
+        ]
+        assert rows[0][5] == hashlib.sha256(PNG).hexdigest()
+        with open(rows[1][6], "rb") as f:
+            assert f.read() == JPG
+
+def test_rescan_skips_cataloged_carves(image, tmp_path):
+    path, _ = image
+    with Catalog(str(tmp_path / "catalog.db")) as catalog:
+        hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=1024, verbose=False, catalog=catalog)
+        hound.recover_files(path)
+        found = hound.recover_files(path)
+        assert found == {}
+        assert len(catalog.artifacts()) == 3
@@ -0,0 +1,86 @@
+import pytest
+from drivehound.change_map import BlockHasher, ChangeMap
+from drivehound.hound import Hound
+
+BLOCK = 4096
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 64 + bytes.fromhex("49454E44AE426082")
+JPG = bytes.fromhex("FFD8FFE000104A46") + b"\x33" * 64 + bytes.fromhex("FFD9")
+
+def place(data, offset, payload):
+    return data[:offset] + payload + data[offset + len(payload):]
+
+def test_block_hasher_matches_across_chunkings():
+    data = bytes(range(256)) * 100
+    a, b = BlockHasher(1000), BlockHasher(1000)
+    a.update(data)
+    for i in range(0, len(data), 333):
+        b.update(data[i:i + 333])
+    assert a.finish() == b.finish()
+    assert len(a.digests) == 26
+
+def test_differential_rescan(tmp_path):
+    image = tmp_path / "image.dd"
+    out_dir = tmp_path / "out"
+    map_path = str(tmp_path / "image.map")
+    data = bytes(BLOCK * 8)
+    data = place(data, 100, PNG)
+    data = place(data, BLOCK * 5 - 20, PNG)  # Straddles blocks 4 and 5
+    image.write_bytes(data)
+
+    def scan():
+        hound = Hound(output_dir=str(out_dir), chunk_size=1024, verbose=False,
+                      change_map=map_path, change_block_size=BLOCK)
+        return dict(hound.recover_files(str(image)))
+
+    assert scan() == {"png": 2}
+    first = (out_dir / "png_0.png").stat().st_mtime_ns
+
+    # Add a JPG in block 7 and wipe the PNG that straddles blocks 4 and 5
+    data = place(data, BLOCK * 7 + 10, JPG)
+    data = place(data, BLOCK * 5 - 20, b"\x00" * len(PNG))
+    image.write_bytes(data)
+
+    assert scan() == {"png": 1, "jpg_jfif": 1}
+    assert (out_dir / "png_0.png").stat().st_mtime_ns == first
+    assert (out_dir / "jpg_jfif_0.jpg").read_bytes() == JPG
+
+    saved = ChangeMap(map_path, BLOCK)
+    assert [(f["offset"], f["file_type"]) for f in saved.findings] == [(100, "png"), (BLOCK * 7 + 10, "jpg_jfif")]
+
+def test_new_finding_does_not_overwrite_carried_file(tmp_path):
+    image = tmp_path / "image.dd"
+    out_dir = tmp_path / "out"
+    map_path = str(tmp_path / "image.map")
+    data = place(bytes(BLOCK * 4), BLOCK * 2, PNG)
+    image.write_bytes(data)
+    kwargs = dict(output_dir=str(out_dir), chunk_size=1024, verbose=False,
+                  change_map=map_path, change_block_size=BLOCK)
+    Hound(**kwargs).recover_files(str(image))
+
+    image.write_bytes(place(data, 10, PNG))
+    assert dict(Hound(**kwargs).recover_files(str(image))) == {"png": 2}
+    assert sorted(p.name for p in out_dir.iterdir()) == ["png_0.png", "png_1.png"]
+
+def test_map_of_another_source_is_discarded(tmp_path):
+    first, second = tmp_path / "a.dd", tmp_path / "b.dd"
+    first.write_bytes(place(bytes(BLOCK * 4), BLOCK, PNG))
+    # Same size and same block at the PNG: its finding would be carried over
+    second.write_bytes(place(place(bytes(BLOCK * 4), BLOCK, PNG), BLOCK * 3, JPG))
+    map_path = str(tmp_path / "shared.map")
+
+    def scan(image, out):
+        hound = Hound(output_dir=str(tmp_path / out), chunk_size=1024, verbose=False,
+                      change_map=map_path, change_block_size=BLOCK)
+        return dict(hound.recover_files(str(image)))
+
+    assert scan(first, "a") == {"png": 1}
+    assert scan(second, "b") == {"png": 1, "jpg_jfif": 1}
+    # Carved from the second drive, not skipped as already recovered
+    assert (tmp_path / "b" / "png_0.png").read_bytes() == PNG
+    saved = ChangeMap(map_path, BLOCK)
+    assert saved.source.startswith(str(second))
+    assert [f["file_type"] for f in saved.findings] == ["png", "jpg_jfif"]
+
+    # A map of a different size is discarded too
+    saved.bind(saved.source, BLOCK * 5)
+    assert not saved.has_baseline()
@@ -0,0 +1,92 @@
+import bz2
+import gzip
+import lzma
+import os
+import random
+import pytest
+from drivehound.carver import Carver
+from drivehound.compressed_image import CompressedImage, detect_compression
+from drivehound.file_signatures import FILE_SIGNATURES
+from drivehound.hound import Hound
+from drivehound.win_drive_tools import open_drive
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+
+def raw_image():
+    rng = random.Random(1)
+    data = bytearray(rng.getrandbits(8) for _ in range(50000)) + bytes(150000)
+    data[70000:70000 + len(PNG)] = PNG
+    data[190000:190000 + len(PNG)] = PNG
+    return bytes(data)
+
+RAW = raw_image()
+
+@pytest.fixture(autouse=True)
+def index_cache(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("DRIVEHOUND_CACHE", str(cache))
+    return cache
+
+def write(path, parts, compress):
+    path.write_bytes(b"".join(compress(p) for p in parts))
+    return str(path)
+
+@pytest.fixture(params=["gzip", "gzip-members", "bz2-streams", "xz-streams"])
+def image(request, tmp_path):
+    if request.param == "gzip":
+        return write(tmp_path / "disk.dd.gz", [RAW], gzip.compress)
+    pieces = [RAW[i:i + 30000] for i in range(0, len(RAW), 30000)]
+    if request.param == "gzip-members":
+        return write(tmp_path / "disk.dd.gz", pieces, gzip.compress)
+    if request.param == "bz2-streams":
+        return write(tmp_path / "disk.dd.bz2", pieces, bz2.compress)
+    return write(tmp_path / "disk.dd.xz", pieces, lzma.compress)
+
+def test_sequential_and_random_reads(image):
+    with CompressedImage(image, workers=4, checkpoint_interval=40000, read_size=4096) as f:
+        assert f.read(100000) + f.read() == RAW
+        assert f.size == len(RAW)
+        for offset in (150000, 10, 199990, 65000, 0):
+            f.seek(offset)
+            assert f.read(5000) == RAW[offset:offset + 5000]
+
+def test_index_is_cached(image, index_cache):
+    with CompressedImage(image) as f:
+        assert f.build_index() == len(RAW)
+        units = f.units
+    # Nothing is written beside the evidence
+    assert {p.name for p in os.scandir(os.path.dirname(image))} <= {"cache", os.path.basename(image)}
+    if not image.endswith(".xz"):
+        assert [p.suffix for p in index_cache.iterdir()] == [".dhidx"]
+    with CompressedImage(image) as f:
+        assert f.complete and f.units == units and f.size == len(RAW)
+        f.seek(120001)
+        assert f.read(10) == RAW[120001:120011]
+
+def test_size_unknown_before_first_pass(tmp_path):
+    path = write(tmp_path / "disk.dd.gz", [RAW], gzip.compress)
+    with CompressedImage(path, index_path=False) as f:
+        assert f.size is None
+        with pytest.raises(OSError):
+            f.seek(0, os.SEEK_END)
+
+def test_open_drive_detects_compression(image, tmp_path):
+    assert detect_compression(image)
+    plain = tmp_path / "plain.gz"
+    plain.write_bytes(b"not gzip")
+    assert detect_compression(str(plain)) is None
+    with open_drive(image) as f:
+        assert isinstance(f, CompressedImage)
+
+def test_hound_and_carver_read_compressed_images(image, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=8192, verbose=False)
+    carves = list(hound.iter_carves(image))
+    assert [c.offset for c in carves] == [70000, 190000]
+    assert all(c.payload == PNG for c in carves)
+    raw = tmp_path / "disk.dd"
+    raw.write_bytes(RAW)
+    from_raw = Carver("png", FILE_SIGNATURES, output_dir=str(tmp_path / "raw")).carve_from_file(str(raw))
+    carver = Carver("png", FILE_SIGNATURES, output_dir=str(tmp_path / "carved"))
+    assert carver.carve_from_file(image) == from_raw
+    assert sorted(p.read_bytes() for p in (tmp_path / "carved").iterdir()) == \
+        sorted(p.read_bytes() for p in (tmp_path / "raw").iterdir())
@@ -0,0 +1,35 @@
+import io
+import json
+from drivehound.events import EventLog
+from drivehound.hound import Hound
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+
+def test_events_are_written_as_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    console = io.StringIO()
+    with EventLog(str(path), console=console, summary_interval=60) as events:
+        for i in range(1000):
+            events.emit("completed", file_type="png", offset=i)
+        events.progress(512, 1024)
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 1000
+    assert records[0]["event"] == "completed" and records[-1]["offset"] == 999
+    # Rate limited: at most the periodic line plus the final one
+    lines = console.getvalue().splitlines()
+    assert len(lines) <= 2
+    assert "1000 completed" in lines[-1] and "png: 1000" in lines[-1] and "50.0%" in lines[-1]
+
+def test_hound_reports_carves_as_events(tmp_path, caplog):
+    image = tmp_path / "image.dd"
+    image.write_bytes(b"\x00" * 100 + PNG + b"\x00" * 50 + PNG)
+    path = tmp_path / "events.jsonl"
+    events = EventLog(str(path), console=None)
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=64, verbose=True, events=events)
+    with caplog.at_level("INFO"):
+        hound.recover_files(str(image))
+    events.close()
+    kinds = [json.loads(line)["event"] for line in path.read_text().splitlines()]
+    assert kinds == ["scan_started", "found", "completed", "found", "completed", "scan_finished"]
+    assert not any("Found png" in r.getMessage() for r in caplog.records)
+    assert events.counts["completed"] == 2 and events.position == image.stat().st_size
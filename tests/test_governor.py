@@ -0,0 +1,97 @@
+import os
+import threading
+import pytest
+from drivehound.hound import Hound
+from drivehound.governor import Governor, GovernedReader, TokenBucket, set_io_priority
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 100 + bytes.fromhex("49454E44AE426082")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def test_token_bucket_holds_the_long_run_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(1000, clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        bucket.take(500)
+    # 1000 tokens of burst, then 4000 more at 1000/s
+    assert clock.now == pytest.approx(4.0)
+    assert bucket.take(5000) == pytest.approx(5.0)
+
+def test_rates_are_capped():
+    clock = FakeClock()
+    governor = Governor(bytes_per_second=1000, iops=2, io_class=None, nice=None,
+                        clock=clock, sleep=clock.sleep)
+    for _ in range(6):
+        governor.throttle(100)
+    # 600 bytes fit the bandwidth burst; 6 requests at 2/s cost 2 seconds past the burst
+    assert clock.now == pytest.approx(2.0)
+    assert governor.throttled_seconds == pytest.approx(2.0)
+
+def test_rate_backs_off_on_latency_and_recovers():
+    governor = Governor(bytes_per_second=100e6, target_latency=0.01, io_class=None, nice=None,
+                        min_rate=1e6)
+    for _ in range(20):
+        governor.observe(1 << 20, 0.5)
+    assert governor.current_rate == 1e6
+    for _ in range(200):
+        governor.observe(1 << 20, 0.001)
+    assert governor.current_rate == 100e6
+
+def test_uncapped_governor_starts_limiting_from_observed_throughput():
+    governor = Governor(target_latency=0.01, io_class=None, nice=None, min_rate=1)
+    assert governor.current_rate is None
+    governor.observe(1000, 0.1)
+    assert governor.current_rate == pytest.approx(0.7 * 10000)
+
+@pytest.mark.skipif(not hasattr(os, "getpriority"), reason="no per-thread nice")
+def test_priorities_apply_to_the_reading_thread():
+    governor = Governor(nice=15)
+    seen = []
+
+    def worker():
+        governor.enter_thread()
+        seen.append(os.getpriority(os.PRIO_PROCESS, threading.get_native_id()))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen == [15]
+
+def test_invalid_io_class():
+    with pytest.raises(ValueError):
+        set_io_priority("background")
+
+def test_hound_reads_through_the_governor(tmp_path):
+    data = bytearray(64 * 1024)
+    data[1000:1000 + len(PNG)] = PNG
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(data))
+    governor = Governor(bytes_per_second=1 << 30, io_class=None, nice=None)
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=4096, verbose=False, governor=governor)
+    assert hound.recover_files(str(path)) == {"png": 1}
+    assert governor.bytes_read == len(data)
+    assert governor.reads >= 16
+
+    with hound._open_reader(str(path)) as reader:
+        assert isinstance(reader, GovernedReader)
+        reader.chunk_size = 8192
+        assert len(reader.read_chunk()) == 8192 and reader.position == 8192
+
+@pytest.mark.skipif(not hasattr(os, "getpriority"), reason="no per-thread nice")
+def test_caller_priority_is_unchanged_after_a_governed_scan(tmp_path):
+    path = tmp_path / "image.dd"
+    path.write_bytes(b"\x00" * 100 + PNG)
+    tid = threading.get_native_id()
+    before = os.getpriority(os.PRIO_PROCESS, tid)
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=4096, verbose=False,
+                  governor=Governor(nice=before + 5))
+    assert hound.recover_files(str(path)) == {"png": 1}
+    assert os.getpriority(os.PRIO_PROCESS, tid) == before
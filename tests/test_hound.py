@@ -104,3 +104,16 @@ def test_hound_recover_files_mocked(mock_open_drive, hound, tmp_path):
         chunk_size=hound.chunk_size
     )
     mock_reader.read_chunk.assert_called_once()
+
+def test_hound_carves_exact_bytes(tmp_path):
+    """Carves end at the end signature, even when it straddles a chunk boundary."""
+    png = bytes.fromhex("89504E470D0A1A0A") + b"\x11" * 50 + bytes.fromhex("49454E44AE426082")
+    data = b"\x00" * 100 + png + b"\x00" * 310 + png + b"\xFF" * 200
+    image = tmp_path / "image.dd"
+    image.write_bytes(data)
+    out_dir = tmp_path / "out"
+    # Chunk size chosen so the second end signature spans two chunks
+    hound = Hound(output_dir=str(out_dir), chunk_size=555, verbose=False)
+    assert hound.recover_files(str(image)) == {"png": 2}
+    assert (out_dir / "png_0.png").read_bytes() == png
+    assert (out_dir / "png_1.png").read_bytes() == png
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import pytest
+from drivehound.hound import Hound
+from drivehound.known_hashes import KnownHashes
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+OTHER_PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x33" * 200 + bytes.fromhex("49454E44AE426082")
+
+def sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.dd"
+    path.write_bytes(b"\x00" * 100 + PNG + b"\x00" * 50 + OTHER_PNG + b"\x00" * 10)
+    return str(path)
+
+@pytest.fixture
+def hash_list(tmp_path):
+    path = tmp_path / "known.csv"
+    path.write_text('"SHA-256","FileName"\n' + f'"{sha(PNG).upper()}","logo.png"\n')
+    return str(path)
+
+def test_bloom_filter_membership_and_size():
+    known = KnownHashes(10000, error_rate=1e-4)
+    digests = [hashlib.sha256(str(i).encode()).digest() for i in range(10000)]
+    for d in digests:
+        known.add(d)
+    assert all(d in known for d in digests)
+    misses = sum(hashlib.sha256(os.urandom(16)).digest() in known for _ in range(2000))
+    assert misses <= 5
+    # Roughly 2.4 bytes per hash at 1e-4
+    assert known.memory_bytes < 10000 * 3
+
+def test_save_and_reload(tmp_path, hash_list):
+    known = KnownHashes.from_file(hash_list)
+    assert len(known) == 1 and sha(PNG) in known
+    saved = tmp_path / "known.bloom"
+    known.save(str(saved))
+    reloaded = KnownHashes.from_file(str(saved))
+    assert sha(PNG) in reloaded and sha(OTHER_PNG) not in reloaded
+
+def test_known_carves_are_suppressed_before_reaching_disk(image, hash_list, tmp_path):
+    out = tmp_path / "out"
+    hound = Hound(output_dir=str(out), chunk_size=64, verbose=False, known_hashes=hash_list)
+    found = hound.recover_files(image)
+    assert found["png"] == 1 and hound.last_suppressed == 1
+    assert [p.name for p in out.iterdir()] == ["png_0.png"]
+    assert (out / "png_0.png").read_bytes() == OTHER_PNG
+
+def test_flag_keeps_known_carves(image, hash_list, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=64, verbose=False,
+                  known_hashes=hash_list, known_action="flag")
+    carves = list(hound.iter_carves(image))
+    assert [(c.known, c.payload) for c in carves] == [(True, PNG), (False, OTHER_PNG)]
+
+def test_invalid_known_action(tmp_path):
+    with pytest.raises(ValueError):
+        Hound(output_dir=str(tmp_path / "out"), known_action="delete")
+
+def test_fully_suppressed_type_is_not_counted(tmp_path):
+    image = tmp_path / "only_known.dd"
+    image.write_bytes(b"\x00" * 100 + PNG + b"\x00" * 100)
+    known = KnownHashes(10)
+    known.add(sha(PNG))
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=64, verbose=False, known_hashes=known)
+    assert dict(hound.recover_files(str(image))) == {}
+    assert hound.last_suppressed == 1
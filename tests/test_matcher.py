@@ -0,0 +1,78 @@
+import pytest
+from drivehound.matcher import MaskedSignature, SignatureMatcher
+from drivehound.file_signatures import FILE_SIGNATURES, MASKED_SIGNATURES
+from drivehound.hound import Hound
+from drivehound.carver import Carver
+
+WAV = b"RIFF\x24\x08\x00\x00WAVEfmt "
+AVI = b"RIFF\x00\x10\x00\x00AVI LIST"
+MP4 = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00"
+
+def test_masked_signature_from_hex():
+    sig = MaskedSignature.from_hex("52 49 46 46 ?? ?? ?? ?? 57 41 56 45")
+    assert len(sig) == 12
+    assert sig.anchor == b"RIFF" and sig.anchor_offset == 0
+    assert sig.matches(WAV, 0)
+    assert not sig.matches(AVI, 0)
+    with pytest.raises(ValueError):
+        MaskedSignature.from_hex("52 4G")
+
+def test_matcher_earliest_hit_and_shared_anchor():
+    sigs = {k: MaskedSignature.from_hex(v[0]) for k, v in MASKED_SIGNATURES.items()}
+    sigs["png"] = FILE_SIGNATURES["png"][0]
+    matcher = SignatureMatcher(sigs)
+    data = b"\x11" * 50 + AVI + b"\x22" * 30 + WAV + b"\x33" * 7 + MP4
+    assert matcher.find(data) == (50, "avi")
+    assert matcher.find(data, 51) == (50 + len(AVI) + 30, "wav")
+    assert matcher.find(data, 50 + len(AVI) + 31) == (data.index(MP4), "mp4_isom")
+    assert matcher.find(data, data.index(MP4) + 1) is None
+
+def test_anchor_offset_prefers_earlier_start():
+    # Anchor 'ftyp' sits 4 bytes in; a second anchor hit must not hide an earlier start
+    matcher = SignatureMatcher({"mp4": MaskedSignature.from_hex("????????66747970"), "x": b"\x99\x98"})
+    data = b"\x00\x99\x98ftyp"
+    assert matcher.find(data) == (1, "x")
+    assert matcher.find(data, 2) is None
+
+def test_hound_and_carver_carve_masked_signatures(tmp_path):
+    image = tmp_path / "image.dd"
+    png = bytes.fromhex("89504E470D0A1A0A") + b"\x01" * 20 + bytes.fromhex("49454E44AE426082")
+    image.write_bytes(b"\x00" * 700 + png + b"\x00" * 300 + WAV + b"\x05" * 100)
+    sigs = {**FILE_SIGNATURES, **MASKED_SIGNATURES}
+
+    hound = Hound(signatures=sigs, output_dir=str(tmp_path / "hound"), chunk_size=256, verbose=False)
+    carves = list(hound.iter_carves(str(image)))
+    assert [(c.file_type, c.offset) for c in carves] == [("png", 700), ("wav", 700 + len(png) + 300)]
+    assert carves[1].payload == WAV + b"\x05" * 100
+
+    carver = Carver("wav", sigs, output_dir=str(tmp_path / "carver"), chunk_size=256)
+    assert carver.carve_from_file(str(image)) == 1
+    assert (tmp_path / "carver" / "wav_0.wav").read_bytes() == WAV + b"\x05" * 100
+
+@pytest.mark.parametrize("chunk", [7, 256, 4096])
+def test_riff_and_isobmff_carves_stop_at_the_declared_length(tmp_path, chunk):
+    wav = b"RIFF" + (41).to_bytes(4, "little") + b"WAVEfmt " + b"\x07" * 33 + b"\x00"  # odd size, pad byte
+    box = lambda kind, body: (8 + len(body)).to_bytes(4, "big") + kind + body
+    mp4 = (box(b"ftyp", b"isom\x00\x00\x02\x00") + box(b"moov", box(b"mvhd", b"\x01" * 20)) +
+           (1).to_bytes(4, "big") + b"mdat" + (16 + 50).to_bytes(8, "big") + b"\x09" * 50)
+    image = tmp_path / "image.dd"
+    image.write_bytes(b"\x00" * 300 + wav + b"\x05" * 500 + mp4 + b"\xff" * 500)
+
+    hound = Hound(signatures={**FILE_SIGNATURES, **MASKED_SIGNATURES}, output_dir=str(tmp_path / "out"),
+                  chunk_size=chunk, verbose=False)
+    carves = list(hound.iter_carves(str(image)))
+    assert [(c.file_type, c.offset, c.complete) for c in carves] == [
+        ("wav", 300, True), ("mp4_isom", 300 + len(wav) + 500, True)]
+    assert carves[0].payload == wav
+    assert carves[1].payload == mp4
+
+@pytest.mark.parametrize("chunk", [7, 256, 4096])
+def test_carver_stops_sized_carves_at_the_declared_length(tmp_path, chunk):
+    wav = b"RIFF" + (48).to_bytes(4, "little") + b"WAVEfmt " + b"\x07" * 40
+    image = tmp_path / "image.dd"
+    image.write_bytes(b"\x00" * 300 + wav + b"\x05" * 500 + wav + b"\xff" * 8000)
+    carver = Carver("wav", {**FILE_SIGNATURES, **MASKED_SIGNATURES}, output_dir=str(tmp_path / "out"),
+                    chunk_size=chunk)
+    assert carver.carve_from_file(str(image)) == 2
+    assert (tmp_path / "out" / "wav_0.wav").read_bytes() == wav
+    assert (tmp_path / "out" / "wav_1.wav").read_bytes() == wav
@@ -0,0 +1,94 @@
+import os
+import pytest
+from drivehound.output_manager import OutputManager
+from drivehound.hound import Hound
+from drivehound.file_signatures import FILE_SIGNATURES, MASKED_SIGNATURES
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+
+def test_lru_pool_reopens_evicted_files(tmp_path):
+    manager = OutputManager(max_open=2, block_size=4)
+    keys = [manager.open(str(tmp_path / f"f{i}.bin")) for i in range(5)]
+    for round_ in range(3):
+        for i, key in enumerate(keys):
+            manager.write(key, bytes([i]) * 4)
+            assert manager.open_handles <= 2
+    for key in keys:
+        manager.close(key)
+    assert manager.open_handles == 0
+    for i in range(5):
+        assert (tmp_path / f"f{i}.bin").read_bytes() == bytes([i]) * 12
+
+def test_writes_are_coalesced_into_aligned_blocks(tmp_path):
+    manager = OutputManager(block_size=1024)
+    key = manager.open(str(tmp_path / "out.bin"))
+    data = os.urandom(5000)
+    for i in range(0, len(data), 100):
+        manager.write(key, data[i:i + 100])
+    # Only whole blocks reach disk before close
+    assert manager.bytes_written % 1024 == 0
+    assert manager.writes_issued < 10
+    manager.close(key)
+    assert (tmp_path / "out.bin").read_bytes() == data
+
+def test_preallocated_file_is_trimmed_to_written_size(tmp_path):
+    manager = OutputManager(max_open=1, block_size=16, preallocate=True)
+    a = manager.open(str(tmp_path / "a.bin"), expected_size=4096)
+    b = manager.open(str(tmp_path / "b.bin"))
+    manager.write(a, b"A" * 40)
+    manager.write(b, b"B" * 40)
+    manager.write(a, b"a" * 10)
+    manager.close_all()
+    assert (tmp_path / "a.bin").read_bytes() == b"A" * 40 + b"a" * 10
+    assert (tmp_path / "b.bin").read_bytes() == b"B" * 40
+
+def test_hound_output_with_tiny_pool(tmp_path):
+    image = tmp_path / "image.dd"
+    image.write_bytes(b"\x00" * 100 + PNG + b"\x00" * 50 + PNG)
+    out = tmp_path / "out"
+    hound = Hound(output_dir=str(out), chunk_size=64, verbose=False, max_open_files=1, write_block_size=32)
+    assert hound.recover_files(str(image))["png"] == 2
+    assert sorted(p.read_bytes() for p in out.iterdir()) == [PNG, PNG]
+
+def test_max_open_must_be_positive():
+    with pytest.raises(ValueError):
+        OutputManager(max_open=0)
+
+def test_discard_removes_flushed_and_skips_buffered(tmp_path):
+    manager = OutputManager(block_size=8)
+    small = manager.open(str(tmp_path / "small.bin"))
+    big = manager.open(str(tmp_path / "big.bin"))
+    manager.write(small, b"abc")
+    manager.write(big, b"x" * 20)
+    assert not (tmp_path / "small.bin").exists()
+    assert (tmp_path / "big.bin").exists()
+    manager.discard(small)
+    manager.discard(big)
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="no fallocate")
+def test_space_reserved_after_writes_keeps_the_data_in_place(tmp_path):
+    manager = OutputManager(max_open=1, block_size=16, preallocate=True)
+    a = manager.open(str(tmp_path / "a.bin"))
+    manager.write(a, b"A" * 40)
+    manager.reserve(a, 4096)
+    assert os.path.getsize(tmp_path / "a.bin") == 4096
+    manager.write(a, b"a" * 10)
+    manager.close(a)
+    assert (tmp_path / "a.bin").read_bytes() == b"A" * 40 + b"a" * 10
+
+@pytest.mark.skipif(not hasattr(os, "posix_fallocate"), reason="no fallocate")
+def test_hound_preallocates_carves_of_declared_size(tmp_path, monkeypatch):
+    wav = b"RIFF" + (1000).to_bytes(4, "little") + b"WAVEfmt " + b"\x07" * 992
+    image = tmp_path / "image.dd"
+    image.write_bytes(b"\x00" * 100 + wav + b"\x05" * 300)
+    reserved = []
+    fallocate = os.posix_fallocate
+    monkeypatch.setattr(os, "posix_fallocate",
+                        lambda fd, offset, size: reserved.append(size) or fallocate(fd, offset, size))
+    out = tmp_path / "out"
+    hound = Hound(signatures={**FILE_SIGNATURES, **MASKED_SIGNATURES}, output_dir=str(out), chunk_size=64,
+                  verbose=False, write_block_size=32, preallocate=True)
+    assert hound.recover_files(str(image)) == {"wav": 1}
+    assert reserved == [len(wav)]
+    assert (out / "wav_0.wav").read_bytes() == wav
@@ -0,0 +1,135 @@
+import io
+import hashlib
+import struct
+import uuid
+import pytest
+from drivehound.hound import Hound
+from drivehound.known_hashes import KnownHashes
+from drivehound.win_drive_tools import read_partition_table, partition_layout
+
+SECTOR = 512
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+LINUX_FS = uuid.UUID("0FC63DAF-8483-4772-8E79-3D69D8477DE4")
+
+def mbr_entry(ptype, lba, count, status=0):
+    return struct.pack("<B3sB3sII", status, b"\x00" * 3, ptype, b"\x00" * 3, lba, count)
+
+def boot_sector(entries):
+    sector = bytearray(SECTOR)
+    for i, entry in enumerate(entries):
+        sector[446 + 16 * i:462 + 16 * i] = entry
+    sector[510:512] = b"\x55\xAA"
+    return sector
+
+@pytest.fixture
+def mbr_disk(tmp_path):
+    disk = bytearray(64 * SECTOR)
+    disk[0:SECTOR] = boot_sector([mbr_entry(0x83, 8, 16), mbr_entry(0x05, 32, 24)])
+    # Extended partition: one logical partition 2 sectors after the EBR
+    disk[32 * SECTOR:33 * SECTOR] = boot_sector([mbr_entry(0x07, 2, 8)])
+    disk[8 * SECTOR + 100:8 * SECTOR + 100 + len(PNG)] = PNG          # p1
+    disk[26 * SECTOR:26 * SECTOR + len(PNG)] = PNG                    # gap between p1 and the extended partition
+    disk[34 * SECTOR + 10:34 * SECTOR + 10 + len(PNG)] = PNG          # p5 (logical)
+    path = tmp_path / "mbr.dd"
+    path.write_bytes(bytes(disk))
+    return str(path)
+
+@pytest.fixture
+def gpt_disk(tmp_path):
+    disk = bytearray(128 * SECTOR)
+    disk[0:SECTOR] = boot_sector([mbr_entry(0xEE, 1, 127)])
+    entries = bytearray(128 * 128)
+    name = "data".encode("utf-16-le").ljust(72, b"\x00")
+    entries[0:128] = struct.pack("<16s16sQQQ72s", LINUX_FS.bytes_le, uuid.uuid4().bytes_le, 40, 79, 0, name)
+    entries[128:256] = struct.pack("<16s16sQQQ72s", LINUX_FS.bytes_le, uuid.uuid4().bytes_le, 80, 119, 0, b"\x00" * 72)
+    header = struct.pack("<8s4sII4xQQQQ16sQII", b"EFI PART", b"\x00\x00\x01\x00", 92, 0,
+                         1, 127, 34, 126, b"\x00" * 16, 2, 128, 128)
+    disk[SECTOR:SECTOR + len(header)] = header
+    disk[2 * SECTOR:2 * SECTOR + len(entries)] = entries
+    disk[90 * SECTOR:90 * SECTOR + len(PNG)] = PNG
+    path = tmp_path / "gpt.dd"
+    path.write_bytes(bytes(disk))
+    return str(path)
+
+def test_mbr_with_logical_partitions(mbr_disk):
+    with open(mbr_disk, "rb") as f:
+        parts = read_partition_table(f)
+        layout = partition_layout(f)
+    assert [(p.label, p.start, p.end, p.type) for p in parts] == [
+        ("p1", 8 * SECTOR, 24 * SECTOR, 0x83), ("p5", 34 * SECTOR, 42 * SECTOR, 0x07)]
+    assert [u.label for u in layout] == ["gap0", "p1", "gap1", "p5", "gap2"]
+    assert layout[0].start == 0 and layout[-1].end == 64 * SECTOR
+    assert all(a.end == b.start for a, b in zip(layout, layout[1:]))
+
+def test_gpt_partitions(gpt_disk):
+    with open(gpt_disk, "rb") as f:
+        parts = read_partition_table(f)
+    assert [(p.label, p.start, p.end, p.name) for p in parts] == [
+        ("p1", 40 * SECTOR, 80 * SECTOR, "data"), ("p2", 80 * SECTOR, 120 * SECTOR, "")]
+    assert parts[0].type == str(LINUX_FS).lower()
+
+def test_plain_image_is_one_gap(tmp_path):
+    path = tmp_path / "flat.dd"
+    path.write_bytes(b"\x00" * 4096)
+    with open(path, "rb") as f:
+        assert [(u.label, u.start, u.end) for u in partition_layout(f)] == [("gap0", 0, 4096)]
+
+def test_partition_carves_are_labelled(mbr_disk, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=256, verbose=False)
+    carves = sorted(hound.iter_partition_carves(mbr_disk, workers=3), key=lambda c: c.offset)
+    assert [(c.partition, c.relative_offset, c.offset) for c in carves] == [
+        ("p1", 100, 8 * SECTOR + 100), ("gap1", 2 * SECTOR, 26 * SECTOR), ("p5", 10, 34 * SECTOR + 10)]
+    assert all(c.payload == PNG for c in carves)
+
+def test_recover_partitions_writes_per_unit(mbr_disk, tmp_path):
+    out = tmp_path / "out"
+    hound = Hound(output_dir=str(out), chunk_size=256, verbose=False)
+    found = hound.recover_partitions(mbr_disk)
+    assert found["p1"] == {"png": 1} and found["p5"] == {"png": 1} and found["gap1"] == {"png": 1}
+    assert (out / "p5" / "png_0.png").read_bytes() == PNG
+
+def test_partition_scan_totals_cover_every_unit(mbr_disk, tmp_path):
+    known = KnownHashes(10)
+    known.add(hashlib.sha256(PNG).digest())
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=256, verbose=False, known_hashes=known)
+    found = hound.recover_partitions(mbr_disk, workers=4)
+    assert all(counts == {} for counts in found.values())
+    assert hound.last_suppressed == 3
+    assert not list((tmp_path / "out").rglob("*.png"))
+
+def test_corrupt_gpt_header_does_not_cause_huge_reads(gpt_disk):
+    class Recording(io.BytesIO):
+        largest = 0
+
+        def read(self, size=-1):
+            Recording.largest = max(Recording.largest, size)
+            return super().read(size)
+
+    with open(gpt_disk, "rb") as f:
+        disk = bytearray(f.read())
+    header = bytearray(disk[SECTOR:SECTOR + 92])
+    header[80:88] = struct.pack("<II", 0xFFFFFFFF, 128)          # num_entries, entry_size
+    disk[SECTOR:SECTOR + 92] = header
+    parts = read_partition_table(Recording(bytes(disk)))
+    assert [p.label for p in parts[:2]] == ["p1", "p2"]
+    assert Recording.largest <= 1024 * 128
+    header[84:88] = struct.pack("<I", 0x80000000)
+    disk[SECTOR:SECTOR + 92] = header
+    assert [p.scheme for p in read_partition_table(Recording(bytes(disk)))] != ["gpt"]
+
+def test_recover_partitions_in_processes(mbr_disk, tmp_path):
+    out = tmp_path / "out"
+    hound = Hound(output_dir=str(out), chunk_size=256, verbose=False)
+    found = hound.recover_partitions(mbr_disk, workers=2, processes=True)
+    assert found == hound.recover_partitions(mbr_disk)
+    assert found["p1"] == {"png": 1} and found["p5"] == {"png": 1} and found["gap1"] == {"png": 1}
+    assert (out / "p5" / "png_0.png").read_bytes() == PNG
+
+    known = KnownHashes(10)
+    known.add(hashlib.sha256(PNG).digest())
+    hound = Hound(output_dir=str(tmp_path / "known"), chunk_size=256, verbose=False, known_hashes=known)
+    hound.recover_partitions(mbr_disk, processes=True)
+    assert hound.last_suppressed == 3
+    with pytest.raises(ValueError):
+        Hound(output_dir=str(out), verbose=False, error_map=str(tmp_path / "map")).recover_partitions(
+            mbr_disk, processes=True)
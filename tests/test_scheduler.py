@@ -0,0 +1,65 @@
+import pytest
+from collections import Counter
+from drivehound.hound import Hound
+from drivehound.scheduler import RegionScheduler
+from drivehound.survey import SurveyReport
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+REGION = 4096
+
+def covers(plan, size):
+    ordered = sorted(plan)
+    return ordered[0][0] == 0 and ordered[-1][1] == size and \
+        all(a[1] == b[0] for a, b in zip(ordered, ordered[1:]))
+
+def test_user_ranges_first_with_full_coverage():
+    scheduler = RegionScheduler(10 * REGION, REGION)
+    scheduler.boost(7 * REGION + 100, 8 * REGION + 100)
+    plan = scheduler.plan()
+    assert plan[0] == (7 * REGION + 100, 8 * REGION + 100)
+    assert covers(plan, 10 * REGION)
+
+def test_middle_heuristic_and_survey():
+    scheduler = RegionScheduler(10 * REGION, REGION)
+    scheduler.boost_heuristics()
+    assert scheduler.plan()[0][0] in (4 * REGION, 5 * REGION)
+    report = SurveyReport(10 * REGION, [(1 * REGION, REGION, Counter(png=1)), (9 * REGION, REGION, Counter(png=4))],
+                          1.0, 1.0, 2.0)
+    scheduler.boost_survey(report)
+    plan = scheduler.plan()
+    assert plan[0] == (9 * REGION, 10 * REGION)
+    assert covers(plan, 10 * REGION)
+
+def test_scheduled_scan_finds_priority_hits_first(tmp_path):
+    image = bytearray(16 * REGION)
+    offsets = [100, 5 * REGION + 7, 14 * REGION + 50]
+    for off in offsets:
+        image[off:off + len(PNG)] = PNG
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(image))
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=512, verbose=False)
+    plan = hound.plan_schedule(str(path), ranges=[(14 * REGION, 15 * REGION)], region_size=REGION)
+    carves = list(hound.iter_carves(str(path), schedule=plan))
+    assert carves[0].offset == 14 * REGION + 50
+    assert sorted(c.offset for c in carves) == offsets
+    assert all(c.payload == PNG for c in carves)
+    found = hound.recover_files(str(path), schedule=plan)
+    assert found["png"] == 3
+
+def test_overlapping_schedule_ranges_are_scanned_once(tmp_path):
+    image = bytearray(16 * REGION)
+    offsets = [100, 5 * REGION + 7, 14 * REGION + 50]
+    for off in offsets:
+        image[off:off + len(PNG)] = PNG
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(image))
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=512, verbose=False)
+    schedule = [(5 * REGION, 6 * REGION), (0, 16 * REGION), (14 * REGION, 15 * REGION),
+                (5 * REGION, 5 * REGION + 100)]
+    carves = list(hound.iter_carves(str(path), schedule=schedule))
+    assert [c.offset for c in carves] == [5 * REGION + 7, 100, 14 * REGION + 50]
+    assert hound.recover_files(str(path), schedule=schedule) == {"png": 3}
+
+def test_region_size_must_be_positive():
+    with pytest.raises(ValueError):
+        RegionScheduler(100, 0)
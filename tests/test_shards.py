@@ -0,0 +1,99 @@
+import time
+import threading
+import pytest
+from drivehound.hound import Hound
+from drivehound.sinks import NullSink
+from drivehound.shards import ShardCoordinator, _WorkerManager, run_worker, run_local
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+JPG = bytes.fromhex("FFD8FFE000104A46") + b"\x33" * 2000 + bytes.fromhex("FFD9")
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.dd"
+    data = (b"\x00" * 3000 + PNG + b"\x00" * 1500 + JPG) * 8
+    path.write_bytes(data)
+    return str(path)
+
+def sequential(image, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "seq"), chunk_size=1024, verbose=False)
+    return [(c.offset, c.length, c.file_type) for c in hound.iter_carves(image, sink=NullSink())]
+
+def test_sharded_scan_matches_sequential(image, tmp_path):
+    with ShardCoordinator(image, shard_size=4096, hound_kwargs={'chunk_size': 1024}) as coordinator:
+        threads = [threading.Thread(target=run_worker, args=(coordinator.address, coordinator.authkey),
+                                    kwargs={'output_dir': str(tmp_path / "w")}) for _ in range(3)]
+        for t in threads:
+            t.start()
+        assert coordinator.wait(timeout=30)
+        for t in threads:
+            t.join()
+    merged = [(e['offset'], e['length'], e['file_type']) for e in coordinator.results()]
+    assert merged == sequential(image, tmp_path)
+
+    counts = coordinator.extract(str(tmp_path / "out"))
+    assert counts == {"png": 8, "jpg_jfif": 8}
+    assert (tmp_path / "out" / "jpg_jfif_3.jpg").read_bytes() == JPG
+
+def test_failed_shards_are_retried(image, tmp_path):
+    with ShardCoordinator(image, shard_size=8192) as coordinator:
+        # This worker cannot open the image, fails one shard and leaves
+        run_worker(coordinator.address, coordinator.authkey, drive=str(tmp_path / "missing.dd"),
+                   max_shards=1, output_dir=str(tmp_path / "w"))
+        assert coordinator.service.status()["pending"] == len(coordinator.service.shards)
+        run_worker(coordinator.address, coordinator.authkey, output_dir=str(tmp_path / "w"))
+        assert coordinator.wait(timeout=30)
+    assert coordinator.failed_shards == []
+    assert coordinator.service.shards[0]['attempts'] == 2
+    assert len(coordinator.results()) == 16
+
+def test_run_local_processes(image, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    coordinator = run_local(image, workers=2, shard_size=16384, timeout=60, chunk_size=2048)
+    assert len(coordinator.results()) == 16
+
+def test_auth_key_is_random_and_remote_binds_are_refused(image):
+    a, b = ShardCoordinator(image), ShardCoordinator(image)
+    assert len(a.authkey) == 32 and a.authkey != b.authkey
+    assert ShardCoordinator(image, authkey=a.authkey_hex).authkey == a.authkey
+    with pytest.raises(ValueError):
+        ShardCoordinator(image, address=("0.0.0.0", 0))
+    assert ShardCoordinator(image, address=("0.0.0.0", 0), allow_remote=True).authkey
+
+def test_lease_of_a_dead_worker_is_requeued(image, tmp_path):
+    with ShardCoordinator(image, shard_size=8192, lease_timeout=0.1) as coordinator:
+        # A worker that leases a shard and disappears
+        assert coordinator.service.lease("dead")[0] == 0
+        time.sleep(0.2)
+        run_worker(coordinator.address, coordinator.authkey_hex, output_dir=str(tmp_path / "w"))
+        assert coordinator.wait(timeout=30)
+    assert coordinator.failed_shards == []
+    assert coordinator.service.shards[0]['errors'] == ["lease expired"]
+
+def test_connections_are_refused_after_stop(image):
+    coordinator = ShardCoordinator(image)
+    coordinator.start()
+    address = coordinator.address
+    _WorkerManager(address=address, authkey=coordinator.authkey).connect()
+    coordinator.stop()
+    with pytest.raises(ConnectionRefusedError):
+        _WorkerManager(address=address, authkey=coordinator.authkey).connect()
+
+def test_merge_searches_past_a_carve_that_hid_later_starts(tmp_path):
+    # The png runs from shard 0 into shard 1, where the jpg header inside it
+    # starts a carve that hides the start of the second png
+    data = bytearray(16384)
+    data[4000:4000 + len(PNG)] = PNG
+    png_end = 4000 + len(PNG)
+    data[4200:4208] = JPG[:8]
+    data[png_end + 100:png_end + 100 + len(PNG)] = PNG
+    data[png_end + 200:png_end + 202] = JPG[-2:]
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(data))
+    hound_kwargs = {'output_dir': str(tmp_path / "w")}
+    with ShardCoordinator(str(path), shard_size=4096, hound_kwargs=hound_kwargs) as coordinator:
+        run_worker(coordinator.address, coordinator.authkey)
+        assert coordinator.wait(timeout=30)
+    merged = [(e['offset'], e['length'], e['file_type']) for e in coordinator.results()]
+    assert merged == sequential(str(path), tmp_path)
+    assert [m[0] for m in merged] == [4000, png_end + 100]
@@ -0,0 +1,52 @@
+import hashlib
+import pytest
+from drivehound.hound import Hound
+from drivehound.sinks import CarveSink, MemorySink, NullSink
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+TAIL_SIG = {"tail": (b"TAILSTART", None, ".bin")}
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.dd"
+    path.write_bytes(b"\x00" * 1000 + PNG + b"\x00" * 3000 + PNG + b"\x00" * 10)
+    return str(path)
+
+def test_iter_carves_yields_bytes_without_writing(image, tmp_path):
+    out_dir = tmp_path / "out"
+    hound = Hound(output_dir=str(out_dir), chunk_size=512, verbose=False)
+    carves = list(hound.iter_carves(image))
+    assert [(c.file_type, c.offset) for c in carves] == [("png", 1000), ("png", 1000 + len(PNG) + 3000)]
+    assert all(c.payload == PNG and c.complete for c in carves)
+    assert carves[0].sha256 == hashlib.sha256(PNG).hexdigest()
+    assert list(out_dir.iterdir()) == []
+
+def test_iter_carves_is_lazy(image, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=512, verbose=False)
+    carves = hound.iter_carves(image, sink=NullSink())
+    first = next(carves)
+    assert first.offset == 1000 and first.payload is None and first.length == len(PNG)
+    carves.close()
+
+def test_custom_sink_sees_streamed_pieces(image, tmp_path):
+    class ChunkCounter(CarveSink):
+        def open(self, file_type, offset, filename):
+            return []
+        def write(self, handle, data):
+            handle.append(len(data))
+        def close(self, handle):
+            return handle
+
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=128, verbose=False)
+    carves = list(hound.iter_carves(image, sink=ChunkCounter()))
+    assert sum(carves[0].payload) == len(PNG)
+    assert len(carves[0].payload) > 1
+
+def test_carve_without_end_runs_to_eof(tmp_path):
+    path = tmp_path / "image.dd"
+    path.write_bytes(b"\x00" * 100 + b"TAILSTART" + b"\x01" * 1000)
+    hound = Hound(signatures=TAIL_SIG, output_dir=str(tmp_path / "out"), chunk_size=256, verbose=False)
+    (carve,) = hound.iter_carves(str(path), sink=MemorySink(max_size=16))
+    assert not carve.complete
+    assert carve.length == 1009
+    assert carve.payload == (b"TAILSTART" + b"\x01" * 1000)[:16]
@@ -0,0 +1,37 @@
+import pytest
+from drivehound.hound import Hound
+from drivehound.survey import sample_offsets
+
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 100 + bytes.fromhex("49454E44AE426082")
+CHUNK = 4096
+
+@pytest.fixture
+def image(tmp_path):
+    # One PNG in every chunk of a 400-chunk image
+    data = bytearray(400 * CHUNK)
+    for i in range(400):
+        data[i * CHUNK + 500:i * CHUNK + 500 + len(PNG)] = PNG
+    path = tmp_path / "image.dd"
+    path.write_bytes(bytes(data))
+    return str(path)
+
+def test_stride_offsets_cover_the_device():
+    offsets = sample_offsets(1000 * CHUNK, CHUNK, fraction=0.01)
+    assert len(offsets) == 10
+    assert offsets[0] < 100 * CHUNK and offsets[-1] > 900 * CHUNK
+    assert all(o % CHUNK == 0 for o in offsets)
+
+def test_random_offsets_are_repeatable():
+    a = sample_offsets(1000 * CHUNK, CHUNK, 0.05, randomize=True, seed=7)
+    assert a == sample_offsets(1000 * CHUNK, CHUNK, 0.05, randomize=True, seed=7)
+    assert len(set(a)) == 50 and a == sorted(a)
+
+def test_survey_extrapolates_counts(image, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=CHUNK, verbose=False)
+    report = hound.survey(image, fraction=0.05)
+    assert report.sampled_bytes == 20 * CHUNK
+    assert report.counts["png"] == 20
+    assert report.expected["png"] == pytest.approx(400)
+    assert report.stderr["png"] == pytest.approx(0)
+    assert report.eta_seconds > 0 and "png" in report.summary()
+    assert list(tmp_path.joinpath("out").iterdir()) == []
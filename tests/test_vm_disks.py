@@ -0,0 +1,199 @@
+import struct
+import uuid
+import zlib
+import pytest
+from drivehound.hound import Hound
+from drivehound.governor import Governor
+from drivehound.vm_disks import Qcow2Image, VhdImage, VhdxImage, VmdkImage, detect_vm_format
+from drivehound.win_drive_tools import open_drive
+
+MiB = 1024 * 1024
+PNG = bytes.fromhex("89504E470D0A1A0A") + b"\x22" * 300 + bytes.fromhex("49454E44AE426082")
+PNG_OFFSETS = [5000, 2 * MiB + 70000]
+
+def guest_disk():
+    data = bytearray(8 * MiB)
+    for off in PNG_OFFSETS:
+        data[off:off + len(PNG)] = PNG
+    data[MiB + 10:MiB + 20] = b"\x07" * 10
+    return bytes(data)
+
+GUEST = guest_disk()
+
+def clusters(data, size):
+    return [(i, data[i * size:(i + 1) * size]) for i in range(len(data) // size) if any(data[i * size:(i + 1) * size])]
+
+def pad(buf, align):
+    buf += bytes(-len(buf) % align)
+    return buf
+
+def build_qcow2(path):
+    cs = 4096
+    l2_entries = cs // 8
+    l1_size = -(-len(GUEST) // (cs * l2_entries))
+    out = bytearray(cs * 2)  # header cluster, L1 cluster
+    header = struct.pack(">4sIQIIQIIQQIIQQQQII", b"QFI\xfb", 3, 0, 0, 12, len(GUEST), 0, l1_size, cs,
+                         0, 0, 0, 0, 0, 0, 0, 4, 104)
+    out[:len(header)] = header
+    l2_tables = {}
+    data_clusters = clusters(GUEST, cs)
+    for index, _ in data_clusters:
+        l2_tables.setdefault(index // l2_entries, [0] * l2_entries)
+    l2_offsets = {}
+    for l1_index in sorted(l2_tables):
+        l2_offsets[l1_index] = len(out)
+        out += bytes(cs)
+    for n, (index, data) in enumerate(data_clusters):
+        l2 = l2_tables[index // l2_entries]
+        if n == 0:
+            # Store the first cluster compressed
+            comp = zlib.compressobj(9, zlib.DEFLATED, -12)
+            raw = comp.compress(data) + comp.flush()
+            host = len(out)
+            sectors = (host + len(raw) - 1) // 512 - host // 512 + 1
+            x = 62 - (12 - 8)
+            l2[index % l2_entries] = (1 << 62) | ((sectors - 1) << x) | host
+            out += raw
+            pad(out, cs)
+        else:
+            l2[index % l2_entries] = (1 << 63) | len(out)
+            out += data
+    # A "reads as zeros" entry in an otherwise empty slot
+    l2_tables[0][300] = 1
+    for l1_index, l2 in l2_tables.items():
+        off = l2_offsets[l1_index]
+        out[off:off + cs] = struct.pack(f">{l2_entries}Q", *l2)
+        out[cs + 8 * l1_index:cs + 8 * l1_index + 8] = struct.pack(">Q", (1 << 63) | off)
+    path.write_bytes(bytes(out))
+    return str(path)
+
+def vhd_footer(size, disk_type, data_offset):
+    footer = bytearray(512)
+    footer[0:8] = b"conectix"
+    struct.pack_into(">IIQ", footer, 8, 2, 0x00010000, data_offset)
+    struct.pack_into(">QQ", footer, 40, size, size)
+    struct.pack_into(">I", footer, 60, disk_type)
+    return bytes(footer)
+
+def build_vhd(path):
+    block = 64 * 1024
+    entries = len(GUEST) // block
+    out = bytearray(vhd_footer(len(GUEST), 3, 512))
+    header = bytearray(1024)
+    header[0:8] = b"cxsparse"
+    struct.pack_into(">QQIII", header, 8, 0xFFFFFFFFFFFFFFFF, 1536, 0x00010000, entries, block)
+    out += header
+    bat = [0xFFFFFFFF] * entries
+    bat_offset = len(out)
+    out += bytes(entries * 4)
+    pad(out, 512)
+    for index, data in clusters(GUEST, block):
+        bat[index] = len(out) // 512
+        out += b"\xff" * 512 + data
+    out[bat_offset:bat_offset + entries * 4] = struct.pack(f">{entries}I", *bat)
+    out += vhd_footer(len(GUEST), 3, 512)
+    path.write_bytes(bytes(out))
+    return str(path)
+
+def build_vhdx(path):
+    block = MiB
+    out = bytearray(4 * MiB)
+    out[0:8] = b"vhdxfile"
+    for seq, off in ((1, 64 * 1024), (2, 128 * 1024)):
+        out[off:off + 4] = b"head"
+        struct.pack_into("<Q", out, off + 8, seq)
+    regions = [(uuid.UUID("8B7CA206-4790-4B9A-B8FE-575F050F886E"), MiB, MiB),
+               (uuid.UUID("2DC27766-F623-4200-9D64-115E9BFD4A08"), 2 * MiB, MiB)]
+    rt = 192 * 1024
+    out[rt:rt + 4] = b"regi"
+    struct.pack_into("<I", out, rt + 8, len(regions))
+    for i, (guid, off, length) in enumerate(regions):
+        struct.pack_into("<16sQII", out, rt + 16 + 32 * i, guid.bytes_le, off, length, 1)
+    items = [(uuid.UUID("CAA16737-FA36-4D43-B3B6-33F0AA44E76B"), struct.pack("<II", block, 0)),
+             (uuid.UUID("2FA54224-CD1B-4876-B211-5DBED83BF4B8"), struct.pack("<Q", len(GUEST))),
+             (uuid.UUID("8141BF1D-A96F-4709-BA47-F233A8FAAB5F"), struct.pack("<I", 512))]
+    md = MiB
+    out[md:md + 8] = b"metadata"
+    struct.pack_into("<H", out, md + 10, len(items))
+    item_offset = 64 * 1024
+    for i, (guid, value) in enumerate(items):
+        struct.pack_into("<16sII", out, md + 32 + 32 * i, guid.bytes_le, item_offset, len(value))
+        out[md + item_offset:md + item_offset + len(value)] = value
+        item_offset += 64
+    bat = 2 * MiB
+    for index, data in clusters(GUEST, block):
+        struct.pack_into("<Q", out, bat + 8 * index, len(out) | 6)
+        out += data
+    path.write_bytes(bytes(out))
+    return str(path)
+
+def build_vmdk(path):
+    grain_sectors, gtes = 8, 512
+    grain = grain_sectors * 512
+    capacity = len(GUEST) // 512
+    gd_entries = -(-capacity // (grain_sectors * gtes))
+    out = bytearray(512)
+    header = struct.pack("<4sIIQQQQIQQQ?4sH", b"KDMV", 1, 3, capacity, grain_sectors, 0, 0, gtes,
+                         0, 1, 0, False, b"\n \r\n", 0)
+    out[:len(header)] = header
+    gd_offset = len(out)
+    out += bytes(gd_entries * 4)
+    pad(out, 512)
+    tables = {}
+    for index, data in clusters(GUEST, grain):
+        table = tables.setdefault(index // gtes, [0] * gtes)
+        table[index % gtes] = len(out) // 512
+        out += data
+    gd = [0] * gd_entries
+    for gd_index, table in tables.items():
+        gd[gd_index] = len(out) // 512
+        out += struct.pack(f"<{gtes}I", *table)
+    out[gd_offset:gd_offset + 4 * gd_entries] = struct.pack(f"<{gd_entries}I", *gd)
+    path.write_bytes(bytes(out))
+    return str(path)
+
+BUILDERS = {"disk.qcow2": build_qcow2, "disk.vhd": build_vhd, "disk.vhdx": build_vhdx, "disk.vmdk": build_vmdk}
+
+@pytest.fixture(params=sorted(BUILDERS))
+def vm_disk(request, tmp_path):
+    return BUILDERS[request.param](tmp_path / request.param)
+
+def test_reads_guest_disk(vm_disk):
+    with open_drive(vm_disk) as disk:
+        assert disk.size == len(GUEST)
+        assert disk.read() == GUEST
+        disk.seek(PNG_OFFSETS[1] - 3)
+        assert disk.read(len(PNG) + 3) == b"\x00" * 3 + PNG
+
+def test_allocated_ranges_skip_empty_clusters(vm_disk):
+    with open_drive(vm_disk) as disk:
+        ranges = disk.allocated_ranges()
+        assert disk.allocated_bytes < len(GUEST) // 2
+        for off in PNG_OFFSETS + [MiB + 10]:
+            assert any(start <= off < end for start, end in ranges)
+
+def test_hound_reports_guest_offsets(vm_disk, tmp_path):
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=4096, verbose=False)
+    carves = list(hound.iter_carves(vm_disk))
+    assert [c.offset for c in carves] == PNG_OFFSETS
+    assert all(c.payload == PNG for c in carves)
+
+def test_schedule_skips_unallocated_clusters(vm_disk, tmp_path):
+    governor = Governor(io_class=None, nice=None)
+    hound = Hound(output_dir=str(tmp_path / "out"), chunk_size=4096, verbose=False, governor=governor)
+    schedule = [(2 * MiB, len(GUEST)), (0, 2 * MiB)]
+    carves = list(hound.iter_carves(vm_disk, schedule=schedule))
+    assert [c.offset for c in carves] == PNG_OFFSETS[::-1]
+    assert governor.bytes_read < len(GUEST) // 2
+
+def test_format_detection(tmp_path, vm_disk):
+    assert detect_vm_format(vm_disk)
+    fake = tmp_path / "fake.qcow2"
+    fake.write_bytes(b"\x00" * 1024)
+    assert detect_vm_format(str(fake)) is None
+
+def test_readers_by_class(tmp_path):
+    assert isinstance(open_drive(build_qcow2(tmp_path / "a.qcow2")), Qcow2Image)
+    assert isinstance(open_drive(build_vhd(tmp_path / "a.vhd")), VhdImage)
+    assert isinstance(open_drive(build_vhdx(tmp_path / "a.vhdx")), VhdxImage)
+    assert isinstance(open_drive(build_vmdk(tmp_path / "a.vmdk")), VmdkImage)